@@ -0,0 +1,157 @@
+import os
+import threading
+import time
+
+import orjson
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.middleware.gzip import GZipMiddleware
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+from utils import catalog
+from utils.backends import get_connection
+from utils.exports import FORMATS, export_bytes
+from utils.serving import pooled_connection
+
+# Cleaned datasets served to other teams, as computed for app.py
+PUBLISHED = [
+    'tourism_stats', 'monuments', 'gender_tourism', 'geological_sites',
+    'overview_metrics', 'monuments_tourism', 'state_analysis',
+    'dim_state', 'dim_year', 'fact_visits', 'fact_artisans', 'fact_funding', 'fact_monuments',
+]
+
+DEFAULT_PAGE_SIZE = 1000
+MAX_PAGE_SIZE = int(os.getenv('API_MAX_PAGE_SIZE', '10000'))
+ARROW_STREAM = FORMATS['arrow'][1]
+# After a failed connect, local files are served for this long before trying again
+CONNECT_RETRY_SECONDS = float(os.getenv('API_CONNECT_RETRY_SECONDS', '30'))
+
+_connection = None
+_connect_failed_at = None
+_connection_lock = threading.Lock()
+
+
+def get_api_connection():
+    """One connection pool shared by every request; None (local files only) when the warehouse is unreachable"""
+    global _connection, _connect_failed_at
+    with _connection_lock:
+        if _connection is None:
+            if _connect_failed_at is not None and time.monotonic() - _connect_failed_at < CONNECT_RETRY_SECONDS:
+                return None
+            try:
+                _connection = pooled_connection(get_connection)
+            except Exception as e:
+                _connect_failed_at = time.monotonic()
+                print(f"⚠️ Serving local files for {CONNECT_RETRY_SECONDS:g}s, could not connect: {e}")
+                return None
+        return _connection
+
+
+def _error(status, message):
+    return JSONResponse({'error': message}, status_code=status)
+
+
+def _json_page(meta, rows):
+    """meta and the page's rows as one JSON object; pandas encodes the rows straight into the body"""
+    return orjson.dumps(meta)[:-1] + b',"rows":' + rows.to_json(orient='records', date_format='iso').encode() + b'}'
+
+
+def _int_param(request, name, default, low, high):
+    value = request.query_params.get(name, default)
+    try:
+        value = int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{name} must be an integer") from None
+    if not low <= value <= high:
+        raise ValueError(f"{name} must be between {low} and {high}")
+    return value
+
+
+def _response_format(request):
+    requested = request.query_params.get('format')
+    if requested is None:
+        return 'arrow' if ARROW_STREAM in request.headers.get('accept', '') else 'json'
+    if requested not in ('json', 'arrow'):
+        raise ValueError("format must be json or arrow")
+    return requested
+
+
+def list_datasets(request):
+    """GET /datasets: the published datasets and their current versions"""
+    conn = get_api_connection()
+    versions = catalog.snapshot(PUBLISHED, conn)
+    return JSONResponse({'datasets': [
+        {
+            'name': name,
+            'columns': catalog.get_dataset(name).columns,
+            'source': versions[name][0],
+            'version': versions[name][1],
+        }
+        for name in PUBLISHED
+    ]})
+
+
+def get_dataset(request):
+    """
+    GET /datasets/{name}?page=1&page_size=1000&format=json|arrow
+
+    One page of a dataset, as JSON records or an Arrow IPC stream (also
+    chosen with Accept: application/vnd.apache.arrow.stream). The ETag
+    is the dataset version, so an unchanged page answers 304 without
+    loading anything.
+    """
+    name = request.path_params['name']
+    if name not in PUBLISHED:
+        return _error(404, f"Unknown dataset '{name}', expected one of: {', '.join(PUBLISHED)}")
+    try:
+        page = _int_param(request, 'page', 1, 1, 10 ** 9)
+        page_size = _int_param(request, 'page_size', DEFAULT_PAGE_SIZE, 1, MAX_PAGE_SIZE)
+        fmt = _response_format(request)
+    except ValueError as e:
+        return _error(400, str(e))
+
+    conn = get_api_connection()
+    source, version = catalog.snapshot([name], conn)[name]
+    if version is None:
+        return _error(503, f"No table or local file available for {catalog.get_dataset(name).label}")
+    etag = f'"{source}-{version}-{page}-{page_size}-{fmt}"'
+    headers = {'ETag': etag, 'Cache-Control': f"max-age={catalog.SNAPSHOT_TTL}"}
+    if etag in request.headers.get('if-none-match', ''):
+        return Response(status_code=304, headers=headers)
+
+    try:
+        df = catalog.load(name, conn)
+    except LookupError as e:
+        return _error(503, str(e))
+    total = len(df)
+    rows = df.iloc[(page - 1) * page_size:page * page_size]
+    pages = max(1, -(-total // page_size))
+    headers['X-Total-Rows'] = str(total)
+    if page < pages:
+        next_url = request.url.include_query_params(page=page + 1)
+        headers['Link'] = f'<{next_url}>; rel="next"'
+
+    if fmt == 'arrow':
+        return Response(export_bytes(rows, 'arrow'), media_type=ARROW_STREAM, headers=headers)
+    body = _json_page({
+        'dataset': name,
+        'version': version,
+        'page': page,
+        'page_size': page_size,
+        'pages': pages,
+        'total_rows': total,
+    }, rows)
+    return Response(body, media_type='application/json', headers=headers)
+
+
+app = Starlette(
+    routes=[
+        Route('/datasets', list_datasets),
+        Route('/datasets/{name}', get_dataset),
+    ],
+    middleware=[Middleware(GZipMiddleware, minimum_size=1024)],
+)
+
+if __name__ == "__main__":
+    import uvicorn
+    uvicorn.run(app, host=os.getenv('API_HOST', '127.0.0.1'), port=int(os.getenv('API_PORT', '8000')))
@@ -0,0 +1,22 @@
+import pytest
+
+from utils.backends import DuckDBBackend
+
+SCALES = [10, 100, 1000]
+
+
+@pytest.fixture(params=SCALES, ids=lambda s: f"{s}x")
+def scale(request):
+    return request.param
+
+
+@pytest.fixture
+def local_db(tmp_path, monkeypatch):
+    """
+    Point the app at a fresh local DuckDB database and return a factory
+    for connections to it
+    """
+    path = tmp_path / 'bench.duckdb'
+    monkeypatch.setenv('DATA_BACKEND', 'duckdb')
+    monkeypatch.setenv('LOCAL_DB_PATH', str(path))
+    return DuckDBBackend(path).connect
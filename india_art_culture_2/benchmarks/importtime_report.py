@@ -0,0 +1,96 @@
+"""
+Import-time profile of the dashboards' module-level imports.
+
+Runs the top-level import statements of each entry point in a fresh
+interpreter under `python -X importtime` (the scripts themselves are not
+executed, so no queries run) and prints the total cold-import cost and
+the slowest packages.
+
+    python benchmarks/importtime_report.py                   # app.py and combined_analysis.py
+    python benchmarks/importtime_report.py app.py --top 25
+    python benchmarks/importtime_report.py --raw importtime.log  # keep the full -X importtime output
+"""
+import argparse
+import ast
+import subprocess
+import sys
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).parent.parent
+DEFAULT_ENTRY_POINTS = ['app.py', 'combined_analysis.py']
+
+# Optional dependencies that should stay out of a cold start
+HEAVY_MODULES = ['seaborn', 'matplotlib', 'folium', 'snowflake.connector']
+
+
+def import_statements(script):
+    """Source of the module-level import statements in script"""
+    source = (PROJECT_DIR / script).read_text()
+    tree = ast.parse(source)
+    return '\n'.join(
+        ast.get_source_segment(source, node)
+        for node in tree.body
+        if isinstance(node, (ast.Import, ast.ImportFrom))
+    )
+
+
+def profile_imports(code):
+    """
+    Run code under -X importtime in a fresh interpreter.
+    Returns (rows, raw_output) where rows are (module, self_us, cumulative_us, depth).
+    """
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        cwd=PROJECT_DIR, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return rows, result.stderr
+
+
+def report(script, top=15):
+    rows, raw = profile_imports(import_statements(script))
+    # Depth 0 rows are the packages imported directly by the script
+    direct = sorted((r for r in rows if r[3] == 0), key=lambda r: r[2], reverse=True)
+    total_us = sum(r[2] for r in direct)
+    loaded = {r[0] for r in rows}
+
+    print(f"\n📦 {script}: {total_us / 1e6:.2f}s cold import, {len(rows)} modules")
+    print(f"{'cumulative':>12}  {'self':>10}  module")
+    for name, self_us, cumulative_us, _ in direct[:top]:
+        print(f"{cumulative_us / 1e3:>10.1f}ms  {self_us / 1e3:>8.1f}ms  {name}")
+
+    heavy = [m for m in HEAVY_MODULES if m in loaded]
+    if heavy:
+        print(f"⚠️ Heavy optional modules imported at startup: {', '.join(heavy)}")
+    else:
+        print("✅ No heavy optional modules imported at startup")
+    return raw
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('scripts', nargs='*', default=DEFAULT_ENTRY_POINTS)
+    parser.add_argument('--top', type=int, default=15, help='number of packages to list per script')
+    parser.add_argument('--raw', help='write the full -X importtime output to this file')
+    args = parser.parse_args()
+
+    raw_output = []
+    for script in args.scripts:
+        raw_output.append(f"# {script}\n{report(script, args.top)}")
+
+    if args.raw:
+        Path(args.raw).write_text('\n'.join(raw_output))
+        print(f"\nFull profile written to {args.raw}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,115 @@
+"""
+Synthetic data generators for the benchmark suite.
+
+Every generator takes a ``scale`` multiplier relative to the real files in
+data/raw, so 10x/100x/1000x runs track how the hot paths grow with data.
+"""
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from utils.transforms import reshape_tourism_stats
+
+RAW_DIR = Path(__file__).parent.parent / 'data' / 'raw'
+
+# India's approximate bounding box, matching the ranges used in app.py
+LAT_RANGE = (8, 37)
+LON_RANGE = (68, 97)
+
+
+def scale_raw_file(src, dst, scale):
+    """
+    Write a copy of src with its body lines repeated scale times.
+    Works on bytes so the original encoding is preserved.
+    """
+    lines = Path(src).read_bytes().splitlines(keepends=True)
+    if lines and not lines[-1].endswith(b'\n'):
+        lines[-1] += b'\n'
+    header, body = lines[:1], lines[1:]
+    Path(dst).write_bytes(b''.join(header + body * scale))
+    return Path(dst)
+
+
+def scaled_raw_dir(dst_dir, scale):
+    """Copy every CSV in data/raw into dst_dir at the given scale"""
+    dst_dir = Path(dst_dir)
+    dst_dir.mkdir(parents=True, exist_ok=True)
+    return [
+        scale_raw_file(src, dst_dir / src.name, scale)
+        for src in sorted(RAW_DIR.glob('*.csv'))
+    ]
+
+
+def _scaled_states(states, scale):
+    """Repeat state names with a suffix so group cardinality scales too"""
+    return [f"{state} {i}" if i else state for i in range(scale) for state in states]
+
+
+def tourism_frames(scale):
+    """Scaled copies of the 2019-2021 and 2016-2018 state visitor tables"""
+    df1 = pd.read_csv(RAW_DIR / 'RS_Session_259_AU_1898_B_and_C.csv')
+    df2 = pd.read_csv(RAW_DIR / 'RS-Session-251-AU308-Annexure-I.csv')
+
+    df1 = df1[df1['Sl. No.'] != 'Total']
+    df1 = pd.concat([df1] * scale, ignore_index=True)
+    df1['State/ UT'] = _scaled_states(df1['State/ UT'].iloc[:len(df1) // scale].tolist(), scale)
+
+    df2 = pd.concat([df2] * scale, ignore_index=True)
+    df2['States'] = _scaled_states(df2['States'].iloc[:len(df2) // scale].tolist(), scale)
+    return df1, df2
+
+
+def geological_site_names(scale):
+    """Scaled list of geological heritage site names"""
+    df = pd.read_csv(RAW_DIR / 'rs_session-238_AU1380_1.1.csv', encoding='cp1252')
+    return pd.Series(df.iloc[:, 2].tolist() * scale)
+
+
+def cultural_sites(scale, seed=0):
+    """
+    Synthetic cultural sites in the lowercase layout used by
+    utils/visualization.create_map
+    """
+    base = pd.read_csv(RAW_DIR / 'cultural_sites.csv')
+    rng = np.random.default_rng(seed)
+    n = len(base) * scale
+    return pd.DataFrame({
+        'site_name': [f"{name} {i}" for i in range(scale) for name in base['site_name']],
+        'state': _scaled_states(base['state'].tolist(), scale),
+        'type': base['type'].tolist() * scale,
+        'latitude': rng.uniform(*LAT_RANGE, n),
+        'longitude': rng.uniform(*LON_RANGE, n)
+    })
+
+
+def festivals(scale, seed=0):
+    """
+    The Festival of India events repeated scale times, each copy jittered
+    so the points spread over neighbouring map cells
+    """
+    from utils.catalog import read_festivals_json
+
+    base = read_festivals_json(RAW_DIR / 'Festival_of_India.json')
+    rng = np.random.default_rng(seed)
+    df = pd.concat([base] * scale, ignore_index=True)
+    df['LAT'] = np.clip(df['LAT'] + rng.normal(0, 2, len(df)), -89, 89).astype('float32')
+    df['LON'] = np.clip(df['LON'] + rng.normal(0, 2, len(df)), -179, 179).astype('float32')
+    return df
+
+
+def app_frames(scale):
+    """
+    Cultural sites, art forms and tourism stats in the uppercase layout
+    used by app.py, sharing the same scaled set of states
+    """
+    sites = cultural_sites(scale)
+    sites.columns = [col.upper() for col in sites.columns]
+
+    base_arts = pd.read_csv(RAW_DIR / 'art_forms.csv')
+    arts = pd.concat([base_arts] * scale, ignore_index=True)
+    arts.columns = [col.upper() for col in arts.columns]
+    arts['STATE'] = _scaled_states(base_arts['state'].tolist(), scale)
+
+    tourism = reshape_tourism_stats(*tourism_frames(scale))
+    return sites, arts, tourism
@@ -0,0 +1,76 @@
+from utils.aggregates import AGGREGATES, OVERVIEW_METRICS, overview_metrics, refresh_aggregates
+from utils.backends import write_pandas
+from synthetic import app_frames
+
+
+def test_overview_metrics_local(benchmark, scale):
+    sites, arts, tourism = app_frames(scale)
+    overview = benchmark(overview_metrics, arts, sites, tourism)
+    assert len(overview) == 1
+    assert overview['CULTURAL_SITES'].iloc[0] == len(sites)
+
+
+def test_overview_metrics_single_row_read(benchmark, scale, local_db):
+    sites, arts, tourism = app_frames(scale)
+    conn = local_db()
+    for table, df in [('ART_FORMS', arts), ('CULTURAL_SITES', sites), ('TOURISM_STATS', tourism)]:
+        write_pandas(conn, df, table, overwrite=True)
+    assert refresh_aggregates(conn, AGGREGATES[:1]) == ['OVERVIEW_METRICS']
+
+    def read():
+        cursor = conn.cursor()
+        cursor.execute("SELECT * FROM OVERVIEW_METRICS")
+        return cursor.fetchall()
+
+    rows = benchmark(read)
+    expected = overview_metrics(arts, sites, tourism).iloc[0]
+    assert rows == [tuple(int(value) for value in expected)]
+    conn.close()
+
+
+class _DynamicTableCursor:
+    """Answers refresh_aggregates' Snowflake queries: every base table exists, and dynamic tables have comments"""
+
+    def __init__(self, statements, comments):
+        self.statements = statements
+        self.comments = comments
+        self.description = None
+        self._rows = []
+
+    def execute(self, query, params=None):
+        self.statements.append(query)
+        if query.startswith("SELECT CURRENT_WAREHOUSE()"):
+            self._rows = [('COMPUTE_WH',)]
+        elif query.startswith("SHOW DYNAMIC TABLES"):
+            self.description = [('name',), ('comment',)]
+            self._rows = list(self.comments.items())
+        else:
+            self._rows = [(params,)]
+
+    def fetchone(self):
+        return self._rows[0] if self._rows else None
+
+    def fetchall(self):
+        return self._rows
+
+    def close(self):
+        pass
+
+
+class _DynamicTableConnection:
+    def __init__(self, comments):
+        self.statements = []
+        self.comments = comments
+
+    def cursor(self):
+        return _DynamicTableCursor(self.statements, self.comments)
+
+
+def test_dynamic_tables_refreshed_in_place():
+    conn = _DynamicTableConnection({OVERVIEW_METRICS.table: OVERVIEW_METRICS.comment,
+                                    'MONUMENTS_TOURISM': 'aggregate definition 0000000000000000'})
+    assert refresh_aggregates(conn) == ['OVERVIEW_METRICS', 'MONUMENTS_TOURISM']
+    # Unchanged definition: refreshed, keeping its incremental state; changed: recreated
+    assert "ALTER DYNAMIC TABLE OVERVIEW_METRICS REFRESH" in conn.statements
+    assert not any(s.startswith("CREATE OR REPLACE DYNAMIC TABLE OVERVIEW_METRICS") for s in conn.statements)
+    assert any(s.startswith("CREATE OR REPLACE DYNAMIC TABLE MONUMENTS_TOURISM") for s in conn.statements)
@@ -0,0 +1,94 @@
+import pandas as pd
+import pyarrow as pa
+import pytest
+from starlette.testclient import TestClient
+
+import api
+from utils import catalog
+from utils.backends import write_pandas
+from utils.serving import ConnectionPool, PooledConnection
+from synthetic import app_frames
+
+
+@pytest.fixture
+def client(local_db, monkeypatch):
+    # Served through a pool as on Snowflake (pooled_connection hands back
+    # a bare DuckDB connection), so requests check connections out and in
+    pool = ConnectionPool(local_db, size=2, timeout=5)
+    monkeypatch.setattr(api, '_connection', PooledConnection(pool))
+    catalog._fetch.clear()
+    catalog.refresh()
+    yield pool.first, TestClient(api.app)
+    # Every request handed its connection back
+    assert pool._idle.qsize() == pool.opened
+    pool.close()
+
+
+def _publish_tourism(conn, scale):
+    _, _, tourism = app_frames(scale)
+    tourism = tourism.sort_values('YEAR', kind='stable', ignore_index=True)
+    write_pandas(conn, tourism, 'TOURISM_STATS', overwrite=True)
+    return tourism
+
+
+def test_api_json_pages(benchmark, scale, client):
+    conn, http = client
+    tourism = _publish_tourism(conn, scale)
+    page_size = min(api.MAX_PAGE_SIZE, max(1, len(tourism) // 3))
+
+    def read_all():
+        rows, url = [], f"/datasets/tourism_stats?page_size={page_size}"
+        while url:
+            response = http.get(url)
+            assert response.status_code == 200
+            rows.extend(response.json()['rows'])
+            url = response.links.get('next', {}).get('url')
+        return rows
+
+    rows = benchmark(read_all)
+    assert len(rows) == len(tourism)
+    assert pd.DataFrame(rows)['DOMESTIC_VISITORS'].sum() == tourism['DOMESTIC_VISITORS'].sum()
+
+
+def test_api_arrow_gzip_and_etag(client):
+    conn, http = client
+    tourism = _publish_tourism(conn, 100)
+    response = http.get("/datasets/tourism_stats?page_size=500", headers={'Accept': api.ARROW_STREAM})
+    assert response.status_code == 200
+    assert response.headers['content-encoding'] == 'gzip'
+    table = pa.ipc.open_stream(response.content).read_all().to_pandas()
+    assert len(table) == min(500, len(tourism))
+    assert int(response.headers['X-Total-Rows']) == len(tourism)
+
+    # Unchanged data: answered from the client's copy
+    cached = http.get("/datasets/tourism_stats?page_size=500&format=arrow",
+                      headers={'If-None-Match': response.headers['ETag']})
+    assert cached.status_code == 304
+
+
+def test_api_connect_failure_backoff(monkeypatch):
+    attempts = []
+
+    def unreachable():
+        attempts.append(1)
+        raise ConnectionError("warehouse unreachable")
+
+    monkeypatch.setattr(api, 'get_connection', unreachable)
+    monkeypatch.setattr(api, '_connection', None)
+    monkeypatch.setattr(api, '_connect_failed_at', None)
+    # Local files until the back-off runs out, without reconnecting per request
+    assert api.get_api_connection() is None
+    assert api.get_api_connection() is None
+    assert len(attempts) == 1
+    monkeypatch.setattr(api, 'CONNECT_RETRY_SECONDS', 0)
+    assert api.get_api_connection() is None
+    assert len(attempts) == 2
+
+
+def test_api_rejects_bad_requests(client):
+    _, http = client
+    assert http.get("/datasets/no_such_table").status_code == 404
+    assert http.get("/datasets/monuments?page_size=0").status_code == 400
+    assert http.get("/datasets/monuments?format=xml").status_code == 400
+    names = [dataset['name'] for dataset in http.get("/datasets").json()['datasets']]
+    assert names == api.PUBLISHED
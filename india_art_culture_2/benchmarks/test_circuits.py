@@ -0,0 +1,26 @@
+import numpy as np
+import pytest
+
+from utils.circuits import distance_matrix, nearest_neighbour_route, plan_circuit, route_length
+from synthetic import cultural_sites
+
+
+def site_distances(scale):
+    sites = cultural_sites(scale)
+    return distance_matrix(sites['latitude'], sites['longitude'])
+
+
+def test_distance_matrix(benchmark, scale):
+    sites = cultural_sites(scale)
+    dist = benchmark(distance_matrix, sites['latitude'], sites['longitude'])
+    assert dist.shape == (len(sites), len(sites))
+    assert np.allclose(dist, dist.T)
+
+
+# Circuits are planned per state, so a few hundred sites is the interactive case
+@pytest.mark.parametrize('scale', [10, 100], ids=lambda s: f"{s * 4}_sites")
+def test_plan_circuit(benchmark, scale):
+    dist = site_distances(scale)
+    route, total_km = benchmark(plan_circuit, dist)
+    assert sorted(route) == list(range(len(dist)))
+    assert total_km <= route_length(nearest_neighbour_route(dist), dist)
@@ -0,0 +1,54 @@
+import io
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from utils.exports import FORMATS, export_bytes, iter_export, write_export
+from utils.transforms import build_state_analysis
+from synthetic import app_frames
+
+CHUNK_ROWS = 1000
+
+
+def _read(data, fmt):
+    if fmt == 'parquet':
+        return pq.read_table(io.BytesIO(data)).to_pandas()
+    if fmt == 'arrow':
+        return pa.ipc.open_stream(data).read_all().to_pandas()
+    return pd.read_csv(io.BytesIO(data))
+
+
+@pytest.mark.parametrize('fmt', list(FORMATS))
+def test_write_export(benchmark, scale, fmt, tmp_path):
+    _, _, tourism = app_frames(scale)
+    path = tmp_path / f"tourism.{fmt}"
+    nbytes = benchmark(write_export, tourism, fmt, path)
+    assert nbytes == path.stat().st_size
+    exported = _read(path.read_bytes(), fmt)
+    assert len(exported) == len(tourism)
+    assert exported['DOMESTIC_VISITORS'].sum() == tourism['DOMESTIC_VISITORS'].sum()
+
+
+@pytest.mark.parametrize('fmt', list(FORMATS))
+def test_export_chunks(fmt):
+    sites, arts, tourism = app_frames(100)
+    state_analysis = build_state_analysis(sites, arts, tourism)
+    frame = pd.concat([state_analysis] * (CHUNK_ROWS * 3 // len(state_analysis) + 1), ignore_index=True)
+    chunks = [chunk for chunk in iter_export(frame, fmt, chunk_rows=CHUNK_ROWS) if chunk]
+    # One piece per chunk of rows, plus the Parquet footer / Arrow end marker
+    assert len(chunks) >= -(-len(frame) // CHUNK_ROWS)
+    exported = _read(b''.join(chunks), fmt)
+    if fmt == 'csv':
+        assert exported['STATE'].tolist() == frame['STATE'].tolist()
+    else:
+        assert exported.equals(frame)
+    if fmt == 'parquet':
+        assert pq.ParquetFile(io.BytesIO(b''.join(chunks))).num_row_groups == len(chunks) - 1
+
+
+def test_export_empty_table():
+    empty = pd.DataFrame({'STATE': pd.Series(dtype=object), 'VISITS': pd.Series(dtype='int64')})
+    for fmt in FORMATS:
+        assert len(_read(export_bytes(empty, fmt), fmt)) == 0
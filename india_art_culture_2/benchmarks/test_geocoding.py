@@ -0,0 +1,35 @@
+import pandas as pd
+
+from utils.geocoding import geocode, get_gazetteer
+from synthetic import geological_site_names
+
+
+def site_frame(scale):
+    return pd.DataFrame({'SITE_NAME': geological_site_names(scale)})
+
+
+def test_locate_sites_uncached(benchmark):
+    sites = site_frame(1)
+    gazetteer = get_gazetteer()
+    located = benchmark(lambda: [gazetteer.locate(name) for name in sites['SITE_NAME']])
+    assert sum(place is not None for place in located) == len(sites)
+
+
+def test_geocode_cached(benchmark, scale, tmp_path):
+    sites = site_frame(scale)
+    cache_path = tmp_path / 'geocode_cache.json'
+    geocode(sites, 'SITE_NAME', free_text=True, cache_path=cache_path)
+    located = benchmark(geocode, sites, 'SITE_NAME', free_text=True, cache_path=cache_path)
+    assert located['LATITUDE'].notna().all()
+
+
+def test_geocode_truncated_cache(tmp_path):
+    sites = site_frame(1)
+    cache_path = tmp_path / 'geocode_cache.json'
+    geocode(sites, 'SITE_NAME', free_text=True, cache_path=cache_path)
+    # An interrupted write: rebuilt instead of failing every render
+    cache_path.write_text(cache_path.read_text()[:50])
+    located = geocode(sites, 'SITE_NAME', free_text=True, cache_path=cache_path)
+    assert located['LATITUDE'].notna().all()
+    assert [path.name for path in tmp_path.iterdir()] == ['geocode_cache.json']
+    geocode(sites, 'SITE_NAME', free_text=True, cache_path=cache_path)
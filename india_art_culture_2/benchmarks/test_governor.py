@@ -0,0 +1,81 @@
+import time
+
+import pytest
+
+from utils import governor
+from utils.queries import QueryCancelled, run_query, submit_query
+
+# Runs for minutes unless stopped
+SLOW_QUERY = "SELECT SUM(i * i) FROM range(100000000000) t(i)"
+
+
+def test_query_timeout(benchmark, local_db, monkeypatch):
+    monkeypatch.setattr(governor, 'QUERY_TIMEOUT_SECONDS', 1)
+    conn = local_db()
+
+    def timed_out():
+        start = time.perf_counter()
+        with pytest.raises(Exception, match='Interrupt'):
+            run_query(conn, SLOW_QUERY)
+        return time.perf_counter() - start
+
+    elapsed = benchmark.pedantic(timed_out, rounds=1, iterations=1)
+    assert elapsed < 5
+    conn.close()
+
+
+def test_cancel_async_query(benchmark, local_db):
+    conn = local_db()
+
+    def cancelled():
+        query = submit_query(conn, SLOW_QUERY, name='SLOW')
+        query.cancel()
+        return query
+
+    query = benchmark(cancelled)
+    assert query.done()
+    with pytest.raises(QueryCancelled):
+        query.result()
+    conn.close()
+
+
+def test_session_budget(local_db, monkeypatch):
+    monkeypatch.setattr(governor, '_usage', {})
+    monkeypatch.setattr(governor, 'SESSION_CREDIT_BUDGET', 0.5)
+    monkeypatch.setattr(governor, '_session_id', lambda: 'session')
+    conn = local_db()
+    run_query(conn, "SELECT 1")
+    assert governor.session_usage()['queries'] == 1
+    governor._usage['session']['credits'] = 0.5
+    with pytest.raises(governor.QueryBudgetExceeded):
+        run_query(conn, "SELECT 1")
+
+    # Outside a dashboard session (the API, scripts) there is no budget to run out of
+    monkeypatch.setattr(governor, '_session_id', lambda: None)
+    governor._usage[None] = {'queries': 1, 'seconds': 1.0, 'credits': 1.0}
+    run_query(conn, "SELECT 1")
+    conn.close()
+
+
+def test_usage_pruned_when_sessions_end(local_db, monkeypatch):
+    conn = local_db()
+    active = {'a', 'b'}
+
+    class FakeRuntime:
+        exists = staticmethod(lambda: True)
+        instance = classmethod(lambda cls: cls)
+        is_active_session = staticmethod(lambda session_id: session_id in active)
+
+    monkeypatch.setattr(governor, 'Runtime', FakeRuntime)
+    monkeypatch.setattr(governor, '_usage', {})
+    for session_id in ['a', 'b']:
+        monkeypatch.setattr(governor, '_session_id', lambda: session_id)
+        governor.charge(conn, 1.0)
+    assert set(governor._usage) == {'a', 'b'}
+
+    # Session a has ended: the next new session drops its usage
+    active = {'b', 'c'}
+    monkeypatch.setattr(governor, '_session_id', lambda: 'c')
+    governor.charge(conn, 1.0)
+    assert set(governor._usage) == {'b', 'c'}
+    conn.close()
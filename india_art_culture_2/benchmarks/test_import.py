@@ -0,0 +1,11 @@
+import pytest
+
+from importtime_report import HEAVY_MODULES, import_statements, profile_imports
+
+
+@pytest.mark.parametrize('script', ['app.py', 'combined_analysis.py'])
+def test_cold_import(benchmark, script):
+    code = import_statements(script)
+    rows, _ = benchmark.pedantic(profile_imports, args=(code,), rounds=3)
+    loaded = {row[0] for row in rows}
+    assert not [m for m in HEAVY_MODULES if m in loaded]
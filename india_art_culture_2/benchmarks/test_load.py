@@ -0,0 +1,46 @@
+import pandas as pd
+
+from utils.catalog import DATASETS, read_festivals_json, view
+from utils.transforms import reshape_tourism_stats
+from synthetic import RAW_DIR, scaled_raw_dir, tourism_frames
+
+# Every catalog dataset read from a CSV with its parse spec
+CSV_DATASETS = [dataset for dataset in DATASETS if dataset.file and dataset.file.endswith('.csv')]
+
+
+def read_all(raw_dir):
+    return [dataset.read(raw_dir / dataset.file) for dataset in CSV_DATASETS]
+
+
+def test_read_table_raw(benchmark):
+    frames = benchmark(read_all, RAW_DIR)
+    assert all(len(df) > 0 for df in frames)
+
+
+def test_read_table_scaled(benchmark, scale, tmp_path):
+    scaled_raw_dir(tmp_path, scale)
+    frames = benchmark(read_all, tmp_path)
+    assert all(len(df) > 0 for df in frames)
+
+
+def test_read_festivals_json(benchmark):
+    festivals = benchmark(read_festivals_json, RAW_DIR / 'Festival_of_India.json')
+    assert len(festivals) == 64
+    assert festivals['LAT'].dtype == 'float32'
+
+
+def test_reshape_tourism_stats(benchmark, scale):
+    df1, df2 = tourism_frames(scale)
+    result = benchmark(reshape_tourism_stats, df1, df2)
+    assert len(result) == 3 * len(df1) + 3 * len(df2)
+
+
+def test_view_shared_frame(benchmark, scale):
+    shared = reshape_tourism_stats(*tourism_frames(scale))
+    before = shared.copy()
+    # Copy-on-write, as the dashboards set it at startup
+    with pd.option_context('mode.copy_on_write', True):
+        page = benchmark(view, shared)
+        page['TOTAL_VISITORS'] = page['DOMESTIC_VISITORS'] + page['FOREIGN_VISITORS']
+        page.loc[0, 'DOMESTIC_VISITORS'] = -1
+    assert shared.equals(before)
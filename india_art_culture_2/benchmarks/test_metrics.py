@@ -0,0 +1,12 @@
+from utils.metrics import compute_growth
+from synthetic import app_frames
+
+VISITOR_COLS = ['DOMESTIC_VISITORS', 'FOREIGN_VISITORS']
+
+
+def test_compute_growth(benchmark, scale):
+    _, _, tourism = app_frames(scale)
+    growth = benchmark(compute_growth, tourism, 'YEAR', VISITOR_COLS, 'STATE')
+    assert set(growth.metrics) == set(VISITOR_COLS)
+    assert len(growth.series) == 2 * tourism.groupby(['STATE', 'YEAR']).ngroups
+    assert len(growth.top_growth('DOMESTIC_VISITORS', max(growth.periods))) == 5
@@ -0,0 +1,40 @@
+from utils.migrations import HISTORY_TABLE, discover, migrate
+
+
+def test_migrate_fresh_database(benchmark, local_db):
+    conns = []
+
+    def fresh():
+        conn = local_db()
+        for table in ['SCHEMA_HISTORY', 'ART_FORMS', 'CULTURAL_SITES', 'MONUMENTS', 'GENDER_TOURISM',
+                      'GEOLOGICAL_SITES', 'TOURISM_STATS']:
+            conn.db.execute(f"DROP TABLE IF EXISTS {table}")
+        conns.append(conn)
+        return (conn,), {}
+
+    applied = benchmark.pedantic(migrate, setup=fresh, rounds=5, iterations=1)
+    conn = conns[-1]
+    assert [m.version for m in applied] == [m.version for m in discover()]
+    assert migrate(conn) == []
+    assert conn.db.execute(f"SELECT COUNT(*) FROM {HISTORY_TABLE}").fetchone()[0] == len(applied)
+    for c in conns:
+        c.close()
+
+
+def test_migrate_folds_split_tourism_tables(local_db):
+    conn = local_db()
+    for table in ['SCHEMA_HISTORY', 'TOURISM_STATS']:
+        conn.db.execute(f"DROP TABLE IF EXISTS {table}")
+    # The layout snowflake_upload.sql used to create
+    for table, year in [('TOURISM_STATS_2016_2018', 2017), ('TOURISM_STATS_2019_2021', 2020)]:
+        conn.db.execute(f"CREATE OR REPLACE TABLE {table} AS "
+                        f"SELECT 'Goa' AS STATE, 100 AS DOMESTIC_VISITORS, 10 AS FOREIGN_VISITORS, {year} AS YEAR")
+    conn.db.execute("CREATE VIEW TOURISM_STATS AS SELECT * FROM TOURISM_STATS_2016_2018 "
+                    "UNION ALL SELECT * FROM TOURISM_STATS_2019_2021")
+
+    migrate(conn)
+    rows = conn.db.execute("SELECT YEAR, MONTH FROM TOURISM_STATS ORDER BY YEAR").fetchall()
+    # Folded yearly totals get MONTH 1, like reshape_tourism_stats, and stay in monthly groupings
+    assert rows == [(2017, 1), (2020, 1)]
+    assert isinstance(rows[0][1], int)
+    conn.close()
@@ -0,0 +1,46 @@
+from utils.backends import write_pandas
+from utils.queries import _cached_query, as_completed, cached_query, normalize_sql, run_query, submit_query
+from synthetic import app_frames
+
+MONUMENT_QUERIES = [
+    "SELECT * FROM IDENTIFIER(%s) WHERE STATE = %s",
+    "select *\n  from identifier( %s )\n where state = %s;  -- by state",
+]
+
+
+def test_normalize_sql(benchmark):
+    normalized = benchmark(lambda: [normalize_sql(query) for query in MONUMENT_QUERIES])
+    assert len(set(normalized)) == 1
+
+
+def test_cached_query_reformatted_hit(benchmark, scale, local_db):
+    _, _, tourism = app_frames(scale)
+    conn = local_db()
+    write_pandas(conn, tourism, 'TOURISM_STATS', overwrite=True)
+    _cached_query.clear()
+    query = "SELECT STATE, SUM(DOMESTIC_VISITORS) AS VISITS FROM IDENTIFIER(%s) WHERE YEAR = %s GROUP BY STATE"
+    first = cached_query(conn, query, ('TOURISM_STATS', 2019), version=scale)
+    # Only the first call reaches the database
+    result = benchmark(cached_query, conn, query.lower().replace(' ', '  '), ('TOURISM_STATS', 2019), version=scale)
+    assert result.equals(first)
+    assert len(first) == tourism[tourism['YEAR'] == 2019]['STATE'].nunique()
+    conn.close()
+
+
+def test_submit_queries_as_completed(benchmark, scale, local_db):
+    _, _, tourism = app_frames(scale)
+    conn = local_db()
+    write_pandas(conn, tourism, 'TOURISM_STATS', overwrite=True)
+    query = "SELECT STATE, SUM(DOMESTIC_VISITORS) AS VISITS FROM IDENTIFIER(%s) WHERE YEAR = %s GROUP BY STATE ORDER BY STATE"
+    years = sorted(tourism['YEAR'].unique().tolist())
+
+    def submit_all():
+        # Every year's query in flight at once, collected in completion order
+        queries = {submit_query(conn, query, ('TOURISM_STATS', year)): year for year in years}
+        return {queries[done]: done.result() for done in as_completed(queries, poll_interval=0.001)}
+
+    results = benchmark(submit_all)
+    assert sorted(results) == years
+    for year in years:
+        assert results[year].equals(run_query(conn, query, ('TOURISM_STATS', year)))
+    conn.close()
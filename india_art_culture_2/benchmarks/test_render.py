@@ -0,0 +1,23 @@
+from utils.visualization import ZOOM_CELL_DEGREES, build_festival_tiles, create_festival_funding_map, create_map
+from synthetic import cultural_sites, festivals
+
+
+def test_create_map(benchmark, scale):
+    sites = cultural_sites(scale)
+    m = benchmark(create_map, sites)
+    markers = [child for child in m._children.values() if type(child).__name__ == 'Marker']
+    assert len(markers) == len(sites)
+
+
+def test_build_festival_tiles(benchmark, scale):
+    events = festivals(scale)
+    tiles = benchmark(build_festival_tiles, events)
+    located = events.dropna(subset=['LAT', 'LON'])
+    assert all(cells['count'].sum() == len(located) for cells in tiles.values())
+
+
+def test_create_festival_funding_map(benchmark, scale):
+    tiles = build_festival_tiles(festivals(scale))
+    fig = benchmark(create_festival_funding_map, tiles, max(ZOOM_CELL_DEGREES))
+    # One marker per cell, bounded by the grid rather than the number of events
+    assert sum(len(trace.lat) for trace in fig.data) == len(tiles[max(ZOOM_CELL_DEGREES)])
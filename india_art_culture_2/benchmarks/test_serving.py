@@ -0,0 +1,177 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from utils import catalog
+from utils.aggregates import AGGREGATES, refresh_aggregates
+from utils.backends import write_pandas
+from utils.queries import run_query
+from utils.serving import ConnectionPool, PooledConnection, PoolExhausted, SingleFlight
+from synthetic import app_frames
+
+USERS = 50
+
+
+def _counting(monkeypatch, module, name):
+    """Wrap module.name to count its calls, slowed down so concurrent callers overlap"""
+    calls = []
+    original = getattr(module, name)
+
+    def counted(*args, **kwargs):
+        calls.append(args)
+        time.sleep(0.05)
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(module, name, counted)
+    return calls
+
+
+def _publish_overview(conn, scale):
+    sites, arts, tourism = app_frames(scale)
+    for table, df in [('ART_FORMS', arts), ('CULTURAL_SITES', sites), ('TOURISM_STATS', tourism)]:
+        write_pandas(conn, df, table, overwrite=True)
+    refresh_aggregates(conn, AGGREGATES[:1])
+
+
+def test_concurrent_overview_single_fetch(benchmark, scale, local_db, monkeypatch):
+    conn = local_db()
+    _publish_overview(conn, scale)
+    queries = _counting(monkeypatch, catalog, '_query_table')
+
+    def open_overview():
+        # Every user opens the Overview page at once, on a cold cache
+        catalog._fetch.clear()
+        queries.clear()
+        barrier = threading.Barrier(USERS)
+
+        def user():
+            barrier.wait()
+            return catalog.load('overview_metrics', conn)
+
+        with ThreadPoolExecutor(USERS) as pool:
+            return list(pool.map(lambda _: user(), range(USERS)))
+
+    frames = benchmark.pedantic(open_overview, rounds=3, iterations=1)
+    assert len(queries) == 1
+    assert all(frame.equals(frames[0]) for frame in frames)
+    conn.close()
+
+
+def test_progressive_loads_share_queries(local_db, monkeypatch):
+    conn = local_db()
+    _publish_overview(conn, 10)
+    names = ['art_forms', 'cultural_sites', 'tourism_stats']
+    catalog._fetch.clear()
+    catalog._fetched.clear()
+    submitted = _counting(monkeypatch, catalog, 'submit_query')
+    queried = _counting(monkeypatch, catalog, '_query_table')
+    barrier = threading.Barrier(2)
+
+    def page():
+        barrier.wait()
+        return dict(catalog.load_progressively(names, conn))
+
+    with ThreadPoolExecutor(2) as pool:
+        first, second = pool.map(lambda _: page(), range(2))
+    # Each table is queried once, by whichever session asked first
+    assert len(submitted) + len(queried) == len(names)
+    for name in names:
+        assert first[name].equals(second[name])
+    conn.close()
+
+
+def test_unavailable_table_not_requeried(local_db, monkeypatch):
+    conn = local_db()
+    _, _, tourism = app_frames(10)
+    write_pandas(conn, tourism.head(0), 'TOURISM_STATS', overwrite=True)
+    catalog._fetch.clear()
+    catalog.refresh()
+    queried = _counting(monkeypatch, catalog, '_query_table')
+    warnings = []
+    monkeypatch.setattr(catalog.st, 'warning', warnings.append)
+
+    # The empty table (and its missing source tables) fall back to the
+    # local files once, then stay local
+    first = catalog.load('tourism_stats', conn)
+    fallbacks = len(queried)
+    assert len(warnings) == fallbacks
+    frames = [catalog.load('tourism_stats', conn) for _ in range(2)]
+    assert len(queried) == fallbacks
+    assert len(warnings) == fallbacks
+    assert all(frame.equals(first) for frame in frames)
+    assert catalog.snapshot(['tourism_stats'], conn)['tourism_stats'][0] == 'local'
+
+    # A refresh retries the table
+    catalog.refresh()
+    catalog.load('tourism_stats', conn)
+    assert [dataset.name for dataset, _ in queried[fallbacks:]] == ['tourism_stats']
+    conn.close()
+
+
+def test_single_flight_shares_errors():
+    flights = SingleFlight()
+    calls = []
+    started = threading.Event()
+
+    def failing():
+        calls.append(1)
+        started.set()
+        time.sleep(0.1)
+        raise LookupError("missing")
+
+    def follower():
+        started.wait()
+        return flights.do('key', failing)
+
+    with ThreadPoolExecutor(4) as pool:
+        leader = pool.submit(flights.do, 'key', failing)
+        followers = [pool.submit(follower) for _ in range(3)]
+        for future in [leader, *followers]:
+            with pytest.raises(LookupError):
+                future.result()
+    assert len(calls) == 1
+
+
+def test_pool_bounds_connections(benchmark, local_db):
+    pool = ConnectionPool(local_db, size=2, timeout=5)
+    conn = PooledConnection(pool)
+
+    def concurrent_queries():
+        with ThreadPoolExecutor(8) as workers:
+            return list(workers.map(lambda i: run_query(conn, "SELECT %s AS N", (i,)), range(32)))
+
+    results = benchmark(concurrent_queries)
+    assert [df['N'].iloc[0] for df in results] == list(range(32))
+    assert pool.opened <= 2
+
+    # Both connections checked out: the next caller gives up after the timeout
+    pool.timeout = 0.1
+    with pool.connection(), pool.connection():
+        with pytest.raises(PoolExhausted):
+            conn.cursor()
+    pool.close()
+
+
+class _WarehouseConnection:
+    """A local connection that passes for a Snowflake one, so queries are charged by warehouse size"""
+
+    def __init__(self, conn):
+        self._conn = conn
+
+    def cursor(self):
+        return self._conn.cursor()
+
+    def close(self):
+        self._conn.close()
+
+
+def test_charge_needs_no_second_connection(local_db):
+    # One connection: charging a query must not check out another while its own is in use
+    pool = ConnectionPool(lambda: _WarehouseConnection(local_db()), size=1, timeout=0.1)
+    conn = PooledConnection(pool)
+    assert run_query(conn, "SELECT 1 AS N")['N'].iloc[0] == 1
+    assert run_query(conn, "SELECT 2 AS N")['N'].iloc[0] == 2
+    assert pool.opened == 1
+    pool.close()
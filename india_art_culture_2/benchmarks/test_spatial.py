@@ -0,0 +1,33 @@
+import numpy as np
+
+from utils.spatial import SpatialIndex, haversine_km
+from synthetic import cultural_sites
+
+# Taj Mahal
+ORIGIN = (27.1751, 78.0421)
+
+
+def brute_force_nearest(sites, n):
+    distances = haversine_km(*ORIGIN, sites['latitude'], sites['longitude'])
+    return np.sort(distances)[:n]
+
+
+def test_build_site_index(benchmark, scale):
+    sites = cultural_sites(scale)
+    index = benchmark(SpatialIndex, sites, 'latitude', 'longitude')
+    assert len(index) == len(sites)
+
+
+def test_nearest_sites(benchmark, scale):
+    sites = cultural_sites(scale)
+    index = SpatialIndex(sites, 'latitude', 'longitude')
+    nearest = benchmark(index.nearest, *ORIGIN, 5)
+    assert np.allclose(nearest['DISTANCE_KM'], brute_force_nearest(sites, 5))
+
+
+def test_sites_within_radius(benchmark, scale):
+    sites = cultural_sites(scale)
+    index = SpatialIndex(sites, 'latitude', 'longitude')
+    within = benchmark(index.within, *ORIGIN, 100)
+    distances = haversine_km(*ORIGIN, sites['latitude'], sites['longitude'])
+    assert len(within) == (distances <= 100).sum()
@@ -0,0 +1,15 @@
+from utils.catalog import get_dataset
+from utils.star_schema import SOURCES, TABLES, build_star_schema, state_profile
+from synthetic import scaled_raw_dir
+
+
+def test_build_star_schema(benchmark, scale, tmp_path):
+    scaled_raw_dir(tmp_path, scale)
+    frames = {name: get_dataset(name).read(tmp_path / get_dataset(name).file) for name in SOURCES}
+    star = benchmark(build_star_schema, frames)
+    assert set(star) == set(TABLES)
+    # Repeated rows collapse onto the same states and years
+    assert len(star['DIM_STATE']) == star['DIM_STATE']['KEY'].nunique()
+    assert not star['FACT_VISITS'].duplicated(['STATE_ID', 'YEAR', 'VISITOR_TYPE']).any()
+    assert star['FACT_VISITS']['STATE_ID'].isin(star['DIM_STATE']['STATE_ID']).all()
+    assert len(state_profile(star, 2019)) > 0
@@ -0,0 +1,14 @@
+from utils.transforms import build_state_analysis, classify_site
+from synthetic import app_frames, geological_site_names
+
+
+def test_classify_site(benchmark, scale):
+    names = geological_site_names(scale)
+    site_types = benchmark(names.apply, classify_site)
+    assert len(site_types) == len(names)
+
+
+def test_build_state_analysis(benchmark, scale):
+    sites, arts, tourism = app_frames(scale)
+    state_analysis = benchmark(build_state_analysis, sites, arts, tourism)
+    assert len(state_analysis) == sites['STATE'].nunique()
@@ -0,0 +1,100 @@
+"""
+Uploader benchmarks against the local DuckDB backend, so they measure the
+client-side cost (parsing, row-by-row inserts, manifest checks) without a
+Snowflake account.
+"""
+import pytest
+
+import data_uploader
+import upload_missing_data
+from utils.backends import get_backend
+from synthetic import scaled_raw_dir
+
+ROW_BY_ROW_UPLOADERS = {
+    'MONUMENTS': upload_missing_data.upload_monuments_data,
+    'GENDER_TOURISM': upload_missing_data.upload_gender_tourism_data,
+    'GEOLOGICAL_SITES': upload_missing_data.upload_geological_sites_data
+}
+
+
+@pytest.fixture
+def scaled_workdir(tmp_path, scale, monkeypatch):
+    """Working directory whose data/raw holds scaled copies of the raw files"""
+    scaled_raw_dir(tmp_path / 'data' / 'raw', scale)
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def count_rows(local_db, table):
+    conn = local_db()
+    try:
+        return conn.db.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def _upload_modes(monkeypatch):
+    """Record the mode sync_file chose for each table the uploader syncs"""
+    modes = {}
+    sync_file = data_uploader.sync_file
+
+    def recorded(conn, manifest, file_path, table, *args, **kwargs):
+        mode, nrows = sync_file(conn, manifest, file_path, table, *args, **kwargs)
+        modes[table] = mode
+        return mode, nrows
+
+    monkeypatch.setattr(data_uploader, 'sync_file', recorded)
+    return modes
+
+
+@pytest.mark.parametrize('table', list(ROW_BY_ROW_UPLOADERS))
+def test_upload_missing_data(benchmark, table, scaled_workdir, local_db):
+    # One INSERT per row takes tens of seconds at 1000x, so a single round is enough
+    benchmark.pedantic(ROW_BY_ROW_UPLOADERS[table], rounds=1, iterations=1)
+    assert count_rows(local_db, table) > 0
+
+
+def test_load_data_to_snowflake_full(benchmark, scaled_workdir, local_db, monkeypatch):
+    manifest_path = get_backend().manifest_path
+    modes = _upload_modes(monkeypatch)
+
+    def reset_upload():
+        # Forget the last upload locally and remotely, and drop what it loaded
+        manifest_path.unlink(missing_ok=True)
+        conn = local_db()
+        try:
+            for table in ['UPLOAD_MANIFEST', 'ART_FORMS', 'CULTURAL_SITES', 'TOURISM_STATS']:
+                conn.db.execute(f"DROP TABLE IF EXISTS {table}")
+        finally:
+            conn.close()
+        modes.clear()
+
+    benchmark.pedantic(data_uploader.load_data_to_snowflake, setup=reset_upload, rounds=3, iterations=1)
+    # Every round loaded every table in full
+    assert modes == {'ART_FORMS': 'replace', 'CULTURAL_SITES': 'replace', 'TOURISM_STATS': 'replace'}
+    assert count_rows(local_db, 'CULTURAL_SITES') > 0
+
+
+def test_load_data_to_snowflake_unchanged(benchmark, scaled_workdir, local_db):
+    data_uploader.load_data_to_snowflake()
+    benchmark.pedantic(data_uploader.load_data_to_snowflake, rounds=3, iterations=1)
+    assert count_rows(local_db, 'UPLOAD_MANIFEST') == 3
+
+
+def test_dropped_table_reloaded(tmp_path, monkeypatch, local_db):
+    scaled_raw_dir(tmp_path / 'data' / 'raw', 10)
+    monkeypatch.chdir(tmp_path)
+    data_uploader.load_data_to_snowflake()
+    conn = local_db()
+    conn.db.execute("DROP TABLE CULTURAL_SITES")
+    conn.close()
+
+    # The manifest says the file is current, but the table is gone
+    modes = _upload_modes(monkeypatch)
+    data_uploader.load_data_to_snowflake()
+    assert modes == {'ART_FORMS': 'skipped', 'CULTURAL_SITES': 'replace', 'TOURISM_STATS': 'skipped'}
+    assert count_rows(local_db, 'CULTURAL_SITES') > 0
+
+    modes.clear()
+    data_uploader.load_data_to_snowflake(force=True)
+    assert set(modes.values()) == {'replace'}
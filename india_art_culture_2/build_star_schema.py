@@ -0,0 +1,28 @@
+from utils import catalog
+from utils.backends import get_connection
+from utils.star_schema import SOURCES, publish_star_schema, query_state_profile
+
+def build_star_schema():
+    """Rebuild the star schema tables from the session answers in data/raw"""
+    frames = {}
+    for name in SOURCES:
+        dataset = catalog.get_dataset(name)
+        if dataset.path.exists():
+            frames[name] = dataset.read()
+        else:
+            print(f"⚠️ File not found: {dataset.file}")
+    
+    conn = get_connection()
+    try:
+        for table, nrows in publish_star_schema(conn, frames).items():
+            print(f"✅ Loaded {nrows} rows into {table}")
+        
+        # Quick check that every fact table joins on STATE_ID
+        profile = query_state_profile(conn, 2019)
+        print(f"\nState profile for 2019: {len(profile)} states")
+        print(profile.head(10).to_string(index=False))
+    finally:
+        conn.close()
+
+if __name__ == "__main__":
+    build_star_schema()
@@ -1,14 +1,36 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
-import seaborn as sns
-import matplotlib.pyplot as plt
 import os
-import json
 from dotenv import load_dotenv
-import snowflake.connector
-from snowflake.connector.pandas_tools import write_pandas
+from utils import catalog
+from utils.aggregates import refresh_aggregates
+from utils.backends import get_backend, get_connection
+from utils.clustering import apply_physical_design
+from utils.instrumentation import (
+    instrumented, performance_page_enabled, plotly_chart, show_performance_page, track
+)
+from utils.lazy_imports import lazy_import
+from utils.governor import show_preview, show_session_usage
+from utils.queries import session_parameters
+from utils.serving import dedicated, pooled_connection
+from utils.geocoding import geocode
+from utils.schemas import index_by_role
+from utils.spatial import SpatialIndex
+from utils.star_schema import SOURCES as STAR_SOURCES, TABLES as STAR_TABLES, publish_star_schema, query_state_profile, state_profile
+from utils.transforms import normalize_festivals
+from utils.visualization import ZOOM_CELL_DEGREES, build_festival_tiles, create_festival_funding_map
+from utils.upload_manifest import UploadManifest, sync_file
+
+# Loaded frames are shared by every session instead of copied on each
+# rerun. Under copy-on-write a frame derived from a shared one (a filter,
+# a rename, a new column) never writes back into it.
+pd.set_option('mode.copy_on_write', True)
+
+# Only imported when a Snowflake connection is actually opened
+snowflake_connector = lazy_import('snowflake.connector')
 
 # Load environment variables
 load_dotenv()
@@ -57,10 +79,26 @@ def check_snowflake_config():
     st.table(pd.DataFrame(status_data))
     return True
 
-@st.cache_resource
+def connect_pool(account):
+    """Pool of connections to account, shared by every session; opens the first one right away"""
+    return pooled_connection(lambda: snowflake_connector.connect(
+        user=SNOWFLAKE_CONFIG['user'],
+        password=SNOWFLAKE_CONFIG['password'],
+        account=account,
+        warehouse=SNOWFLAKE_CONFIG['warehouse'],
+        database=SNOWFLAKE_CONFIG['database'],
+        schema=SNOWFLAKE_CONFIG['schema'],
+        session_parameters=session_parameters()
+    ))
+
+@instrumented('connection', cache=st.cache_resource)
 def get_snowflake_connection():
-    """Create and cache Snowflake connection"""
+    """Create and cache a pool of Snowflake connections"""
     try:
+        # Local backend needs no credentials
+        if get_backend().name != 'snowflake':
+            return get_connection()
+        
         if not check_snowflake_config():
             return None
             
@@ -71,14 +109,7 @@ def get_snowflake_connection():
         if 'snowflakecomputing.com' not in account and '.' not in account:
             # If it's not a full URL and doesn't contain a region, assume it's a new format account
             st.info(f"Using modern Snowflake account format: {account}")
-            conn = snowflake.connector.connect(
-                user=SNOWFLAKE_CONFIG['user'],
-                password=SNOWFLAKE_CONFIG['password'],
-                account=account,
-                warehouse=SNOWFLAKE_CONFIG['warehouse'],
-                database=SNOWFLAKE_CONFIG['database'],
-                schema=SNOWFLAKE_CONFIG['schema']
-            )
+            conn = connect_pool(account)
             st.success("Successfully connected to Snowflake!")
             return conn
         
@@ -90,14 +121,7 @@ def get_snowflake_connection():
                 try:
                     modified_account = f"{account}.{region}"
                     st.info(f"Trying account: {modified_account}")
-                    conn = snowflake.connector.connect(
-                        user=SNOWFLAKE_CONFIG['user'],
-                        password=SNOWFLAKE_CONFIG['password'],
-                        account=modified_account,
-                        warehouse=SNOWFLAKE_CONFIG['warehouse'],
-                        database=SNOWFLAKE_CONFIG['database'],
-                        schema=SNOWFLAKE_CONFIG['schema']
-                    )
+                    conn = connect_pool(modified_account)
                     st.success(f"Successfully connected using region: {region}")
                     return conn
                 except Exception as e:
@@ -108,14 +132,7 @@ def get_snowflake_connection():
             return None
         
         # Try normal connection if account contains region
-        conn = snowflake.connector.connect(
-            user=SNOWFLAKE_CONFIG['user'],
-            password=SNOWFLAKE_CONFIG['password'],
-            account=SNOWFLAKE_CONFIG['account'],
-            warehouse=SNOWFLAKE_CONFIG['warehouse'],
-            database=SNOWFLAKE_CONFIG['database'],
-            schema=SNOWFLAKE_CONFIG['schema']
-        )
+        conn = connect_pool(SNOWFLAKE_CONFIG['account'])
         st.success("Successfully connected to Snowflake!")
         return conn
     except Exception as e:
@@ -123,274 +140,129 @@ def get_snowflake_connection():
         st.info("Falling back to local file storage.")
         return None
 
-def execute_query(query):
-    """Execute a query on Snowflake and return results as DataFrame"""
-    conn = get_snowflake_connection()
-    if conn:
-        try:
-            cur = conn.cursor()
-            cur.execute(query)
-            results = cur.fetchall()
-            columns = [desc[0] for desc in cur.description]
-            df = pd.DataFrame(results, columns=columns)
-            cur.close()
-            return df
-        except Exception as e:
-            st.error(f"Error executing query: {str(e)}")
-            return None
-    return None
+# Catalog datasets shown on each page, by section
+DATASET_GROUPS = {
+    'art_and_culture': ['art_forms', 'festivals'],
+    'tourism_statistics': [
+        'tourism_statistics_2019_2_1_1',
+        'tourism_statistics_2019_2_6_1',
+        'tourism_statistics_2021_2_3_3',
+        'tourism_statistics_2021_2_3_3_1',
+        'tourism_data',
+        'tourism_statistics_2018_2_1_1'
+    ],
+    'heritage': ['cultural_sites', 'heritage_cities'],
+    'parliament_data': [
+        'rs_session_246_au_2259',
+        'rs_session_248_au_1232',
+        'rs_session_255_au_1292',
+        'rs_session_259_au_1898',
+        'rs_session_262_au_497',
+        'rs_session_238_au1380',
+        'rs_session_251_au308',
+        'rs_session_251_au1434',
+        'session_244_au1787'
+    ]
+}
+
+# Pages that load their datasets with catalog.load_progressively
+PROGRESSIVE_PAGES = {"Tourism Statistics", "Heritage Sites"}
 
-@st.cache_data
+@instrumented('dataset')
 def load_all_data():
-    """Load all data from Snowflake or local files as fallback"""
-    datasets = {
-        'art_and_culture': {},
-        'tourism_statistics': {},
-        'heritage': {},
-        'parliament_data': {}
-    }
-    
-    # Try Snowflake first
+    """
+    Load all data from Snowflake or local files as fallback.
+    Datasets come from the shared catalog, which caches each table per
+    version for every session and for app.py.
+    """
+    # Try Snowflake first; the catalog falls back to local files per dataset
     conn = get_snowflake_connection()
-    
-    if conn:
-        try:
-            # Art and Culture Data
-            art_forms_query = "SELECT * FROM ART_FORMS"
-            df = execute_query(art_forms_query)
-            if df is not None and not df.empty:
-                datasets['art_and_culture']['art_forms'] = df
-            
-            # Festivals Data
-            festivals_query = "SELECT * FROM FESTIVALS"
-            df = execute_query(festivals_query)
+    names = [name for group in DATASET_GROUPS.values() for name in group]
+    datasets = assemble_datasets(catalog.snapshot(names, conn), conn)
+    # Cross-dataset questions are asked of the star schema directly
+    return {**datasets, 'connection': conn}
+
+@st.cache_resource(show_spinner=False)
+def assemble_datasets(snapshot, _conn):
+    """
+    Group the catalog datasets by page and apply the parliament table
+    schemas. Cached per snapshot, so schemas are applied once per data
+    version rather than on every rerun. The result is shared by every
+    session as-is: pages read it and never write into it.
+    """
+    datasets = {group: {} for group in DATASET_GROUPS}
+    
+    for group, names in DATASET_GROUPS.items():
+        for name in names:
+            try:
+                df = catalog.load(name, _conn)
+            except Exception as e:
+                # Neither the table nor a local file is available
+                continue
             if df is not None and not df.empty:
-                datasets['art_and_culture']['festivals'] = df.to_dict('records')
-            
-            # Tourism Statistics
-            tourism_tables = [
-                'TOURISM_STATISTICS_2019_2_1_1',
-                'TOURISM_STATISTICS_2019_2_6_1',
-                'TOURISM_STATISTICS_2021_2_3_3',
-                'TOURISM_DATA',
-                'TOURISM_STATISTICS_2018_2_1_1'
-            ]
-            
-            for table in tourism_tables:
-                query = f"SELECT * FROM {table}"
-                df = execute_query(query)
-                if df is not None and not df.empty:
-                    key = table.lower()
-                    datasets['tourism_statistics'][key] = df
-            
-            # Heritage Data
-            heritage_tables = {
-                'cultural_sites': 'CULTURAL_SITES',
-                'heritage_cities': 'HERITAGE_CITIES'
-            }
-            
-            for key, table in heritage_tables.items():
-                query = f"SELECT * FROM {table}"
-                df = execute_query(query)
-                if df is not None and not df.empty:
-                    datasets['heritage'][key] = df
-            
-            # Parliament Data
-            parliament_tables = [
-                'RS_SESSION_246_AU_2259',
-                'RS_SESSION_248_AU_1232',
-                'RS_SESSION_255_AU_1292',
-                'RS_SESSION_259_AU_1898',
-                'RS_SESSION_262_AU_497',
-                'RS_SESSION_238_AU1380',
-                'RS_SESSION_251_AU308',
-                'RS_SESSION_251_AU1434',
-                'SESSION_244_AU1787'
-            ]
-            
-            for table in parliament_tables:
-                query = f"SELECT * FROM {table}"
-                df = execute_query(query)
-                if df is not None and not df.empty:
-                    key = table.lower()
-                    datasets['parliament_data'][key] = df
-            
-            return datasets
-            
-        except Exception as e:
-            st.error(f"Error loading data from Snowflake: {str(e)}")
-            st.info("Falling back to local file storage.")
+                datasets[group][name] = df
     
-    # Fallback to local files if Snowflake fails
-    data_dir = "/Users/rdhardubey/india_art_culture/data/raw"
+    if 'festivals' in datasets['art_and_culture']:
+        # Tables uploaded before the typed loader still carry the raw export's columns
+        datasets['art_and_culture']['festivals'] = normalize_festivals(datasets['art_and_culture']['festivals'])
+        # Map cells for every zoom level, built once per festival data version
+        datasets['festival_tiles'] = build_festival_tiles(datasets['art_and_culture']['festivals'])
+    
+    if 'heritage_cities' in datasets['heritage']:
+        # Placed with the offline gazetteer once per data version
+        datasets['heritage']['heritage_cities'] = locate_heritage_cities(
+            snapshot['heritage_cities'], datasets['heritage']['heritage_cities']
+        )
     
-    def try_read_csv(file_path):
-        """Try different encodings to read CSV file"""
-        encodings = ['utf-8', 'latin1', 'iso-8859-1', 'cp1252']
-        for encoding in encodings:
-            try:
-                return pd.read_csv(file_path, encoding=encoding)
-            except UnicodeDecodeError:
-                continue
-            except Exception as e:
-                st.warning(f"Error reading {os.path.basename(file_path)}: {str(e)}")
-                return None
-        st.warning(f"Could not read {os.path.basename(file_path)} with any supported encoding")
-        return None
+    # Parliament tables by semantic role, typed once here instead of on every render
+    datasets['parliament_roles'], schema_errors = index_by_role(datasets['parliament_data'])
+    for name, error in schema_errors.items():
+        st.warning(f"⚠️ Skipping {name}: {error}")
     
-    try:
-        # Art and Culture Data
-        art_forms_path = os.path.join(data_dir, 'art_forms.csv')
-        if os.path.exists(art_forms_path):
-            df = try_read_csv(art_forms_path)
-            if df is not None and not df.empty:
-                datasets['art_and_culture']['art_forms'] = df
-        
-        # Festivals
-        festival_path = os.path.join(data_dir, 'Festival_of_India.json')
-        if os.path.exists(festival_path):
-            with open(festival_path, 'r') as f:
-                festivals = json.load(f)
-                df = pd.DataFrame(festivals)
-                datasets['art_and_culture']['festivals'] = df.to_dict('records')
-        
-        # Tourism Statistics
-        tourism_files = [
-            'India-Tourism-Statistics-2019-Table-2.1.1.csv',
-            'India-Tourism-Statistics-2019-Table-2.6.1.csv',
-            'India-Tourism-Statistics-2021-Table-2.3.3.csv',
-            'India-Tourism-Statistics-2021-Table-2.3.3(1).csv',
-            'tourism_data.csv',
-            'Tourism_In_India_Statistics_2018-Table_2.1.1_1.csv'
-        ]
-        
-        for file in tourism_files:
-            file_path = os.path.join(data_dir, file)
-            if os.path.exists(file_path):
-                df = try_read_csv(file_path)
-                if df is not None and not df.empty:
-                    key = file.replace('.csv', '').replace('-', '_').lower()
-                    datasets['tourism_statistics'][key] = df
-        
-        # Heritage Data
-        heritage_files = {
-            'cultural_sites': 'cultural_sites.csv',
-            'heritage_cities': 'List_of_Heritage_Cities.csv'
-        }
-        
-        for key, file in heritage_files.items():
-            file_path = os.path.join(data_dir, file)
-            if os.path.exists(file_path):
-                df = try_read_csv(file_path)
-                if df is not None and not df.empty:
-                    datasets['heritage'][key] = df
-        
-        # Parliament Data
-        parliament_files = [
-            'RS_Session_246_AU_2259_1.1.csv',
-            'RS_Session_248_AU_1232.csv',
-            'RS_Session_255_AU_1292.A_and_B.csv',
-            'RS_Session_259_AU_1898_B_and_C.csv',
-            'RS_Session_262_AU_497_B.csv',
-            'rs_session-238_AU1380_1.1.csv',
-            'RS-Session-251-AU308-Annexure-I.csv',
-            'RS-Session-251-AU1434-Table1.csv',
-            'session_244_AU1787_1.1.csv'
-        ]
-        
-        for file in parliament_files:
-            file_path = os.path.join(data_dir, file)
-            if os.path.exists(file_path):
-                df = try_read_csv(file_path)
-                if df is not None and not df.empty:
-                    key = file.replace('.csv', '').replace('-', '_').lower()
-                    datasets['parliament_data'][key] = df
-        
-        return datasets
-        
-    except Exception as e:
-        st.error(f"Error loading data: {str(e)}")
-        return None
+    return datasets
 
 def upload_to_snowflake():
-    """Upload local data to Snowflake tables"""
-    data_dir = "/Users/rdhardubey/india_art_culture/data/raw"
-    conn = get_snowflake_connection()
+    """Upload changed local data files to Snowflake tables"""
+    shared = get_snowflake_connection()
     
-    if not conn:
+    if not shared:
         return
     
-    try:
-        # Create tables and upload data
-        cur = conn.cursor()
-        
-        # Art Forms
-        art_forms_path = os.path.join(data_dir, 'art_forms.csv')
-        if os.path.exists(art_forms_path):
-            df = pd.read_csv(art_forms_path)
-            write_pandas(conn, df, 'ART_FORMS')
-        
-        # Festivals
-        festival_path = os.path.join(data_dir, 'Festival_of_India.json')
-        if os.path.exists(festival_path):
-            with open(festival_path, 'r') as f:
-                festivals = json.load(f)
-                df = pd.DataFrame(festivals)
-                write_pandas(conn, df, 'FESTIVALS')
-        
-        # Tourism Statistics
-        tourism_files = [
-            ('India-Tourism-Statistics-2019-Table-2.1.1.csv', 'TOURISM_STATISTICS_2019_2_1_1'),
-            ('India-Tourism-Statistics-2019-Table-2.6.1.csv', 'TOURISM_STATISTICS_2019_2_6_1'),
-            ('India-Tourism-Statistics-2021-Table-2.3.3.csv', 'TOURISM_STATISTICS_2021_2_3_3'),
-            ('tourism_data.csv', 'TOURISM_DATA'),
-            ('Tourism_In_India_Statistics_2018-Table_2.1.1_1.csv', 'TOURISM_STATISTICS_2018_2_1_1')
-        ]
-        
-        for file, table in tourism_files:
-            file_path = os.path.join(data_dir, file)
-            if os.path.exists(file_path):
-                df = pd.read_csv(file_path)
-                write_pandas(conn, df, table)
-        
-        # Heritage Data
-        heritage_files = [
-            ('cultural_sites.csv', 'CULTURAL_SITES'),
-            ('List_of_Heritage_Cities.csv', 'HERITAGE_CITIES')
-        ]
-        
-        for file, table in heritage_files:
-            file_path = os.path.join(data_dir, file)
-            if os.path.exists(file_path):
-                df = pd.read_csv(file_path)
-                write_pandas(conn, df, table)
-        
-        # Parliament Data
-        parliament_files = [
-            ('RS_Session_246_AU_2259_1.1.csv', 'RS_SESSION_246_AU_2259'),
-            ('RS_Session_248_AU_1232.csv', 'RS_SESSION_248_AU_1232'),
-            ('RS_Session_255_AU_1292.A_and_B.csv', 'RS_SESSION_255_AU_1292'),
-            ('RS_Session_259_AU_1898_B_and_C.csv', 'RS_SESSION_259_AU_1898'),
-            ('RS_Session_262_AU_497_B.csv', 'RS_SESSION_262_AU_497'),
-            ('rs_session-238_AU1380_1.1.csv', 'RS_SESSION_238_AU1380'),
-            ('RS-Session-251-AU308-Annexure-I.csv', 'RS_SESSION_251_AU308'),
-            ('RS-Session-251-AU1434-Table1.csv', 'RS_SESSION_251_AU1434'),
-            ('session_244_AU1787_1.1.csv', 'SESSION_244_AU1787')
-        ]
-        
-        for file, table in parliament_files:
-            file_path = os.path.join(data_dir, file)
-            if os.path.exists(file_path):
-                df = pd.read_csv(file_path)
-                write_pandas(conn, df, table)
-        
-        st.success("Data successfully uploaded to Snowflake!")
+    # Every catalog dataset published as-is from a file in data/raw
+    upload_datasets = [dataset for dataset in catalog.DATASETS if dataset.file and dataset.table]
+    
+    # Written through a connection of its own; the shared one stays open for the dashboards
+    with dedicated(shared) as conn:
+        try:
+            # Skip files whose content already matches the last upload
+            manifest = UploadManifest()
+            manifest.pull(conn)
+        
+            uploaded, skipped = 0, 0
+            for dataset in upload_datasets:
+                if dataset.path.exists():
+                    with track('upload', dataset.table) as span:
+                        mode, nrows = sync_file(conn, manifest, dataset.path, dataset.table, dataset.read)
+                        span.annotate(rows=nrows, cache='hit' if mode == 'skipped' else 'miss')
+                    if mode == 'skipped':
+                        skipped += 1
+                    else:
+                        uploaded += 1
+        
+            if uploaded:
+                # Dimensions and facts are rebuilt from the session answers as a whole
+                publish_star_schema(conn, {name: catalog.get_dataset(name).read() for name in STAR_SOURCES})
+                # Replaced tables are recreated without their clustering keys
+                apply_physical_design(conn)
+                refresh_aggregates(conn)
+        
+            st.success(f"Data successfully uploaded to Snowflake! ({uploaded} tables updated, {skipped} unchanged)")
+        
+            # Pick up the new table versions without waiting for the snapshot to expire
+            catalog.refresh()
         
-    except Exception as e:
-        st.error(f"Error uploading data to Snowflake: {str(e)}")
-    finally:
-        if conn:
-            conn.close()
+        except Exception as e:
+            st.error(f"Error uploading data to Snowflake: {str(e)}")
 
 def show_art_and_culture(datasets):
     st.header("Art and Culture")
@@ -428,7 +300,7 @@ def show_art_and_culture(datasets):
         if 'category' in df.columns:
             # Category distribution
             fig = px.pie(df, names='category', title="Distribution of Art Forms by Category")
-            st.plotly_chart(fig)
+            plotly_chart(fig)
         
         if 'state' in df.columns:
             # State-wise distribution
@@ -438,7 +310,7 @@ def show_art_and_culture(datasets):
                         title="Art Forms by State",
                         labels={'count': 'Number of Art Forms', 'state': 'State'})
             fig.update_layout(xaxis_tickangle=-45)
-            st.plotly_chart(fig)
+            plotly_chart(fig)
         
         if 'practitioners' in df.columns and 'state' in df.columns:
             # Practitioners by state
@@ -447,39 +319,63 @@ def show_art_and_culture(datasets):
                         title="Practitioners by State",
                         labels={'practitioners': 'Number of Practitioners', 'state': 'State'})
             fig.update_layout(xaxis_tickangle=-45)
-            st.plotly_chart(fig)
+            plotly_chart(fig)
     
     # Show festivals data
     if 'festivals' in datasets['art_and_culture']:
         st.subheader("Festivals of India")
         festivals = datasets['art_and_culture']['festivals']
         
-        # Display festivals data in a structured way
-        if isinstance(festivals, list):
-            for festival in festivals:
-                with st.expander(festival.get('name', 'Unknown Festival')):
-                    st.write(f"**Region:** {festival.get('region', 'Not specified')}")
-                    st.write(f"**State:** {festival.get('state', 'Not specified')}")
-                    st.write(f"**Description:** {festival.get('description', 'No description available')}")
-        elif isinstance(festivals, dict):
-            for name, details in festivals.items():
-                with st.expander(name):
-                    for key, value in details.items():
-                        st.write(f"**{key.title()}:** {value}")
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("Festival Events", f"{len(festivals):,}")
+        with col2:
+            st.metric("Total Amount Released", f"₹{festivals['AMOUNT_RELEASED'].sum() / 1e7:,.2f} Cr")
+        with col3:
+            st.metric("Years Covered", f"{festivals['YEAR'].min()}-{festivals['YEAR'].max()}")
+
+        by_year = festivals.groupby(['YEAR', 'PERIOD'], as_index=False)['AMOUNT_RELEASED'].sum()
+        fig = px.bar(by_year, x='YEAR', y='AMOUNT_RELEASED', color='PERIOD',
+                    title="Amount Released for Festivals of India by Year",
+                    labels={'AMOUNT_RELEASED': 'Amount Released (₹)', 'YEAR': 'Year', 'PERIOD': 'Period'})
+        plotly_chart(fig)
+
+        zoom = st.select_slider(
+            "Map detail",
+            options=list(ZOOM_CELL_DEGREES),
+            format_func=lambda level: f"{ZOOM_CELL_DEGREES[level]:g}° cells"
+        )
+        plotly_chart(create_festival_funding_map(datasets['festival_tiles'], zoom))
+
+        st.dataframe(festivals, hide_index=True)
+
+def show_tourism_section(name, df, tab):
+    """One tourism dataset: its table and a by-state chart of a chosen metric"""
+    st.write(f"### {name}")
+    show_preview(df)
+    
+    # Create visualizations based on the data structure
+    if 'state' in df.columns:
+        numeric_cols = df.select_dtypes(include='number').columns
+        if len(numeric_cols) > 0:
+            selected_metric = st.selectbox(f"Select metric for {name}", numeric_cols, key=f"{tab}_{name}_metric")
+            fig = px.bar(df, x='state', y=selected_metric,
+                       title=f"{selected_metric} by State",
+                       labels={'state': 'State'})
+            fig.update_layout(xaxis_tickangle=-45)
+            plotly_chart(fig)
 
 def show_tourism_statistics(datasets):
     st.header("Tourism Statistics")
     
-    tourism_data = datasets['tourism_statistics']
-    
-    if not tourism_data:
-        st.warning("No tourism data available")
-        return
+    names = DATASET_GROUPS['tourism_statistics']
     
     # Create tabs for different years
     years = ["2021", "2019", "2018", "All Years"]
     tabs = st.tabs(years)
     
+    # A placeholder per dataset section, filled as soon as its data arrives
+    sections = {name: [] for name in names}
     for year, tab in zip(years, tabs):
         with tab:
             if year == "All Years":
@@ -487,104 +383,198 @@ def show_tourism_statistics(datasets):
                 # Allow selection of datasets to compare
                 selected_datasets = st.multiselect(
                     "Select datasets to compare",
-                    list(tourism_data.keys())
+                    names
                 )
-                for dataset in selected_datasets:
-                    st.write(f"### {dataset}")
-                    df = tourism_data[dataset]
-                    st.dataframe(df)
-                    
-                    # Create visualizations based on the data structure
-                    if 'state' in df.columns:
-                        numeric_cols = df.select_dtypes(include=['int64', 'float64']).columns
-                        if len(numeric_cols) > 0:
-                            selected_metric = st.selectbox(f"Select metric for {dataset}", numeric_cols)
-                            fig = px.bar(df, x='state', y=selected_metric,
-                                       title=f"{selected_metric} by State",
-                                       labels={'state': 'State'})
-                            fig.update_layout(xaxis_tickangle=-45)
-                            st.plotly_chart(fig)
+                for name in selected_datasets:
+                    sections[name].append((st.empty(), year))
             else:
                 st.subheader(f"{year} Tourism Data")
-                year_data = {k: v for k, v in tourism_data.items() if year in k}
-                if year_data:
-                    for key, df in year_data.items():
-                        st.write(f"### {key}")
-                        st.dataframe(df)
-                        
-                        # Create visualizations based on the data structure
-                        if 'state' in df.columns:
-                            numeric_cols = df.select_dtypes(include=['int64', 'float64']).columns
-                            if len(numeric_cols) > 0:
-                                selected_metric = st.selectbox(f"Select metric for {key}", numeric_cols)
-                                fig = px.bar(df, x='state', y=selected_metric,
-                                           title=f"{selected_metric} by State",
-                                           labels={'state': 'State'})
-                                fig.update_layout(xaxis_tickangle=-45)
-                                st.plotly_chart(fig)
-                else:
+                year_names = [name for name in names if year in name]
+                if not year_names:
                     st.info(f"No tourism data available for {year}")
+                for name in year_names:
+                    sections[name].append((st.empty(), year))
+    
+    for placeholders in sections.values():
+        for placeholder, _ in placeholders:
+            placeholder.caption("Loading...")
+    
+    available = 0
+    for name, df in catalog.load_progressively(names, datasets['connection']):
+        available += df is not None and not df.empty
+        for placeholder, year in sections[name]:
+            with placeholder.container():
+                if df is None or df.empty:
+                    st.info(f"{name} is not available")
+                else:
+                    show_tourism_section(name, df, year)
+    
+    if not available:
+        st.warning("No tourism data available")
+
+@st.cache_resource(show_spinner=False)
+def locate_heritage_cities(version, _cities):
+    """Heritage cities placed with the offline gazetteer, once per dataset version"""
+    return geocode(_cities, 'Heritage Cities')
+
+def show_cultural_sites(df):
+    st.subheader("Cultural Sites")
+    
+    # Display summary metrics
+    st.metric("Total Cultural Sites", len(df))
+    
+    # Display the data
+    show_preview(df)
+    
+    # Add visualizations if we have relevant columns
+    if 'state' in df.columns:
+        sites_by_state = df['state'].value_counts().reset_index()
+        sites_by_state.columns = ['state', 'count']
+        fig = px.bar(sites_by_state, x='state', y='count',
+                    title="Cultural Sites by State",
+                    labels={'count': 'Number of Sites', 'state': 'State'})
+        fig.update_layout(xaxis_tickangle=-45)
+        plotly_chart(fig)
+
+def show_heritage_cities(df):
+    st.subheader("Heritage Cities")
+    
+    # Display summary metrics
+    st.metric("Total Heritage Cities", len(df))
+    
+    # Display the data
+    show_preview(df)
+    
+    located = df.dropna(subset=['LATITUDE', 'LONGITUDE'])
+    if not located.empty:
+        fig = px.scatter_geo(located, lat='LATITUDE', lon='LONGITUDE', hover_name='Heritage Cities',
+                            hover_data={'GEOCODED_AS': True, 'LATITUDE': False, 'LONGITUDE': False},
+                            labels={'GEOCODED_AS': 'Located at'},
+                            title=f"Heritage Cities ({len(located)} of {len(df)} located)")
+        fig.update_geos(scope='asia', fitbounds='locations', showcountries=True)
+        plotly_chart(fig)
+    
+    # Add visualizations if we have relevant columns
+    if 'state' in df.columns:
+        cities_by_state = df['state'].value_counts().reset_index()
+        cities_by_state.columns = ['state', 'count']
+        fig = px.bar(cities_by_state, x='state', y='count',
+                    title="Heritage Cities by State",
+                    labels={'count': 'Number of Cities', 'state': 'State'})
+        fig.update_layout(xaxis_tickangle=-45)
+        plotly_chart(fig)
+
+def show_nearest_heritage_cities(cities, sites):
+    """Nearest heritage city to every cultural site"""
+    located = cities.dropna(subset=['LATITUDE', 'LONGITUDE'])
+    # Uploaded tables have upper-case columns, the local file lower-case ones
+    site_cols = {col.lower(): col for col in sites.columns}
+    if located.empty or not {'site_name', 'state', 'latitude', 'longitude'} <= set(site_cols):
+        return
+    st.subheader("Nearest Heritage City to Each Cultural Site")
+    city_index = SpatialIndex(located, 'LATITUDE', 'LONGITUDE')
+    joined = city_index.join_nearest(sites, site_cols['latitude'], site_cols['longitude'])
+    st.dataframe(
+        joined[[site_cols['site_name'], site_cols['state'], 'Heritage Cities_NEAREST', 'DISTANCE_KM']]
+        .rename(columns={'Heritage Cities_NEAREST': 'Nearest Heritage City'})
+        .round({'DISTANCE_KM': 1}),
+        hide_index=True
+    )
 
 def show_heritage_sites(datasets):
     st.header("Heritage Sites and Cities")
     
-    heritage_data = datasets['heritage']
-    
-    if not heritage_data:
-        st.warning("No heritage data available")
-        return
+    conn = datasets['connection']
     
     # Create tabs for different types of heritage sites
     tabs = st.tabs(["Cultural Sites", "Heritage Cities"])
     
+    # Each tab renders as soon as its own dataset arrives
     with tabs[0]:
-        if 'cultural_sites' in heritage_data:
-            st.subheader("Cultural Sites")
-            df = heritage_data['cultural_sites']
-            
-            # Display summary metrics
-            st.metric("Total Cultural Sites", len(df))
-            
-            # Display the data
-            st.dataframe(df)
-            
-            # Add visualizations if we have relevant columns
-            if 'state' in df.columns:
-                sites_by_state = df['state'].value_counts().reset_index()
-                sites_by_state.columns = ['state', 'count']
-                fig = px.bar(sites_by_state, x='state', y='count',
-                            title="Cultural Sites by State",
-                            labels={'count': 'Number of Sites', 'state': 'State'})
-                fig.update_layout(xaxis_tickangle=-45)
-                st.plotly_chart(fig)
-            
+        sites_section = st.empty()
+        sites_section.caption("Loading...")
     with tabs[1]:
-        if 'heritage_cities' in heritage_data:
-            st.subheader("Heritage Cities")
-            df = heritage_data['heritage_cities']
-            
-            # Display summary metrics
-            st.metric("Total Heritage Cities", len(df))
-            
-            # Display the data
-            st.dataframe(df)
-            
-            # Add visualizations if we have relevant columns
-            if 'state' in df.columns:
-                cities_by_state = df['state'].value_counts().reset_index()
-                cities_by_state.columns = ['state', 'count']
-                fig = px.bar(cities_by_state, x='state', y='count',
-                            title="Heritage Cities by State",
-                            labels={'count': 'Number of Cities', 'state': 'State'})
-                fig.update_layout(xaxis_tickangle=-45)
-                st.plotly_chart(fig)
+        cities_section = st.empty()
+        cities_section.caption("Loading...")
+        nearest_section = st.empty()
+    
+    heritage_data = {}
+    for name, df in catalog.load_progressively(DATASET_GROUPS['heritage'], conn):
+        section = sites_section if name == 'cultural_sites' else cities_section
+        if df is None or df.empty:
+            section.empty()
+            continue
+        if name == 'heritage_cities':
+            version = catalog.snapshot([name], conn)[name]
+            df = catalog.view(locate_heritage_cities(version, df))
+        heritage_data[name] = df
+        with section.container():
+            if name == 'cultural_sites':
+                show_cultural_sites(df)
+            else:
+                show_heritage_cities(df)
+    
+    if not heritage_data:
+        st.warning("No heritage data available")
+    elif {'cultural_sites', 'heritage_cities'} <= set(heritage_data):
+        with nearest_section.container():
+            show_nearest_heritage_cities(heritage_data['heritage_cities'], heritage_data['cultural_sites'])
+
+def load_state_profile(snapshot, year, conn):
+    """
+    Visits, artisans and monuments of every state for one year: a single
+    join on the star schema's STATE_ID when every star table is published,
+    cached per star schema version either way
+    """
+    if conn is not None and all(source == 'table' for source, _ in snapshot.values()):
+        try:
+            return query_state_profile(conn, year, version=snapshot)
+        except Exception as e:
+            st.warning(f"⚠️ Building the state profile from local files ({type(e).__name__})")
+    return local_state_profile(snapshot, year, conn)
+
+@st.cache_data(show_spinner=False)
+def local_state_profile(snapshot, year, _conn):
+    """The state profile joined in pandas, from the star tables as the catalog serves them"""
+    star = {table: catalog.load(table.lower(), _conn) for table in STAR_TABLES}
+    return state_profile(star, year)
+
+def show_state_profile(conn):
+    """Every parliament answer about a state, side by side"""
+    st.subheader("State Profile")
+    try:
+        years = catalog.load('dim_year', conn)['YEAR'].astype(int).tolist()
+    except Exception:
+        st.info("State profile not available: the star schema has not been built")
+        return
+    if not years:
+        return
+    
+    year = st.selectbox("Select year", years, index=len(years) - 1, key="state_profile_year")
+    snapshot = catalog.snapshot([table.lower() for table in STAR_TABLES], conn)
+    profile = load_state_profile(snapshot, year, conn)
+    
+    plotted = profile.dropna(subset=['DOMESTIC_VISITS', 'ARTISANS'])
+    if not plotted.empty:
+        fig = px.scatter(
+            plotted,
+            x='ARTISANS',
+            y='DOMESTIC_VISITS',
+            size=plotted['MONUMENTS'].fillna(0) + 1,
+            hover_name='STATE',
+            log_y=True,
+            title=f"Artisans vs Domestic Visits by State ({year}), sized by protected monuments",
+            labels={'ARTISANS': 'Artisans Identified', 'DOMESTIC_VISITS': 'Domestic Visits'}
+        )
+        plotly_chart(fig, use_container_width=True)
+    st.dataframe(profile, hide_index=True)
 
 def show_parliament_insights(datasets):
     st.header("Parliamentary Data Analysis")
     
-    parliament_data = datasets['parliament_data']
+    roles = datasets['parliament_roles']
     
-    if not parliament_data:
+    if not roles:
         st.warning("No parliamentary data available")
         return
     
@@ -593,20 +583,15 @@ def show_parliament_insights(datasets):
     
     with tabs[0]:
         st.subheader("Artisan Statistics by State/UT")
-        artisan_data = None
         
-        # Find the artisan statistics file
-        for key, df in parliament_data.items():
-            if 'artisans' in df.columns.str.lower().tolist():
-                artisan_data = df
-                break
-        
-        if artisan_data is not None:
+        if 'artisans' in roles:
+            artisan_data = roles['artisans'][0].frame
+            
             # Summary metrics in a nice layout
             col1, col2, col3 = st.columns(3)
-            total_artisans = artisan_data.iloc[:, 1].sum()
-            avg_artisans = artisan_data.iloc[:, 1].mean()
-            max_state = artisan_data.iloc[artisan_data.iloc[:, 1].idxmax(), 0]
+            total_artisans = artisan_data['Artisans'].sum()
+            avg_artisans = artisan_data['Artisans'].mean()
+            max_state = artisan_data.loc[artisan_data['Artisans'].idxmax(), 'State']
             
             with col1:
                 st.metric("Total Artisans", f"{total_artisans:,}")
@@ -621,16 +606,16 @@ def show_parliament_insights(datasets):
                 artisan_data,
                 geojson="https://gist.githubusercontent.com/jbrobst/56c13bbbf9d97d187fea01ca62ea5112/raw/e388c4cae20aa53cb5090210a42ebb9b765c0a36/india_states.geojson",
                 featureidkey='properties.ST_NM',
-                locations=artisan_data.iloc[:, 0],
-                color=artisan_data.iloc[:, 1],
+                locations='State',
+                color='Artisans',
                 color_continuous_scale="Viridis",
-                hover_data={artisan_data.columns[0]: True, artisan_data.columns[1]: True},
-                labels={artisan_data.columns[1]: "Number of Artisans"},
+                hover_data={'State': True, 'Artisans': True},
+                labels={'Artisans': "Number of Artisans"},
                 title="Interactive Map of Artisan Distribution"
             )
             fig.update_geos(fitbounds="locations", visible=False)
             fig.update_layout(height=600)
-            st.plotly_chart(fig, use_container_width=True)
+            plotly_chart(fig, use_container_width=True)
             
             # Regional Analysis
             st.subheader("Regional Distribution Analysis")
@@ -638,39 +623,39 @@ def show_parliament_insights(datasets):
             
             with col1:
                 # Top 5 states
-                top_5 = artisan_data.nlargest(5, artisan_data.columns[1])
+                top_5 = artisan_data.nlargest(5, 'Artisans')
                 fig = px.bar(
                     top_5,
-                    x=top_5.iloc[:, 0],
-                    y=top_5.iloc[:, 1],
+                    x='State',
+                    y='Artisans',
                     title="Top 5 States by Artisan Population",
-                    labels={'x': 'State/UT', 'y': 'Number of Artisans'},
-                    color=top_5.iloc[:, 1],
+                    labels={'State': 'State/UT', 'Artisans': 'Number of Artisans'},
+                    color='Artisans',
                     color_continuous_scale="Viridis"
                 )
                 fig.update_layout(showlegend=False)
-                st.plotly_chart(fig)
+                plotly_chart(fig)
             
             with col2:
                 # Bottom 5 states
-                bottom_5 = artisan_data.nsmallest(5, artisan_data.columns[1])
+                bottom_5 = artisan_data.nsmallest(5, 'Artisans')
                 fig = px.bar(
                     bottom_5,
-                    x=bottom_5.iloc[:, 0],
-                    y=bottom_5.iloc[:, 1],
+                    x='State',
+                    y='Artisans',
                     title="Bottom 5 States by Artisan Population",
-                    labels={'x': 'State/UT', 'y': 'Number of Artisans'},
-                    color=bottom_5.iloc[:, 1],
+                    labels={'State': 'State/UT', 'Artisans': 'Number of Artisans'},
+                    color='Artisans',
                     color_continuous_scale="Viridis"
                 )
                 fig.update_layout(showlegend=False)
-                st.plotly_chart(fig)
+                plotly_chart(fig)
             
             # Distribution Analysis
             st.subheader("Statistical Distribution")
             fig = go.Figure()
             fig.add_trace(go.Box(
-                y=artisan_data.iloc[:, 1],
+                y=artisan_data['Artisans'],
                 name="Distribution",
                 boxpoints="all",
                 jitter=0.3,
@@ -681,25 +666,21 @@ def show_parliament_insights(datasets):
                 yaxis_title="Number of Artisans",
                 showlegend=False
             )
-            st.plotly_chart(fig)
+            plotly_chart(fig)
     
     with tabs[1]:
         st.subheader("Cultural Funding Analysis")
-        funding_data = None
         
-        for key, df in parliament_data.items():
-            if 'funds' in df.columns.str.lower().tolist():
-                funding_data = df
-                break
-        
-        if funding_data is not None:
+        if 'funding' in roles:
+            funding_table = roles['funding'][0]
+            funding_data = funding_table.frame
+            
             # Summary metrics with year-over-year change
             total_allocated = funding_data['Funds Allocated'].sum()
             total_spent = funding_data['Funds Released/Spent'].sum()
             
-            # Calculate year-over-year changes
-            funding_data['YoY Change'] = funding_data['Funds Allocated'].pct_change() * 100
-            latest_yoy = funding_data['YoY Change'].iloc[-1]
+            # Year-over-year change, precomputed with the table
+            latest_yoy = funding_table.growth.latest_yoy('Funds Allocated')
             
             col1, col2, col3 = st.columns(3)
             with col1:
@@ -730,7 +711,10 @@ def show_parliament_insights(datasets):
                 default=['Funds Allocated', 'Funds Released/Spent']
             )
             
-            funding_data['Utilization %'] = (funding_data['Funds Released/Spent'] / funding_data['Funds Allocated']) * 100
+            funding_data = funding_table.derive(
+                'Utilization %',
+                lambda frame: frame['Funds Released/Spent'] / frame['Funds Allocated'] * 100
+            )
             
             fig = go.Figure()
             
@@ -764,7 +748,7 @@ def show_parliament_insights(datasets):
                 ),
                 hovermode="x unified"
             )
-            st.plotly_chart(fig, use_container_width=True)
+            plotly_chart(fig, use_container_width=True)
             
             # Waterfall chart for year-wise changes
             st.subheader("Year-wise Fund Allocation Changes")
@@ -783,23 +767,22 @@ def show_parliament_insights(datasets):
                 title="Fund Allocation Progress",
                 showlegend=False
             )
-            st.plotly_chart(fig, use_container_width=True)
+            plotly_chart(fig, use_container_width=True)
     
     with tabs[2]:
         st.subheader("Tourism Impact Analysis")
-        tourism_data = None
-        
-        # Find tourism-related data
-        for key, df in parliament_data.items():
-            if 'tourist' in key.lower() or 'tourism' in key.lower():
-                tourism_data = df
-                break
         
-        if tourism_data is not None:
+        if 'state_visitors' in roles:
+            # National totals per year, precomputed from the state-wise tables
+            visitor_tables = {table.title: table for table in roles['state_visitors']}
+            selected_table = st.selectbox("Select visitor statistics", list(visitor_tables.keys()))
+            visitor_table = visitor_tables[selected_table]
+            tourism_data = visitor_table.trend
+            
             # Display tourism trends
-            if 'year' in tourism_data.columns.str.lower():
-                year_col = tourism_data.columns[tourism_data.columns.str.lower() == 'year'][0]
-                numeric_cols = tourism_data.select_dtypes(include=['int64', 'float64']).columns
+            if tourism_data is not None:
+                year_col = 'Year'
+                numeric_cols = [col for col in tourism_data.columns if col != year_col]
                 
                 # Allow metric selection
                 selected_metric = st.selectbox(
@@ -816,22 +799,20 @@ def show_parliament_insights(datasets):
                     markers=True
                 )
                 fig.update_traces(line_width=3)
-                st.plotly_chart(fig, use_container_width=True)
+                plotly_chart(fig, use_container_width=True)
                 
-                # Year-over-year growth
-                tourism_data['YoY Growth'] = tourism_data[selected_metric].pct_change() * 100
+                # Year-over-year growth, precomputed with the table
+                growth = visitor_table.growth.by_metric[selected_metric]
                 
                 fig = px.bar(
-                    tourism_data,
-                    x=year_col,
-                    y='YoY Growth',
+                    growth,
+                    x='TIME',
+                    y='YOY_PCT',
                     title="Year-over-Year Growth Rate",
-                    labels={'YoY Growth': 'Growth Rate (%)'}
+                    labels={'TIME': 'Year', 'YOY_PCT': 'Growth Rate (%)'}
                 )
-                fig.update_traces(marker_color=tourism_data['YoY Growth'].apply(
-                    lambda x: 'red' if x < 0 else 'green'
-                ))
-                st.plotly_chart(fig, use_container_width=True)
+                fig.update_traces(marker_color=np.where(growth['YOY_PCT'] < 0, 'red', 'green'))
+                plotly_chart(fig, use_container_width=True)
     
     with tabs[3]:
         st.subheader("Regional Analysis Dashboard")
@@ -839,16 +820,13 @@ def show_parliament_insights(datasets):
         # Combine data from different sources for regional analysis
         regional_data = {}
         
-        for key, df in parliament_data.items():
-            if 'state' in df.columns.str.lower():
-                state_col = df.columns[df.columns.str.lower() == 'state'][0]
-                numeric_cols = df.select_dtypes(include=['int64', 'float64']).columns
-                
-                if not numeric_cols.empty:
-                    regional_data[key] = {
-                        'data': df,
-                        'state_col': state_col,
-                        'metrics': numeric_cols
+        for tables in roles.values():
+            for table in tables:
+                if table.state_column and table.measures:
+                    regional_data[table.title] = {
+                        'data': table.frame,
+                        'state_col': table.state_column,
+                        'metrics': table.measures
                     }
         
         if regional_data:
@@ -877,7 +855,7 @@ def show_parliament_insights(datasets):
                 title=f"Regional Distribution: {selected_metric}"
             )
             fig.update_geos(fitbounds="locations", visible=False)
-            st.plotly_chart(fig, use_container_width=True)
+            plotly_chart(fig, use_container_width=True)
             
             # Top 5 and Bottom 5 regions
             col1, col2 = st.columns(2)
@@ -893,7 +871,7 @@ def show_parliament_insights(datasets):
                     color_continuous_scale="Viridis"
                 )
                 fig.update_layout(showlegend=False)
-                st.plotly_chart(fig)
+                plotly_chart(fig)
             
             with col2:
                 bottom_5 = df.nsmallest(5, selected_metric)
@@ -906,7 +884,9 @@ def show_parliament_insights(datasets):
                     color_continuous_scale="Viridis"
                 )
                 fig.update_layout(showlegend=False)
-                st.plotly_chart(fig)
+                plotly_chart(fig)
+        
+        show_state_profile(datasets.get('connection'))
 
 def main():
     st.set_page_config(page_title="India's Cultural Heritage & Tourism", layout="wide")
@@ -934,19 +914,30 @@ def main():
         "Parliamentary Insights": show_parliament_insights
     }
     
+    # Hidden unless enabled with ?perf=1 or SHOW_PERFORMANCE_PAGE
+    if performance_page_enabled():
+        pages["Performance"] = show_performance_page
+    
     selection = st.sidebar.radio("Go to", list(pages.keys()))
     
     try:
-        # Load all datasets from Snowflake
-        datasets = load_all_data()
+        if selection in PROGRESSIVE_PAGES:
+            # These pages fetch their own datasets and render each section as it arrives
+            datasets = {'connection': get_snowflake_connection()}
+        else:
+            # Load all datasets from Snowflake
+            datasets = load_all_data()
         
         if datasets:
             # Show selected page
-            pages[selection](datasets)
+            with track('page', selection):
+                pages[selection](datasets)
             
     except Exception as e:
         st.error(f"An error occurred: {str(e)}")
         st.write("Please check your Snowflake connection and ensure all required tables exist.")
+    
+    show_session_usage()
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
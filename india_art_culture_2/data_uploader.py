@@ -1,14 +1,29 @@
+import argparse
 import os
 import pandas as pd
-from test_connection import get_connection
-import snowflake.connector
-from snowflake.connector.pandas_tools import write_pandas
+from utils.aggregates import refresh_aggregates
+from utils.backends import get_connection
+from utils.clustering import apply_physical_design
+from utils.upload_manifest import UploadManifest, sync_file
 
-def load_data_to_snowflake():
-    """Load all CSV files from data/raw into Snowflake tables"""
+def read_clean_csv(file_path):
+    """Read a CSV and normalise its column names for Snowflake"""
+    df = pd.read_csv(file_path)
+    
+    # Clean column names (remove spaces, special chars)
+    df.columns = [col.strip().upper().replace(' ', '_').replace('-', '_') 
+                for col in df.columns]
+    return df
+
+def load_data_to_snowflake(force=False):
+    """Load changed CSV files from data/raw into Snowflake tables; force reloads every one"""
     conn = get_connection()
     cursor = conn.cursor()
     
+    # Skip files whose content already matches the last upload
+    manifest = UploadManifest()
+    manifest.pull(conn)
+    
     # Map CSV files to table names
     file_table_map = {
         'art_forms.csv': 'ART_FORMS',
@@ -23,38 +38,43 @@ def load_data_to_snowflake():
         if os.path.exists(file_path):
             print(f"\nProcessing {filename}...")
             try:
-                # Read CSV file
-                df = pd.read_csv(file_path)
-                
-                # Clean column names (remove spaces, special chars)
-                df.columns = [col.strip().upper().replace(' ', '_').replace('-', '_') 
-                            for col in df.columns]
-                
-                # Write to Snowflake
-                success, nchunks, nrows, _ = write_pandas(
-                    conn=conn,
-                    df=df,
-                    table_name=table,
+                mode, nrows = sync_file(
+                    conn,
+                    manifest,
+                    file_path,
+                    table,
+                    read_clean_csv,
+                    force=force,
                     database='INDIA_CULTURAL_TOURISM',
                     schema='PUBLIC',
                     quote_identifiers=False,  # Don't quote identifiers to avoid case sensitivity issues
-                    auto_create_table=True,  # Automatically create table
-                    overwrite=True  # Replace existing data
+                    auto_create_table=True  # Automatically create table
                 )
                 
-                if success:
-                    print(f"✅ Successfully loaded {nrows} rows into {table}")
+                if mode == 'skipped':
+                    print(f"⏭️ {filename} unchanged since last upload, skipping {table}")
+                elif mode == 'append':
+                    print(f"✅ Appended {nrows} new rows to {table}")
                 else:
-                    print(f"❌ Failed to load {filename}")
+                    print(f"✅ Successfully loaded {nrows} rows into {table}")
                     
             except Exception as e:
                 print(f"❌ Error processing {filename}: {str(e)}")
         else:
             print(f"⚠️ File not found: {filename}")
     
+    # Replaced tables are recreated without their clustering keys
+    apply_physical_design(conn)
+    
+    # Bring the Overview aggregates up to date with the new rows
+    for table in refresh_aggregates(conn):
+        print(f"✅ Refreshed {table}")
+    
     cursor.close()
     conn.close()
     print("\n✅ Data loading process completed!")
 
 if __name__ == "__main__":
-    load_data_to_snowflake() 
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Load changed CSV files from data/raw into Snowflake tables")
+    parser.add_argument('--force', action='store_true', help="reload every table, even if the manifest says it is current")
+    load_data_to_snowflake(parser.parse_args().force) 
\ No newline at end of file
@@ -0,0 +1,43 @@
+"""
+Export the dashboards' derived tables as Parquet, Arrow IPC or CSV.
+
+    python export_data.py                                  # every table as Parquet into exports/
+    python export_data.py state_analysis --format csv
+    python export_data.py --format arrow --output-dir /tmp/out
+"""
+import argparse
+from pathlib import Path
+
+from utils import catalog
+from utils.backends import get_connection
+from utils.exports import EXPORTS, FORMATS, file_name, write_export
+
+def export_tables(names, fmt, output_dir):
+    """Stream each table in names to output_dir, from its table or the local files"""
+    output_dir.mkdir(parents=True, exist_ok=True)
+    try:
+        conn = get_connection()
+    except Exception as e:
+        print(f"⚠️ Exporting from local files, could not connect: {str(e)}")
+        conn = None
+    try:
+        for name in names:
+            df = catalog.load(name, conn)
+            path = output_dir / file_name(name, fmt)
+            nbytes = write_export(df, fmt, path)
+            print(f"✅ {name}: {len(df)} rows, {nbytes:,} bytes -> {path}")
+    finally:
+        if conn:
+            conn.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('tables', nargs='*', metavar='table',
+                        help=f"tables to export (default: all of {', '.join(EXPORTS)})")
+    parser.add_argument('--format', choices=list(FORMATS), default='parquet')
+    parser.add_argument('--output-dir', type=Path, default=Path('exports'))
+    args = parser.parse_args()
+    unknown = [name for name in args.tables if name not in EXPORTS]
+    if unknown:
+        parser.error(f"unknown table {', '.join(unknown)}, expected one of: {', '.join(EXPORTS)}")
+    export_tables(args.tables or list(EXPORTS), args.format, args.output_dir)
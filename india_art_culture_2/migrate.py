@@ -0,0 +1,38 @@
+import sys
+
+from utils.backends import get_connection
+from utils.migrations import MigrationError, discover, migrate, rollback
+
+def run_migrations():
+    """Apply pending schema migrations from migrations/"""
+    conn = get_connection()
+    try:
+        print(f"Found {len(discover())} migrations")
+        applied = migrate(conn)
+        if not applied:
+            print("✅ Schema is up to date")
+        for migration in applied:
+            print(f"✅ Applied {migration.path.name}")
+    except MigrationError as e:
+        print(f"❌ {str(e)}")
+        sys.exit(1)
+    finally:
+        conn.close()
+
+def rollback_migrations():
+    """Swap back the schema replaced by the last migration run"""
+    conn = get_connection()
+    try:
+        rollback(conn)
+        print("✅ Restored the schema from before the last migration")
+    except MigrationError as e:
+        print(f"❌ {str(e)}")
+        sys.exit(1)
+    finally:
+        conn.close()
+
+if __name__ == "__main__":
+    if '--rollback' in sys.argv[1:]:
+        rollback_migrations()
+    else:
+        run_migrations()
@@ -0,0 +1,42 @@
+-- Tables read by app.py and combined_analysis.py, in the layout the uploaders
+-- write. IF NOT EXISTS, so deployments that already hold data adopt this as
+-- their baseline unchanged.
+
+CREATE TABLE IF NOT EXISTS ART_FORMS (
+    ART_FORM VARCHAR(100),
+    STATE VARCHAR(100),
+    CATEGORY VARCHAR(50),
+    PRACTITIONERS NUMBER
+);
+
+CREATE TABLE IF NOT EXISTS CULTURAL_SITES (
+    SITE_NAME VARCHAR(200),
+    STATE VARCHAR(100),
+    TYPE VARCHAR(50),
+    LATITUDE FLOAT,
+    LONGITUDE FLOAT
+);
+
+CREATE TABLE IF NOT EXISTS MONUMENTS (
+    SL_NO INTEGER,
+    STATE VARCHAR(100),
+    MONUMENTS INTEGER
+);
+
+CREATE TABLE IF NOT EXISTS GENDER_TOURISM (
+    YEAR INTEGER,
+    TOTAL_ARRIVALS INTEGER,
+    MALE_PCT FLOAT,
+    FEMALE_PCT FLOAT,
+    NOT_REPORTED_PCT FLOAT,
+    MALE_COUNT INTEGER,
+    FEMALE_COUNT INTEGER,
+    NOT_REPORTED_COUNT INTEGER
+);
+
+CREATE TABLE IF NOT EXISTS GEOLOGICAL_SITES (
+    SL_NO INTEGER,
+    STATE VARCHAR(100),
+    SITE_NAME VARCHAR(500),
+    SITE_TYPE VARCHAR(100)
+);
@@ -0,0 +1,48 @@
+"""
+TOURISM_STATS as one long table with a row per state, year and month.
+
+snowflake_upload.sql used to load TOURISM_STATS_2016_2018 and
+TOURISM_STATS_2019_2021 and expose them through a TOURISM_STATS view.
+Their rows are folded into the table and the split tables are dropped.
+They are yearly totals, so like reshape_tourism_stats they get MONTH 1.
+"""
+
+SPLIT_TABLES = ['TOURISM_STATS_2016_2018', 'TOURISM_STATS_2019_2021']
+
+CREATE_TOURISM_STATS = """
+CREATE TABLE IF NOT EXISTS {table} (
+    STATE VARCHAR(100),
+    DOMESTIC_VISITORS NUMBER,
+    FOREIGN_VISITORS NUMBER,
+    MONTH INTEGER,
+    YEAR INTEGER
+)
+"""
+
+
+def object_types(cursor, names):
+    """{name: 'BASE TABLE' or 'VIEW'} for the names that exist in the current schema"""
+    placeholders = ', '.join(['%s'] * len(names))
+    cursor.execute(
+        "SELECT TABLE_NAME, TABLE_TYPE FROM INFORMATION_SCHEMA.TABLES "
+        f"WHERE TABLE_SCHEMA = CURRENT_SCHEMA() AND TABLE_NAME IN ({placeholders})",
+        names
+    )
+    return dict(cursor.fetchall())
+
+
+def migrate(cursor):
+    existing = object_types(cursor, ['TOURISM_STATS'] + SPLIT_TABLES)
+    if existing.get('TOURISM_STATS') == 'VIEW':
+        cursor.execute(CREATE_TOURISM_STATS.format(table='TOURISM_STATS_LONG'))
+        cursor.execute("""
+        INSERT INTO TOURISM_STATS_LONG (STATE, DOMESTIC_VISITORS, FOREIGN_VISITORS, MONTH, YEAR)
+        SELECT STATE, DOMESTIC_VISITORS, FOREIGN_VISITORS, 1, YEAR FROM TOURISM_STATS
+        """)
+        cursor.execute("DROP VIEW TOURISM_STATS")
+        cursor.execute("ALTER TABLE TOURISM_STATS_LONG RENAME TO TOURISM_STATS")
+    else:
+        cursor.execute(CREATE_TOURISM_STATS.format(table='TOURISM_STATS'))
+    for table in SPLIT_TABLES:
+        if table in existing:
+            cursor.execute(f"DROP TABLE {table}")
@@ -1,48 +1,8 @@
--- Create table for gender-wise tourism data
-CREATE TABLE IF NOT EXISTS GENDER_TOURISM (
-    YEAR INTEGER,
-    TOTAL_ARRIVALS INTEGER,
-    MALE_PCT FLOAT,
-    FEMALE_PCT FLOAT,
-    NOT_REPORTED_PCT FLOAT,
-    MALE_COUNT INTEGER,
-    FEMALE_COUNT INTEGER,
-    NOT_REPORTED_COUNT INTEGER
-);
-
--- Create table for geological heritage sites
-CREATE TABLE IF NOT EXISTS GEOLOGICAL_SITES (
-    SL_NO INTEGER,
-    STATE VARCHAR(100),
-    SITE_NAME VARCHAR(500),
-    SITE_TYPE VARCHAR(100)
-);
-
--- Create table for monuments data
-CREATE TABLE IF NOT EXISTS MONUMENTS (
-    SL_NO INTEGER,
-    STATE VARCHAR(100),
-    MONUMENTS INTEGER
-);
-
--- Create table for tourism statistics (2016-2018)
-CREATE TABLE IF NOT EXISTS TOURISM_STATS_2016_2018 (
-    STATE VARCHAR(100),
-    YEAR INTEGER,
-    DOMESTIC_VISITORS BIGINT,
-    FOREIGN_VISITORS INTEGER
-);
-
--- Create table for tourism statistics (2019-2021)
-CREATE TABLE IF NOT EXISTS TOURISM_STATS_2019_2021 (
-    SL_NO INTEGER,
-    STATE VARCHAR(100),
-    YEAR INTEGER,
-    DOMESTIC_VISITORS BIGINT,
-    FOREIGN_VISITORS INTEGER
-);
-
--- After creating tables, use the Snowflake web interface to:
+-- Tables are created by the versioned migrations in migrations/; run
+--     python migrate.py
+-- first. This script only stages and loads the raw files.
+
+-- After migrating, use the Snowflake web interface to:
 -- 1. Create a file format for CSV:
 CREATE OR REPLACE FILE FORMAT csv_format
     TYPE = 'CSV'
@@ -85,7 +45,7 @@ COPY INTO MONUMENTS (SL_NO, STATE, MONUMENTS)
 FROM @monuments_stage
 FILE_FORMAT = csv_format;
 
-COPY INTO TOURISM_STATS_2016_2018 (STATE, YEAR, DOMESTIC_VISITORS, FOREIGN_VISITORS)
+COPY INTO TOURISM_STATS (STATE, YEAR, DOMESTIC_VISITORS, FOREIGN_VISITORS)
 FROM (
     SELECT 
         $1,  -- State
@@ -96,7 +56,7 @@ FROM (
 )
 FILE_FORMAT = csv_format;
 
-COPY INTO TOURISM_STATS_2016_2018 (STATE, YEAR, DOMESTIC_VISITORS, FOREIGN_VISITORS)
+COPY INTO TOURISM_STATS (STATE, YEAR, DOMESTIC_VISITORS, FOREIGN_VISITORS)
 FROM (
     SELECT 
         $1,  -- State
@@ -107,7 +67,7 @@ FROM (
 )
 FILE_FORMAT = csv_format;
 
-COPY INTO TOURISM_STATS_2016_2018 (STATE, YEAR, DOMESTIC_VISITORS, FOREIGN_VISITORS)
+COPY INTO TOURISM_STATS (STATE, YEAR, DOMESTIC_VISITORS, FOREIGN_VISITORS)
 FROM (
     SELECT 
         $1,  -- State
@@ -118,10 +78,9 @@ FROM (
 )
 FILE_FORMAT = csv_format;
 
-COPY INTO TOURISM_STATS_2019_2021 (SL_NO, STATE, YEAR, DOMESTIC_VISITORS, FOREIGN_VISITORS)
+COPY INTO TOURISM_STATS (STATE, YEAR, DOMESTIC_VISITORS, FOREIGN_VISITORS)
 FROM (
     SELECT 
-        $1,  -- Sl. No.
         $2,  -- State
         2019,  -- Year
         $3,  -- Domestic visitors 2019
@@ -130,10 +89,9 @@ FROM (
 )
 FILE_FORMAT = csv_format;
 
-COPY INTO TOURISM_STATS_2019_2021 (SL_NO, STATE, YEAR, DOMESTIC_VISITORS, FOREIGN_VISITORS)
+COPY INTO TOURISM_STATS (STATE, YEAR, DOMESTIC_VISITORS, FOREIGN_VISITORS)
 FROM (
     SELECT 
-        $1,  -- Sl. No.
         $2,  -- State
         2020,  -- Year
         $5,  -- Domestic visitors 2020
@@ -142,10 +100,9 @@ FROM (
 )
 FILE_FORMAT = csv_format;
 
-COPY INTO TOURISM_STATS_2019_2021 (SL_NO, STATE, YEAR, DOMESTIC_VISITORS, FOREIGN_VISITORS)
+COPY INTO TOURISM_STATS (STATE, YEAR, DOMESTIC_VISITORS, FOREIGN_VISITORS)
 FROM (
     SELECT 
-        $1,  -- Sl. No.
         $2,  -- State
         2021,  -- Year
         $7,  -- Domestic visitors 2021
@@ -154,14 +111,8 @@ FROM (
 )
 FILE_FORMAT = csv_format;
 
--- 5. Create a view to combine all tourism statistics
-CREATE OR REPLACE VIEW TOURISM_STATS AS
-SELECT STATE, YEAR, DOMESTIC_VISITORS, FOREIGN_VISITORS
-FROM TOURISM_STATS_2016_2018
-UNION ALL
-SELECT STATE, YEAR, DOMESTIC_VISITORS, FOREIGN_VISITORS
-FROM TOURISM_STATS_2019_2021
-WHERE STATE != 'Total';  -- Exclude total row
+-- 5. The 2019-2021 file ends with a total row, which is not a state
+DELETE FROM TOURISM_STATS WHERE STATE = 'Total';
 
 -- 6. Update site types in geological sites
 UPDATE GEOLOGICAL_SITES
@@ -1,5 +1,5 @@
 import streamlit as st
-from test_connection import get_connection
+from utils.backends import get_connection
 import pandas as pd
 
 def test_snowflake_data():
@@ -23,16 +23,16 @@ def test_snowflake_data():
         
         for table in tables:
             try:
-                # Check if table exists
-                cursor.execute(f"SHOW TABLES LIKE '{table}'")
+                # Check if table exists; names are bound, not formatted into the SQL
+                cursor.execute("SHOW TABLES LIKE %s", (table,))
                 if cursor.fetchone():
                     # Count rows
-                    cursor.execute(f"SELECT COUNT(*) FROM {table}")
+                    cursor.execute("SELECT COUNT(*) FROM IDENTIFIER(%s)", (table,))
                     row_count = cursor.fetchone()[0]
                     print(f"✅ {table}: {row_count} rows")
                     
                     # Show sample data
-                    cursor.execute(f"SELECT * FROM {table} LIMIT 1")
+                    cursor.execute("SELECT * FROM IDENTIFIER(%s) LIMIT 1", (table,))
                     columns = [desc[0] for desc in cursor.description]
                     sample = cursor.fetchone()
                     print(f"   Columns: {', '.join(columns)}")
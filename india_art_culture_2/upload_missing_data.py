@@ -1,23 +1,13 @@
 import streamlit as st
-from test_connection import get_connection
+from utils.backends import get_connection
 import pandas as pd
+from utils.transforms import normalize_gender_tourism, normalize_geological_sites, normalize_monuments
 
 def upload_monuments_data():
     """Upload monuments data to Snowflake"""
     try:
         # Load local data
-        monuments = pd.read_csv('data/raw/session_244_AU1787_1.1.csv')
-        monuments = monuments[monuments['Sl.No'] != 'Total']  # Remove total row
-        monuments.columns = ['SL_NO', 'STATE', 'MONUMENTS']
-        
-        # Clean state names
-        state_name_mapping = {
-            'N.C.T. Delhi': 'Delhi',
-            'Daman & Diu (UT)': 'Daman and Diu',
-            'Puducherry (U.T.)': 'Puducherry',
-            'Jammu & Kashmir': 'Jammu and Kashmir'
-        }
-        monuments['STATE'] = monuments['STATE'].replace(state_name_mapping)
+        monuments = normalize_monuments(pd.read_csv('data/raw/session_244_AU1787_1.1.csv'))
         
         # Upload to Snowflake
         conn = get_connection()
@@ -51,12 +41,7 @@ def upload_gender_tourism_data():
     """Upload gender tourism data to Snowflake"""
     try:
         # Load local data
-        df = pd.read_csv('data/raw/India-Tourism-Statistics-2019-Table-2.6.1.csv')
-        df.columns = ['YEAR', 'TOTAL_ARRIVALS', 'MALE_PCT', 'FEMALE_PCT', 'NOT_REPORTED_PCT']
-        
-        # Calculate actual numbers from percentages
-        for col in ['MALE_PCT', 'FEMALE_PCT', 'NOT_REPORTED_PCT']:
-            df[col.replace('_PCT', '_COUNT')] = (df['TOTAL_ARRIVALS'] * df[col] / 100).round().astype(int)
+        df = normalize_gender_tourism(pd.read_csv('data/raw/India-Tourism-Statistics-2019-Table-2.6.1.csv'))
         
         # Upload to Snowflake
         conn = get_connection()
@@ -101,24 +86,7 @@ def upload_geological_sites_data():
     """Upload geological sites data to Snowflake"""
     try:
         # Load local data
-        df = pd.read_csv('data/raw/rs_session-238_AU1380_1.1.csv', encoding='cp1252')
-        df.columns = ['SL_NO', 'STATE', 'SITE_NAME']
-        df['STATE'] = df['STATE'].str.title()
-        
-        # Create site type classification
-        def classify_site(name):
-            if 'fossil' in name.lower():
-                return 'Fossil Site'
-            elif any(term in name.lower() for term in ['lava', 'volcanic', 'igneous']):
-                return 'Volcanic/Igneous Formation'
-            elif any(term in name.lower() for term in ['fault', 'unconformity']):
-                return 'Geological Structure'
-            elif any(term in name.lower() for term in ['lake', 'cliff', 'island']):
-                return 'Natural Formation'
-            else:
-                return 'Other Geological Site'
-        
-        df['SITE_TYPE'] = df['SITE_NAME'].apply(classify_site)
+        df = normalize_geological_sites(pd.read_csv('data/raw/rs_session-238_AU1380_1.1.csv', encoding='cp1252'))
         
         # Upload to Snowflake
         conn = get_connection()
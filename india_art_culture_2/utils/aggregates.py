@@ -0,0 +1,132 @@
+import hashlib
+
+import pandas as pd
+from utils.backends import is_snowflake
+from utils.clustering import existing_tables
+
+# How stale a dynamic table may get when its base tables are loaded outside
+# the uploaders (e.g. snowflake_upload.sql). Uploads refresh them right away,
+# and a refresh with no changes in the base tables costs nothing.
+TARGET_LAG = '1 hour'
+
+# A dynamic table's comment records the definition it was created from,
+# so an upload only recreates it when that definition changed
+DEFINITION_COMMENT = 'aggregate definition '
+
+
+class Aggregate:
+    """
+    A dashboard aggregate kept precomputed next to the tables it reads:
+    a dynamic table on Snowflake, a table rebuilt on upload locally.
+    The catalog computes the same aggregate in pandas when the table is
+    not available.
+    """
+
+    def __init__(self, table, sources, query):
+        self.table = table
+        self.sources = tuple(sources)
+        self.query = query
+
+    @property
+    def comment(self):
+        """Comment of a dynamic table created from this definition"""
+        digest = hashlib.sha256(f"{TARGET_LAG}|{self.query}".encode()).hexdigest()[:16]
+        return DEFINITION_COMMENT + digest
+
+    def statement(self, warehouse=None):
+        """The CREATE statement that (re)builds this aggregate"""
+        if warehouse:
+            return (
+                f"CREATE OR REPLACE DYNAMIC TABLE {self.table}\n"
+                f"TARGET_LAG = '{TARGET_LAG}'\n"
+                f"WAREHOUSE = {warehouse}\n"
+                f"COMMENT = '{self.comment}'\n"
+                f"AS {self.query}"
+            )
+        return f"CREATE OR REPLACE TABLE {self.table} AS {self.query}"
+
+    def refresh_statement(self):
+        """Bring the dynamic table up to date, incrementally where Snowflake can"""
+        return f"ALTER DYNAMIC TABLE {self.table} REFRESH"
+
+
+def overview_metrics(art_forms, cultural_sites, tourism_stats):
+    """The Overview page's metric cards, as one row"""
+    cultural_sites = cultural_sites.rename(columns=str.upper)
+    return pd.DataFrame({
+        'TOTAL_ART_FORMS': [len(art_forms)],
+        'CULTURAL_SITES': [len(cultural_sites)],
+        'STATES_COVERED': [cultural_sites['STATE'].nunique()],
+        'TOTAL_VISITORS': [int(tourism_stats['DOMESTIC_VISITORS'].sum() + tourism_stats['FOREIGN_VISITORS'].sum())],
+    })
+
+
+def monuments_tourism(monuments, tourism_stats):
+    """Protected monuments of each state next to its visitors in the latest year"""
+    latest_year = tourism_stats['YEAR'].max()
+    latest = tourism_stats[tourism_stats['YEAR'] == latest_year]
+    visitors = latest.assign(TOTAL_VISITORS=latest['DOMESTIC_VISITORS'] + latest['FOREIGN_VISITORS'])
+    combined = monuments[['STATE', 'MONUMENTS']].merge(visitors[['STATE', 'TOTAL_VISITORS']], on='STATE', how='left')
+    return combined.assign(LATEST_YEAR=latest_year)
+
+
+OVERVIEW_METRICS = Aggregate(
+    'OVERVIEW_METRICS', ['ART_FORMS', 'CULTURAL_SITES', 'TOURISM_STATS'],
+    """
+SELECT a.TOTAL_ART_FORMS, c.CULTURAL_SITES, c.STATES_COVERED, t.TOTAL_VISITORS
+FROM (SELECT COUNT(*) AS TOTAL_ART_FORMS FROM ART_FORMS) a
+CROSS JOIN (SELECT COUNT(*) AS CULTURAL_SITES, COUNT(DISTINCT STATE) AS STATES_COVERED FROM CULTURAL_SITES) c
+CROSS JOIN (SELECT SUM(DOMESTIC_VISITORS) + SUM(FOREIGN_VISITORS) AS TOTAL_VISITORS FROM TOURISM_STATS) t
+"""
+)
+
+MONUMENTS_TOURISM = Aggregate(
+    'MONUMENTS_TOURISM', ['MONUMENTS', 'TOURISM_STATS'],
+    """
+SELECT m.STATE, m.MONUMENTS, t.DOMESTIC_VISITORS + t.FOREIGN_VISITORS AS TOTAL_VISITORS, l.LATEST_YEAR
+FROM MONUMENTS m
+CROSS JOIN (SELECT MAX(YEAR) AS LATEST_YEAR FROM TOURISM_STATS) l
+LEFT JOIN TOURISM_STATS t ON t.STATE = m.STATE AND t.YEAR = l.LATEST_YEAR
+"""
+)
+
+AGGREGATES = [OVERVIEW_METRICS, MONUMENTS_TOURISM]
+
+
+def dynamic_table_comments(cursor):
+    """{name: comment} of the dynamic tables in the current schema"""
+    cursor.execute("SHOW DYNAMIC TABLES IN SCHEMA")
+    columns = [desc[0].lower() for desc in cursor.description]
+    return {row[columns.index('name')]: row[columns.index('comment')] for row in cursor.fetchall()}
+
+
+def refresh_aggregates(conn, aggregates=AGGREGATES):
+    """
+    Bring every aggregate whose base tables exist up to date, after an
+    upload. On Snowflake a dynamic table is refreshed in place, keeping
+    its incremental refresh state, and only (re)created when it is
+    missing or its definition changed; local tables are rebuilt. Returns
+    the names of the tables refreshed.
+    """
+    refreshed = []
+    cursor = conn.cursor()
+    try:
+        warehouse, comments = None, {}
+        if is_snowflake(conn):
+            cursor.execute("SELECT CURRENT_WAREHOUSE()")
+            warehouse = cursor.fetchone()[0]
+            comments = dynamic_table_comments(cursor)
+        existing = existing_tables(cursor, {source for aggregate in aggregates for source in aggregate.sources})
+        for aggregate in aggregates:
+            missing = [source for source in aggregate.sources if source not in existing]
+            if missing:
+                print(f"⚠️ {aggregate.table}: {', '.join(missing)} not found, skipping")
+                continue
+            if warehouse and comments.get(aggregate.table) == aggregate.comment:
+                cursor.execute(aggregate.refresh_statement())
+            else:
+                cursor.execute(aggregate.statement(warehouse))
+            refreshed.append(aggregate.table)
+    finally:
+        cursor.close()
+    return refreshed
@@ -0,0 +1,249 @@
+import os
+import re
+import threading
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+DATA_DIR = Path(__file__).parent.parent / 'data'
+LOCAL_DB_PATH = DATA_DIR / 'local.duckdb'
+
+# Snowflake-only syntax used by this repo, rewritten for the local backend
+SQL_REWRITES = [
+    (re.compile(r'\bTIMESTAMP_NTZ\b', re.IGNORECASE), 'TIMESTAMP'),
+    (re.compile(r'\bNUMBER\s*\(', re.IGNORECASE), 'DECIMAL('),
+    (re.compile(r'\bNUMBER\b', re.IGNORECASE), 'BIGINT'),
+    (re.compile(r'\bFLOAT\b', re.IGNORECASE), 'DOUBLE'),
+    (re.compile(r'\bVARIANT\b', re.IGNORECASE), 'JSON'),
+    (re.compile(r'\bCURRENT_VERSION\(\)', re.IGNORECASE), 'version()'),
+    (re.compile(r'\bCURRENT_TIMESTAMP\(\)', re.IGNORECASE), 'CURRENT_TIMESTAMP'),
+    (
+        re.compile(r"^\s*SHOW\s+TABLES\s+LIKE\s+('[^']*'|%s)\s*;?\s*$", re.IGNORECASE),
+        r'SELECT table_name AS "name" FROM information_schema.tables WHERE table_name ILIKE \1'
+    ),
+]
+
+
+# Object names bound as parameters: SELECT * FROM IDENTIFIER(%s)
+_IDENTIFIER = re.compile(r'\bIDENTIFIER\(\s*%s\s*\)', re.IGNORECASE)
+_SAFE_IDENTIFIER = re.compile(r'^[A-Za-z_][A-Za-z0-9_$]*(\.[A-Za-z_][A-Za-z0-9_$]*)*$')
+
+
+def bind_identifiers(query, params):
+    """
+    Inline the names bound with IDENTIFIER(%s), which DuckDB cannot bind,
+    and return the query with the remaining parameters. Only plain
+    (optionally qualified) names are accepted.
+    """
+    if params is None or not _IDENTIFIER.search(query):
+        return query, params
+    params = list(params)
+    pieces = re.split(r'(IDENTIFIER\(\s*%s\s*\)|%s)', query, flags=re.IGNORECASE)
+    remaining, index = [], 0
+    for i in range(1, len(pieces), 2):
+        value = params[index]
+        index += 1
+        if pieces[i] == '%s':
+            remaining.append(value)
+            continue
+        if not _SAFE_IDENTIFIER.match(str(value)):
+            raise ValueError(f"Invalid identifier: {value!r}")
+        pieces[i] = str(value)
+    return ''.join(pieces), remaining
+
+
+def translate_sql(query, params=None):
+    """
+    Rewrite Snowflake SQL into the DuckDB dialect.
+    Pyformat placeholders are only rewritten when parameters are bound,
+    so LIKE patterns such as '%sand%' are left alone.
+    """
+    for pattern, replacement in SQL_REWRITES:
+        query = pattern.sub(replacement, query)
+    if params is not None:
+        query = query.replace('%s', '?')
+    return query
+
+
+class LocalCursor:
+    """
+    DuckDB cursor exposing the subset of the Snowflake cursor API used by
+    the dashboards, uploaders and pandas.read_sql
+    """
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def execute(self, query, params=None, timeout=None):
+        """Run query; like Snowflake's cursor, interrupt it after timeout seconds"""
+        query, params = bind_identifiers(query, params)
+        query = translate_sql(query, params)
+        timer = threading.Timer(timeout, self.interrupt) if timeout else None
+        if timer:
+            timer.start()
+        try:
+            if params is None:
+                self._cursor.execute(query)
+            else:
+                # numpy scalars (e.g. from iterrows) are not bindable as-is
+                self._cursor.execute(query, [p.item() if hasattr(p, 'item') else p for p in params])
+        finally:
+            if timer:
+                timer.cancel()
+        return self
+
+    def interrupt(self):
+        """Stop the query running on this cursor"""
+        self._cursor.interrupt()
+
+    @property
+    def description(self):
+        return self._cursor.description
+
+    @property
+    def rowcount(self):
+        return self._cursor.rowcount
+
+    def fetchone(self):
+        return self._cursor.fetchone()
+
+    def fetchmany(self, size=1):
+        return self._cursor.fetchmany(size)
+
+    def fetchall(self):
+        return self._cursor.fetchall()
+
+    def fetch_pandas_all(self):
+        return self._cursor.fetch_df()
+
+    def close(self):
+        self._cursor.close()
+
+
+class LocalConnection:
+    """DuckDB connection with the Snowflake connection interface"""
+
+    def __init__(self, db, backend):
+        self.db = db
+        self.backend = backend
+
+    def cursor(self):
+        # DuckDB cursors are independent connections to the same database,
+        # so each caller gets its own and they can be used from any thread
+        return LocalCursor(self.db.cursor())
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        self.db.close()
+
+
+class SnowflakeBackend:
+    """Snowflake warehouse backend"""
+
+    name = 'snowflake'
+    manifest_path = DATA_DIR / 'upload_manifest.json'
+
+    def connect(self):
+        """Open a connection with the credentials in Streamlit secrets, verifying the server's certificate"""
+        import snowflake.connector
+        import streamlit as st
+        # Imported here: utils.queries imports this module
+        from utils.queries import session_parameters
+        return snowflake.connector.connect(
+            user=st.secrets.snowflake_user,
+            password=st.secrets.snowflake_password,
+            account=st.secrets.snowflake_account,
+            warehouse=st.secrets.snowflake_warehouse,
+            database=st.secrets.snowflake_database,
+            schema=st.secrets.snowflake_schema,
+            region=st.secrets.get('snowflake_region'),
+            client_session_keep_alive=True,
+            login_timeout=60,
+            # Tags this app's queries in QUERY_HISTORY and bounds their run time
+            session_parameters=session_parameters()
+        )
+
+    def write_pandas(self, conn, df, table_name, **kwargs):
+        from snowflake.connector.pandas_tools import write_pandas
+        return write_pandas(conn=conn, df=df, table_name=table_name, **kwargs)
+
+
+class DuckDBBackend:
+    """
+    Local DuckDB backend for offline development, testing and benchmarks.
+    Accepts the SQL this repo sends to Snowflake, with the rewrites in
+    SQL_REWRITES applied.
+    """
+
+    name = 'duckdb'
+
+    def __init__(self, path=None):
+        self.path = Path(path or os.getenv('LOCAL_DB_PATH', LOCAL_DB_PATH))
+        self.manifest_path = self.path.with_name(f"{self.path.stem}_manifest.json")
+
+    def connect(self):
+        import duckdb
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        return LocalConnection(duckdb.connect(str(self.path)), self)
+
+    def write_pandas(self, conn, df, table_name, overwrite=False, auto_create_table=False, **kwargs):
+        """
+        Bulk load df into table_name, mirroring write_pandas' overwrite
+        semantics. Missing tables are always created, since there is no
+        separate schema setup step for the local database.
+        database, schema and the Snowflake tuning options are ignored.
+        """
+        db = conn.db.cursor()
+        try:
+            db.register('_write_pandas_df', df)
+            if overwrite:
+                db.execute(f"CREATE OR REPLACE TABLE {table_name} AS SELECT * FROM _write_pandas_df")
+            else:
+                db.execute(f"CREATE TABLE IF NOT EXISTS {table_name} AS SELECT * FROM _write_pandas_df LIMIT 0")
+                db.execute(f"INSERT INTO {table_name} BY NAME SELECT * FROM _write_pandas_df")
+        finally:
+            db.close()
+        return True, 1, len(df), []
+
+
+BACKENDS = {
+    'snowflake': SnowflakeBackend,
+    'duckdb': DuckDBBackend
+}
+
+
+def get_backend(name=None):
+    """
+    Return the configured data backend. Set DATA_BACKEND=duckdb to run
+    everything against the local database in data/local.duckdb
+    (override the location with LOCAL_DB_PATH).
+    """
+    name = (name or os.getenv('DATA_BACKEND', 'snowflake')).lower()
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown DATA_BACKEND '{name}', expected one of: {', '.join(BACKENDS)}")
+    return BACKENDS[name]()
+
+
+def is_snowflake(conn):
+    """Whether conn is a Snowflake connection rather than a local stand-in"""
+    backend = getattr(conn, 'backend', None)
+    return backend is None or backend.name == 'snowflake'
+
+
+def get_connection():
+    """Open a connection on the configured backend"""
+    return get_backend().connect()
+
+
+def write_pandas(conn, df, table_name, **kwargs):
+    """Bulk load a DataFrame through whichever backend owns conn"""
+    backend = getattr(conn, 'backend', None) or SnowflakeBackend()
+    return backend.write_pandas(conn, df, table_name, **kwargs)
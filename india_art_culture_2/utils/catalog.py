@@ -0,0 +1,460 @@
+import hashlib
+import os
+import time
+
+import streamlit as st
+from utils.aggregates import monuments_tourism, overview_metrics
+from utils.backends import DATA_DIR
+from utils.governor import MAX_RESULT_ROWS
+from utils.ingest import ParseSpec, read_json_records, read_table
+from utils.instrumentation import annotate, result_stats, track
+from utils.queries import QueryCancelled, as_completed, run_query, submit_query
+from utils.serving import SingleFlight
+from utils.star_schema import SOURCES as STAR_SOURCES, star_table
+from utils.transforms import (
+    build_state_analysis, normalize_festivals, normalize_gender_tourism, normalize_geological_sites,
+    normalize_monuments, reshape_tourism_stats
+)
+from utils.upload_manifest import MANIFEST_TABLE, file_hash
+
+RAW_DIR = DATA_DIR / 'raw'
+
+# How long a snapshot of the remote table versions is trusted before UPLOAD_MANIFEST is re-read
+SNAPSHOT_TTL = 60
+
+def read_festivals_json(file_path):
+    """Read the Festival of India JSON export into a typed DataFrame"""
+    return normalize_festivals(read_json_records(file_path))
+
+
+class Dataset:
+    """
+    A logical dataset: the table it is served from and how to rebuild it locally.
+
+    Locally a dataset is either read from one file in data/raw, following
+    its ParseSpec (or with a custom reader), or derived from other catalog
+    datasets (sources) with normalizer, which turns them into the table's
+    layout. columns lists the columns consumers rely on.
+    """
+
+    def __init__(self, name, table=None, file=None, parse=None, reader=None, sources=(),
+                 normalizer=None, columns=None, order_by=None):
+        self.name = name
+        self.table = table
+        self.file = file
+        self.parse = parse
+        self.reader = reader
+        self.sources = tuple(sources)
+        self.normalizer = normalizer
+        self.columns = columns
+        self.order_by = order_by
+
+    @property
+    def path(self):
+        return RAW_DIR / self.file if self.file else None
+
+    @property
+    def label(self):
+        return self.name.replace('_', ' ')
+
+    def read(self, file_path=None):
+        """Read the source file (or a copy of it at file_path) into a typed DataFrame"""
+        file_path = file_path or self.path
+        if self.reader:
+            return self.reader(file_path)
+        return read_table(file_path, self.parse)
+
+    def query(self):
+        """
+        The dataset's query and its parameters; the table name is bound,
+        not formatted in. One row past MAX_RESULT_ROWS is fetched, to tell
+        a capped result from a table of exactly that size.
+        """
+        query = "SELECT * FROM IDENTIFIER(%s)"
+        if self.order_by:
+            query += f" ORDER BY {self.order_by}"
+        return query + " LIMIT %s", (self.table, MAX_RESULT_ROWS + 1)
+
+
+DATASETS = [
+    # Art and culture
+    Dataset('art_forms', table='ART_FORMS', file='art_forms.csv'),
+    Dataset('festivals', table='FESTIVALS', file='Festival_of_India.json', reader=read_festivals_json),
+
+    # Tourism statistics
+    Dataset('tourism_statistics_2019_2_1_1', table='TOURISM_STATISTICS_2019_2_1_1',
+            file='India-Tourism-Statistics-2019-Table-2.1.1.csv'),
+    Dataset('tourism_statistics_2019_2_6_1', table='TOURISM_STATISTICS_2019_2_6_1',
+            file='India-Tourism-Statistics-2019-Table-2.6.1.csv'),
+    Dataset('tourism_statistics_2021_2_3_3', table='TOURISM_STATISTICS_2021_2_3_3',
+            file='India-Tourism-Statistics-2021-Table-2.3.3.csv'),
+    Dataset('tourism_statistics_2021_2_3_3_1', file='India-Tourism-Statistics-2021-Table-2.3.3(1).csv'),
+    Dataset('tourism_data', table='TOURISM_DATA', file='tourism_data.csv'),
+    Dataset('tourism_statistics_2018_2_1_1', table='TOURISM_STATISTICS_2018_2_1_1',
+            file='Tourism_In_India_Statistics_2018-Table_2.1.1_1.csv'),
+
+    # Heritage
+    Dataset('cultural_sites', table='CULTURAL_SITES', file='cultural_sites.csv'),
+    Dataset('heritage_cities', table='HERITAGE_CITIES', file='List_of_Heritage_Cities.csv',
+            parse=ParseSpec(skiprows=3)),
+
+    # Rajya Sabha session answers, as published
+    Dataset('rs_session_246_au_2259', table='RS_SESSION_246_AU_2259', file='RS_Session_246_AU_2259_1.1.csv',
+            parse=ParseSpec(
+                extract={'Monthly Scholarship': ('Amount of Scholarship', r'Rs\.?\s*([\d,]+)')},
+                units={'Monthly Scholarship': 'Rs per month'}
+            )),
+    Dataset('rs_session_248_au_1232', table='RS_SESSION_248_AU_1232', file='RS_Session_248_AU_1232.csv'),
+    Dataset('rs_session_255_au_1292', table='RS_SESSION_255_AU_1292', file='RS_Session_255_AU_1292.A_and_B.csv',
+            parse=ParseSpec(units={'Funds Allocated': 'Rs crore', 'Funds Released/Spent': 'Rs crore'})),
+    Dataset('rs_session_259_au_1898', table='RS_SESSION_259_AU_1898', file='RS_Session_259_AU_1898_B_and_C.csv'),
+    # Published with its line breaks missing: "Year,Amount2021-22,68.792022-23,71.19..."
+    Dataset('rs_session_262_au_497', table='RS_SESSION_262_AU_497', file='RS_Session_262_AU_497_B.csv',
+            parse=ParseSpec(record_pattern=r'(\d{4}-\d{2}),(\d+\.\d{2})')),
+    Dataset('rs_session_238_au1380', table='RS_SESSION_238_AU1380', file='rs_session-238_AU1380_1.1.csv',
+            parse=ParseSpec(encoding='cp1252')),
+    Dataset('rs_session_251_au308', table='RS_SESSION_251_AU308', file='RS-Session-251-AU308-Annexure-I.csv'),
+    Dataset('rs_session_251_au1434', table='RS_SESSION_251_AU1434', file='RS-Session-251-AU1434-Table1.csv'),
+    Dataset('session_244_au1787', table='SESSION_244_AU1787', file='session_244_AU1787_1.1.csv'),
+
+    # Cleaned tables served to app.py, derived from the session answers above
+    Dataset('tourism_stats', table='TOURISM_STATS', order_by='YEAR',
+            sources=['rs_session_259_au_1898', 'rs_session_251_au308'], normalizer=reshape_tourism_stats,
+            columns=['STATE', 'DOMESTIC_VISITORS', 'FOREIGN_VISITORS', 'YEAR', 'MONTH']),
+    Dataset('monuments', table='MONUMENTS',
+            sources=['session_244_au1787'], normalizer=normalize_monuments,
+            columns=['SL_NO', 'STATE', 'MONUMENTS']),
+    Dataset('gender_tourism', table='GENDER_TOURISM', order_by='YEAR',
+            sources=['tourism_statistics_2019_2_6_1'], normalizer=normalize_gender_tourism,
+            columns=['YEAR', 'TOTAL_ARRIVALS', 'MALE_PCT', 'FEMALE_PCT', 'NOT_REPORTED_PCT',
+                     'MALE_COUNT', 'FEMALE_COUNT', 'NOT_REPORTED_COUNT']),
+    Dataset('geological_sites', table='GEOLOGICAL_SITES',
+            sources=['rs_session_238_au1380'], normalizer=normalize_geological_sites,
+            columns=['SL_NO', 'STATE', 'SITE_NAME', 'SITE_TYPE']),
+
+    # Overview aggregates, kept precomputed as dynamic tables (see utils/aggregates.py)
+    Dataset('overview_metrics', table='OVERVIEW_METRICS',
+            sources=['art_forms', 'cultural_sites', 'tourism_stats'], normalizer=overview_metrics,
+            columns=['TOTAL_ART_FORMS', 'CULTURAL_SITES', 'STATES_COVERED', 'TOTAL_VISITORS']),
+    Dataset('monuments_tourism', table='MONUMENTS_TOURISM',
+            sources=['monuments', 'tourism_stats'], normalizer=monuments_tourism,
+            columns=['STATE', 'MONUMENTS', 'TOTAL_VISITORS', 'LATEST_YEAR']),
+    # Per-state summary of the Conclusions & Insights page; no table, always derived
+    Dataset('state_analysis',
+            sources=['cultural_sites', 'art_forms', 'tourism_stats'], normalizer=build_state_analysis,
+            columns=['STATE', 'CULTURAL_SITES', 'ART_FORMS', 'DOMESTIC_VISITORS', 'FOREIGN_VISITORS',
+                     'TOTAL_VISITORS']),
+
+    # Star schema over the session answers: conformed state and year
+    # dimensions shared by narrow fact tables (see utils/star_schema.py)
+    Dataset('dim_state', table='DIM_STATE', order_by='STATE_ID',
+            sources=STAR_SOURCES, normalizer=star_table('DIM_STATE'),
+            columns=['STATE_ID', 'KEY', 'STATE']),
+    Dataset('dim_year', table='DIM_YEAR', order_by='YEAR',
+            sources=STAR_SOURCES, normalizer=star_table('DIM_YEAR'),
+            columns=['YEAR', 'FISCAL_YEAR']),
+    Dataset('fact_visits', table='FACT_VISITS', order_by='YEAR',
+            sources=STAR_SOURCES, normalizer=star_table('FACT_VISITS'),
+            columns=['STATE_ID', 'YEAR', 'VISITOR_TYPE', 'VISITS', 'SOURCE']),
+    Dataset('fact_artisans', table='FACT_ARTISANS', order_by='STATE_ID',
+            sources=STAR_SOURCES, normalizer=star_table('FACT_ARTISANS'),
+            columns=['STATE_ID', 'ARTISANS', 'SOURCE']),
+    Dataset('fact_funding', table='FACT_FUNDING', order_by='YEAR',
+            sources=STAR_SOURCES, normalizer=star_table('FACT_FUNDING'),
+            columns=['YEAR', 'FUNDS_ALLOCATED', 'FUNDS_RELEASED', 'SOURCE']),
+    Dataset('fact_monuments', table='FACT_MONUMENTS', order_by='STATE_ID',
+            sources=STAR_SOURCES, normalizer=star_table('FACT_MONUMENTS'),
+            columns=['STATE_ID', 'MONUMENTS', 'SOURCE']),
+]
+
+CATALOG = {dataset.name: dataset for dataset in DATASETS}
+
+
+def get_dataset(name):
+    if name not in CATALOG:
+        raise KeyError(f"Unknown dataset '{name}', expected one of: {', '.join(CATALOG)}")
+    return CATALOG[name]
+
+
+_file_hashes = {}
+
+
+def _local_file_hash(path):
+    """file_hash, recomputed only when the file's size or mtime changes"""
+    stat = os.stat(path)
+    key = (str(path), stat.st_size, stat.st_mtime_ns)
+    if key not in _file_hashes:
+        _file_hashes[key] = file_hash(path)
+    return _file_hashes[key]
+
+
+@st.cache_data(ttl=SNAPSHOT_TTL, show_spinner=False)
+def _table_versions(backend_name, _conn):
+    """
+    Content hash of every table recorded in UPLOAD_MANIFEST. These are
+    the SHA-256 hashes of the uploaded source files, so a table and the
+    file it was loaded from share a version.
+    """
+    cursor = _conn.cursor()
+    try:
+        cursor.execute("SELECT TABLE_NAME, CONTENT_HASH FROM IDENTIFIER(%s)", (MANIFEST_TABLE,))
+        return dict(cursor.fetchall())
+    except Exception:
+        # No manifest yet: nothing has been uploaded incrementally
+        return {}
+    finally:
+        cursor.close()
+
+
+def refresh():
+    """Re-read UPLOAD_MANIFEST on the next load, e.g. right after an upload"""
+    _table_versions.clear()
+    _unavailable.clear()
+
+
+def _digest(*parts):
+    return hashlib.sha256('|'.join(parts).encode()).hexdigest()[:16]
+
+
+def local_version(name, conn=None):
+    """
+    Version of the data this dataset would be rebuilt from locally. A
+    dataset with no table of its own is derived from its sources as
+    served on conn, so their table versions count.
+    """
+    dataset = get_dataset(name)
+    if dataset.file:
+        if not dataset.path.exists():
+            return None
+        return _local_file_hash(dataset.path)[:16]
+    if dataset.sources:
+        if conn is not None and not dataset.table:
+            served = snapshot(dataset.sources, conn).values()
+            versions = [f"{source}:{version}" if version else None for source, version in served]
+        else:
+            versions = [local_version(source) for source in dataset.sources]
+        if None in versions:
+            return None
+        return _digest(name, *versions)
+    return None
+
+
+def table_version(name, conn):
+    """
+    Version of the dataset's table: its UPLOAD_MANIFEST content hash, or
+    for tables loaded outside the manifest, the version of the local
+    sources they were built from
+    """
+    dataset = get_dataset(name)
+    if conn is None or not dataset.table:
+        return None
+    backend = getattr(conn, 'backend', None)
+    versions = _table_versions(backend.name if backend else 'snowflake', conn)
+    if dataset.table in versions:
+        return versions[dataset.table][:16]
+    if dataset.sources:
+        source_versions = [table_version(source, conn) or local_version(source) for source in dataset.sources]
+        if None not in source_versions:
+            return _digest(name, *source_versions)
+    return local_version(name) or 'unversioned'
+
+
+# Table versions that failed to load or were empty, by (name, version), and
+# until when: their local copy is served meanwhile instead of querying the
+# table (and warning about it) again on every rerun
+_unavailable = {}
+
+
+def _mark_unavailable(name, version):
+    _unavailable[(name, version)] = time.monotonic() + SNAPSHOT_TTL
+
+
+def _served_table_version(name, conn):
+    """table_version, or None while that version of the table is marked unavailable"""
+    version = table_version(name, conn)
+    expires = _unavailable.get((name, version))
+    if expires is None:
+        return version
+    if expires > time.monotonic():
+        return None
+    _unavailable.pop((name, version), None)
+    return version
+
+
+def snapshot(names=None, conn=None):
+    """
+    The (source, version) every dataset would currently be served from,
+    resolved against a single read of UPLOAD_MANIFEST
+    """
+    result = {}
+    for name in names or CATALOG:
+        version = _served_table_version(name, conn)
+        result[name] = ('table', version) if version else ('local', local_version(name, conn))
+    return result
+
+
+def _query_table(dataset, conn):
+    query, params = dataset.query()
+    return run_query(conn, query, params, name=dataset.table)
+
+
+def _build_local(dataset, conn):
+    if dataset.file:
+        if not dataset.path.exists():
+            raise FileNotFoundError(f"{dataset.file} not found in {RAW_DIR}")
+        df = dataset.read()
+        return dataset.normalizer(df) if dataset.normalizer else df
+    if dataset.sources:
+        frames = [load(source, conn) for source in dataset.sources]
+        return dataset.normalizer(*frames)
+    raise LookupError(f"{dataset.name} has no local source")
+
+
+# Table results fetched by load_progressively ahead of _fetch, by (name, version),
+# and the (name, source, version) entries _fetch has cached
+_prefetched = {}
+_fetched = set()
+
+# Table queries running for any session, by (name, version): sessions that
+# need the same table meanwhile wait for that query rather than sending it again
+_table_queries = SingleFlight()
+
+
+@st.cache_resource(max_entries=256, show_spinner=False)
+def _fetch(name, source, version, _conn):
+    """
+    Fetch one version of a dataset. Shared by every session and both
+    dashboards, without hashing or copying it per rerun; a new version
+    gets its own entry, so only changed datasets are refetched.
+    """
+    annotate(cache='miss')
+    dataset = get_dataset(name)
+    if source == 'table':
+        df = _prefetched.pop((name, version), None)
+        if isinstance(df, Exception):
+            raise df
+        if df is None:
+            df = _table_queries.do((name, version), _query_table, dataset, _conn)
+        if df.empty:
+            # Not cached: an empty table falls back to the local copy
+            raise LookupError(f"{dataset.table} is empty")
+        if len(df) > MAX_RESULT_ROWS:
+            df = df.head(MAX_RESULT_ROWS)
+            df.attrs['truncated_at'] = MAX_RESULT_ROWS
+    else:
+        df = _build_local(dataset, _conn)
+    _fetched.add((name, source, version))
+    return df
+
+
+def load(name, conn=None):
+    """
+    Load a dataset by logical name, from its table when conn is given and
+    the table is available, otherwise from the local files in data/raw.
+    Raises if neither is available.
+    """
+    dataset = get_dataset(name)
+    with track('dataset', name) as span:
+        span.annotate(cache='hit')
+        df = None
+        version = _served_table_version(name, conn)
+        if version is not None:
+            try:
+                df = _fetch(name, 'table', version, conn)
+            except Exception as e:
+                if not (dataset.file or dataset.sources):
+                    raise
+                _mark_unavailable(name, version)
+                st.warning(f"⚠️ Falling back to local files for {dataset.label} ({type(e).__name__})")
+
+        if df is None:
+            version = local_version(name, conn)
+            if version is None:
+                raise LookupError(f"No table or local file available for {dataset.label}")
+            df = _fetch(name, 'local', version, conn)
+
+        span.annotate(**result_stats(df))
+        if df.attrs.get('truncated_at'):
+            st.warning(f"⚠️ {dataset.label} has more than {df.attrs['truncated_at']:,} rows; only the first ones were loaded")
+        if dataset.columns:
+            missing = [col for col in dataset.columns if col not in df.columns]
+            if missing:
+                st.warning(f"⚠️ {dataset.label} is missing columns: {', '.join(missing)}")
+        return view(df)
+
+
+def _load_or_none(name, conn):
+    try:
+        return load(name, conn)
+    except Exception:
+        # Neither the table nor a local file is available
+        return None
+
+
+def load_progressively(names, conn=None):
+    """
+    Load several datasets, yielding (name, DataFrame or None) as each one
+    arrives. The table queries of every dataset not cached yet are
+    submitted together first, so a page can render each section as soon
+    as its own data lands instead of waiting for the slowest query.
+    Cached and local datasets come first, then tables as they complete.
+    A table another session is already querying is waited for, not
+    queried again.
+    """
+    submitted, waiting, ready = {}, {}, []
+    try:
+        for name in names:
+            version = _served_table_version(name, conn)
+            if version is not None and (name, 'table', version) not in _fetched:
+                future, leader = _table_queries.begin((name, version))
+                if not leader:
+                    waiting[future] = name
+                    continue
+                query, params = get_dataset(name).query()
+                try:
+                    submitted[submit_query(conn, query, params, name=get_dataset(name).table)] = (name, version)
+                    continue
+                except Exception as e:
+                    # load() below retries the query and falls back as usual
+                    _table_queries.finish((name, version), error=e)
+            ready.append(name)
+
+        for name in ready:
+            yield name, _load_or_none(name, conn)
+
+        for query in as_completed([*submitted, *waiting]):
+            if query in waiting:
+                # Another session's query landed: _fetch finds its result
+                yield waiting[query], _load_or_none(waiting[query], conn)
+                continue
+            name, version = submitted.pop(query)
+            try:
+                _prefetched[(name, version)] = query.result()
+            except Exception as e:
+                _prefetched[(name, version)] = e
+            # Prefetched first, so the sessions woken here find the result
+            result = _prefetched[(name, version)]
+            if isinstance(result, Exception):
+                _table_queries.finish((name, version), error=result)
+            else:
+                _table_queries.finish((name, version), result)
+            try:
+                yield name, _load_or_none(name, conn)
+            finally:
+                # Left over when another session cached this version first
+                _prefetched.pop((name, version), None)
+    finally:
+        # The page stopped early (the user navigated away): stop what is still
+        # running, and let sessions waiting for it query the table themselves
+        for query, key in submitted.items():
+            query.cancel()
+            _table_queries.finish(key, error=QueryCancelled(f"{query.name} was cancelled"))
+
+
+def view(df):
+    """
+    A read-only view of a shared frame. It copies no data, and under the
+    dashboards' copy-on-write mode columns added to it or values changed
+    in it stay out of the cached frame.
+    """
+    return df.copy(deep=False)
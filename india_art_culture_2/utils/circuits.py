@@ -0,0 +1,95 @@
+import numpy as np
+
+from utils.spatial import haversine_km
+
+
+def distance_matrix(lat, lon):
+    """Pairwise great-circle distances in km, as an n x n array"""
+    lat = np.asarray(lat, dtype='float64')
+    lon = np.asarray(lon, dtype='float64')
+    return haversine_km(lat[:, None], lon[:, None], lat[None, :], lon[None, :])
+
+
+def route_length(route, dist, closed=True):
+    """Total km of visiting route in order, returning to the start when closed"""
+    route = np.asarray(route)
+    legs = dist[route[:-1], route[1:]].sum()
+    return legs + dist[route[-1], route[0]] if closed and len(route) > 1 else legs
+
+
+def nearest_neighbour_route(dist, start=0):
+    """Greedy tour: always move on to the closest stop not yet visited"""
+    n = len(dist)
+    route = np.empty(n, dtype='int64')
+    visited = np.zeros(n, dtype=bool)
+    route[0], visited[start] = start, True
+    for k in range(1, n):
+        candidates = np.where(visited, np.inf, dist[route[k - 1]])
+        route[k] = np.argmin(candidates)
+        visited[route[k]] = True
+    return route
+
+
+def two_opt(route, dist, max_passes=50):
+    """
+    Improve a closed tour by reversing segments while that shortens it.
+    For each segment start, the gain of every segment end is computed at
+    once, so a pass costs n vector operations instead of n^2 Python steps.
+    """
+    route = np.array(route)
+    n = len(route)
+    if n < 4:
+        return route
+    for _ in range(max_passes):
+        improved = False
+        for i in range(1, n - 1):
+            j = np.arange(i + 1, n)
+            a, b = route[i - 1], route[i]
+            c, d = route[j], route[(j + 1) % n]
+            # Swap edges (a, b) and (c, d) for (a, c) and (b, d)
+            delta = dist[a, c] + dist[b, d] - dist[a, b] - dist[c, d]
+            best = np.argmin(delta)
+            if delta[best] < -1e-9:
+                route[i:j[best] + 1] = route[i:j[best] + 1][::-1]
+                improved = True
+        if not improved:
+            break
+    return route
+
+
+def plan_circuit(dist, start=0, closed=True, max_passes=50):
+    """
+    Near-optimal order to visit every stop of dist, beginning at start.
+    A closed circuit returns to start; an open one ends at whichever stop
+    makes the route shortest. Returns (route, total_km).
+    """
+    n = len(dist)
+    if n == 0:
+        return np.empty(0, dtype='int64'), 0.0
+    if not closed:
+        # A dummy stop that is free to reach from start, and equally costly
+        # from every other stop, turns the open route into a tour; cutting
+        # the tour at the dummy leaves the best open route
+        padded = np.full((n + 1, n + 1), 0.0)
+        padded[:n, :n] = dist
+        padded[n, :n] = padded[:n, n] = dist.max() * n + 1
+        padded[n, start] = padded[start, n] = 0.0
+        tour = two_opt(nearest_neighbour_route(padded, n), padded, max_passes)
+        route = np.roll(tour, -int(np.flatnonzero(tour == n)[0]))[1:]
+        if route[0] != start:
+            route = route[::-1]
+        return route, route_length(route, dist, closed=False)
+
+    route = two_opt(nearest_neighbour_route(dist, start), dist, max_passes)
+    route = np.roll(route, -int(np.flatnonzero(route == start)[0]))
+    return route, route_length(route, dist, closed=True)
+
+
+def circuit_stops(sites, route, dist):
+    """Sites in visiting order with the km of each leg and the running total"""
+    stops = sites.iloc[route].reset_index(drop=True)
+    legs = np.concatenate([[0.0], dist[route[:-1], route[1:]]])
+    stops.insert(0, 'STOP', np.arange(1, len(stops) + 1))
+    stops['LEG_KM'] = legs
+    stops['CUMULATIVE_KM'] = np.cumsum(legs)
+    return stops
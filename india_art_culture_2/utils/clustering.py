@@ -0,0 +1,132 @@
+import json
+
+import pandas as pd
+from utils.backends import is_snowflake
+
+# Snowflake has no secondary indexes: pruning comes from clustering keys,
+# which keep rows with the same key values in the same micro-partitions.
+# Only the tables the dashboards filter by these columns are clustered.
+CLUSTERING_KEYS = {
+    'TOURISM_STATS': ('YEAR', 'MONTH'),
+    'CULTURAL_SITES': ('STATE',),
+}
+
+# Point lookups by name ("WHERE SITE_NAME = ...") use search optimization
+SEARCH_OPTIMIZATION = {
+    'CULTURAL_SITES': ('SITE_NAME',),
+    'ART_FORMS': ('ART_FORM',),
+    'GEOLOGICAL_SITES': ('SITE_NAME',),
+}
+
+
+class PhysicalDesign:
+    """Clustering key and search optimization columns of one table"""
+
+    def __init__(self, table, cluster_by=(), search_on=()):
+        self.table = table
+        self.cluster_by = tuple(cluster_by)
+        self.search_on = tuple(search_on)
+
+    def statements(self):
+        """The ALTER TABLE statements that apply this design"""
+        statements = []
+        if self.cluster_by:
+            statements.append(f"ALTER TABLE {self.table} CLUSTER BY ({', '.join(self.cluster_by)})")
+        if self.search_on:
+            columns = ', '.join(f"EQUALITY({col})" for col in self.search_on)
+            statements.append(f"ALTER TABLE {self.table} ADD SEARCH OPTIMIZATION ON {columns}")
+        return statements
+
+
+DESIGNS = [
+    PhysicalDesign(table, CLUSTERING_KEYS.get(table, ()), SEARCH_OPTIMIZATION.get(table, ()))
+    for table in sorted(set(CLUSTERING_KEYS) | set(SEARCH_OPTIMIZATION))
+]
+
+
+def supports_clustering(conn):
+    """Clustering keys and search optimization only exist on Snowflake"""
+    return is_snowflake(conn)
+
+
+def existing_tables(cursor, tables):
+    found = set()
+    for table in tables:
+        cursor.execute("SHOW TABLES LIKE %s", (table,))
+        if cursor.fetchone():
+            found.add(table)
+    return found
+
+
+def apply_physical_design(conn, designs=DESIGNS):
+    """
+    Apply every design to the tables that exist. Both statements are
+    idempotent, so this can run after every upload. Returns
+    {table: [statements run]}; missing tables are skipped.
+    """
+    applied = {}
+    if not supports_clustering(conn):
+        return applied
+    cursor = conn.cursor()
+    try:
+        existing = existing_tables(cursor, [design.table for design in designs])
+        for design in designs:
+            if design.table not in existing:
+                continue
+            applied[design.table] = []
+            for statement in design.statements():
+                try:
+                    cursor.execute(statement)
+                    applied[design.table].append(statement)
+                except Exception as e:
+                    # Search optimization needs Enterprise edition; the clustering key still applies
+                    if 'SEARCH OPTIMIZATION' not in statement:
+                        raise
+                    print(f"⚠️ {design.table}: search optimization not applied ({str(e)})")
+    finally:
+        cursor.close()
+    return applied
+
+
+def clustering_information(conn, table, columns):
+    """
+    Partition statistics of table for the given clustering columns, from
+    SYSTEM$CLUSTERING_INFORMATION. constant_ratio is the share of
+    micro-partitions holding a single key value, which a filter on the
+    key can prune outright; lower average_depth means fewer partitions
+    scanned per key value.
+    """
+    cursor = conn.cursor()
+    try:
+        cursor.execute(f"SELECT SYSTEM$CLUSTERING_INFORMATION('{table}', '({', '.join(columns)})')")
+        info = json.loads(cursor.fetchone()[0])
+    finally:
+        cursor.close()
+    total = info.get('total_partition_count', 0)
+    constant = info.get('total_constant_partition_count', 0)
+    return {
+        'table': table,
+        'clustering_key': ', '.join(columns),
+        'partitions': total,
+        'constant_partitions': constant,
+        'constant_ratio': constant / total if total else None,
+        'average_overlaps': info.get('average_overlaps'),
+        'average_depth': info.get('average_depth'),
+    }
+
+
+def verify_clustering(conn, designs=DESIGNS):
+    """Clustering statistics of every clustered table that exists, one row per table"""
+    if not supports_clustering(conn):
+        return pd.DataFrame()
+    clustered = [design for design in designs if design.cluster_by]
+    cursor = conn.cursor()
+    try:
+        existing = existing_tables(cursor, [design.table for design in clustered])
+    finally:
+        cursor.close()
+    rows = [
+        clustering_information(conn, design.table, design.cluster_by)
+        for design in clustered if design.table in existing
+    ]
+    return pd.DataFrame(rows)
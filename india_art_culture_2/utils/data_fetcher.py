@@ -2,8 +2,10 @@ import requests
 import pandas as pd
 import os
 from pathlib import Path
-import snowflake.connector
 from dotenv import load_dotenv
+from utils.lazy_imports import lazy_import
+
+snowflake_connector = lazy_import('snowflake.connector')
 
 # Load environment variables
 load_dotenv()
@@ -33,7 +35,7 @@ def get_snowflake_connection():
     Establish connection with Snowflake
     """
     try:
-        conn = snowflake.connector.connect(
+        conn = snowflake_connector.connect(
             user=os.getenv('SNOWFLAKE_USER'),
             password=os.getenv('SNOWFLAKE_PASSWORD'),
             account=os.getenv('SNOWFLAKE_ACCOUNT'),
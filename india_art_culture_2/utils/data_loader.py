@@ -1,8 +1,10 @@
 import pandas as pd
-import snowflake.connector
 from pathlib import Path
 import os
 from dotenv import load_dotenv
+from utils.lazy_imports import lazy_import
+
+snowflake_connector = lazy_import('snowflake.connector')
 
 # Load environment variables
 load_dotenv()
@@ -12,7 +14,7 @@ def get_snowflake_connection():
     Establish connection with Snowflake using environment variables
     """
     try:
-        conn = snowflake.connector.connect(
+        conn = snowflake_connector.connect(
             user=os.getenv('SNOWFLAKE_USER'),
             password=os.getenv('SNOWFLAKE_PASSWORD'),
             account=os.getenv('SNOWFLAKE_ACCOUNT'),
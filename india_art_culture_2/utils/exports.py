@@ -0,0 +1,123 @@
+import io
+import os
+
+import streamlit as st
+from utils import catalog
+from utils.lazy_imports import lazy_import
+
+# Only imported when a table is exported as Arrow or Parquet
+pa = lazy_import('pyarrow')
+pq = lazy_import('pyarrow.parquet')
+
+# Derived tables users can export, by catalog dataset
+EXPORTS = {
+    'state_analysis': 'Cultural sites, art forms and visitors by state',
+    'tourism_stats': 'Domestic and foreign visitors by state and year',
+    'gender_tourism': 'Foreign tourist arrivals by gender',
+    'geological_sites': 'Geological heritage sites with their classification',
+}
+
+# Format: (label, MIME type, file extension)
+FORMATS = {
+    'parquet': ('Parquet', 'application/vnd.apache.parquet', 'parquet'),
+    'arrow': ('Arrow', 'application/vnd.apache.arrow.stream', 'arrows'),
+    'csv': ('CSV', 'text/csv', 'csv'),
+}
+
+# Rows converted at a time: one Parquet row group, Arrow record batch or CSV block
+EXPORT_CHUNK_ROWS = int(os.getenv('EXPORT_CHUNK_ROWS', '65536'))
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file handing out what was written since the last take()"""
+
+    def __init__(self):
+        self._chunks = []
+        self._written = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self._written += len(data)
+        return len(data)
+
+    def tell(self):
+        # Parquet records offsets in its footer, so count what was taken too
+        return self._written
+
+    def take(self):
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def iter_export(df, fmt, chunk_rows=EXPORT_CHUNK_ROWS):
+    """
+    df encoded as fmt ('parquet', 'arrow' or 'csv'), yielded in pieces of
+    about chunk_rows rows each. Only one chunk is converted at a time, so
+    an export never holds a second copy of the whole table.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown export format '{fmt}', expected one of: {', '.join(FORMATS)}")
+    starts = range(0, max(len(df), 1), chunk_rows)
+    if fmt == 'csv':
+        for start in starts:
+            yield df.iloc[start:start + chunk_rows].to_csv(index=False, header=start == 0).encode()
+        return
+
+    schema = pa.Schema.from_pandas(df, preserve_index=False)
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema) if fmt == 'parquet' else pa.ipc.new_stream(sink, schema)
+    with writer:
+        for start in starts:
+            chunk = pa.Table.from_pandas(df.iloc[start:start + chunk_rows], schema=schema, preserve_index=False)
+            writer.write_table(chunk)
+            yield sink.take()
+    yield sink.take()
+
+
+def export_bytes(df, fmt):
+    """The whole export of df in fmt"""
+    return b''.join(iter_export(df, fmt))
+
+
+def write_export(df, fmt, path):
+    """Stream the export of df in fmt to path; returns the bytes written"""
+    written = 0
+    with open(path, 'wb') as f:
+        for chunk in iter_export(df, fmt):
+            f.write(chunk)
+            written += len(chunk)
+    return written
+
+
+def file_name(name, fmt):
+    return f"{name}.{FORMATS[fmt][2]}"
+
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def _export_file(name, version, fmt, _df):
+    """export_bytes of one version of a catalog dataset"""
+    return export_bytes(_df, fmt)
+
+
+def show_export(name, df, conn=None):
+    """
+    Download buttons for df, the catalog dataset name as loaded on conn,
+    in every export format. A download button needs its file up front,
+    so each file is built the first time the page shows this version of
+    the dataset and reused on later reruns.
+    """
+    version = catalog.snapshot([name], conn)[name]
+    for column, (fmt, (label, mime, _)) in zip(st.columns(len(FORMATS)), FORMATS.items()):
+        with column:
+            st.download_button(
+                f"⬇️ {label}",
+                data=_export_file(name, version, fmt, df),
+                file_name=file_name(name, fmt),
+                mime=mime,
+                key=f"export_{name}_{fmt}",
+                help=EXPORTS.get(name),
+            )
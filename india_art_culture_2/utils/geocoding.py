@@ -0,0 +1,266 @@
+import difflib
+import json
+import os
+import re
+import tempfile
+from functools import lru_cache
+from pathlib import Path
+
+import pandas as pd
+from utils.backends import DATA_DIR
+from utils.upload_manifest import file_hash
+
+GAZETTEER_PATH = DATA_DIR / 'gazetteer' / 'india_places.csv'
+CACHE_PATH = DATA_DIR / 'geocode_cache.json'
+
+# Fuzzy matches less similar than this are treated as no match
+FUZZY_CUTOFF = 0.85
+
+# Longest run of words tried as one place name in free text
+MAX_NGRAM = 4
+
+# Words that never start or end a place name ("near Tiruvakkarai", "Pali Dist.")
+_NOISE_WORDS = {
+    'a', 'along', 'and', 'around', 'at', 'between', 'bearing', 'dist', 'district', 'dt',
+    'in', 'located', 'near', 'of', 'the'
+}
+
+_END = '$'
+
+
+def normalize_place(text):
+    """Lower-case text with punctuation folded to single spaces: "St. Thomas Mount" -> "st thomas mount" """
+    text = str(text).lower().replace('&', ' and ')
+    text = re.sub(r"['’]", '', text)
+    return ' '.join(re.sub(r'[^a-z0-9]+', ' ', text).split())
+
+
+def _state_key(state):
+    # "TAMILNADU" and "Tamil Nadu" are the same state
+    return normalize_place(state).replace(' ', '') if state and pd.notna(state) else ''
+
+
+class PrefixIndex:
+    """Character trie from normalized names to the gazetteer rows carrying them"""
+
+    def __init__(self):
+        self.root = {}
+
+    def add(self, key, value):
+        node = self.root
+        for char in key:
+            node = node.setdefault(char, {})
+        node.setdefault(_END, []).append(value)
+
+    def _node(self, prefix):
+        node = self.root
+        for char in prefix:
+            node = node.get(char)
+            if node is None:
+                return None
+        return node
+
+    def get(self, key):
+        node = self._node(key)
+        return node.get(_END, []) if node else []
+
+    def with_prefix(self, prefix):
+        """(key, rows) for every name starting with prefix"""
+        node = self._node(prefix)
+        if node is None:
+            return []
+        found, stack = [], [(prefix, node)]
+        while stack:
+            key, node = stack.pop()
+            for char, child in node.items():
+                if char == _END:
+                    found.append((key, child))
+                else:
+                    stack.append((key + char, child))
+        return found
+
+
+class Gazetteer:
+    """
+    Offline lookup of Indian places bundled in data/gazetteer. Every name
+    and alternate spelling is indexed normalized; lookups try an exact
+    name, then a unique completion of a prefix, then the closest spelling.
+    """
+
+    def __init__(self, path=GAZETTEER_PATH):
+        self.path = Path(path)
+        self.places = pd.read_csv(self.path, keep_default_na=False)
+        self.version = file_hash(self.path)[:16]
+        self.index = PrefixIndex()
+        for row, place in self.places.iterrows():
+            names = [place['NAME']] + [alt for alt in place['ALT_NAMES'].split('|') if alt]
+            for name in names:
+                self.index.add(normalize_place(name), row)
+        self.keys = [key for key, _ in self.index.with_prefix('')]
+
+    def _in_state(self, rows, state):
+        if not state:
+            return rows
+        return [
+            row for row in rows
+            if difflib.SequenceMatcher(None, _state_key(self.places.at[row, 'STATE']), state).ratio() >= FUZZY_CUTOFF
+        ]
+
+    def _fuzzy(self, key, state, full_scan):
+        """Closest indexed name to key; the trie narrows candidates to names sharing its first letters"""
+        candidates = [name for name, _ in self.index.with_prefix(key[:2])]
+        matches = difflib.get_close_matches(key, candidates, n=3, cutoff=FUZZY_CUTOFF)
+        if not matches and full_scan:
+            matches = difflib.get_close_matches(key, self.keys, n=3, cutoff=FUZZY_CUTOFF)
+        for name in matches:
+            rows = self._in_state(self.index.get(name), state)
+            if rows:
+                return rows[0], difflib.SequenceMatcher(None, key, name).ratio()
+        return None
+
+    def _result(self, row, query, method, score=1.0):
+        place = self.places.loc[row]
+        return {
+            'query': query,
+            'name': place['NAME'],
+            'state': place['STATE'],
+            'lat': float(place['LATITUDE']),
+            'lon': float(place['LONGITUDE']),
+            'method': method,
+            'score': round(float(score), 3)
+        }
+
+    def match(self, name, state=None):
+        """Resolve a place name ("Srirangapana") to its gazetteer entry, or None"""
+        key, state = normalize_place(name), _state_key(state)
+        if not key:
+            return None
+        rows = self._in_state(self.index.get(key), state)
+        if rows:
+            return self._result(rows[0], name, 'exact')
+        if len(key) >= 4:
+            completions = [rows for _, rows in self.index.with_prefix(key)]
+            rows = self._in_state(sorted({row for found in completions for row in found}), state)
+            if len(rows) == 1:
+                return self._result(rows[0], name, 'prefix')
+        found = self._fuzzy(key, state, full_scan=True)
+        return self._result(found[0], name, 'fuzzy', found[1]) if found else None
+
+    def locate(self, text, state=None):
+        """
+        Find the first place named in a free-text description such as
+        "Natural Geological Arch, Tirumala Hills, Chittor Dist.". Comma
+        separated parts are searched in order, longest word runs first, so
+        the locality wins over the district that follows it.
+        """
+        state = _state_key(state)
+        for part in str(text).split(','):
+            words = normalize_place(part).split()
+            ngrams = [
+                ' '.join(words[i:i + size])
+                for size in range(min(MAX_NGRAM, len(words)), 0, -1)
+                for i in range(len(words) - size + 1)
+                if words[i] not in _NOISE_WORDS and words[i + size - 1] not in _NOISE_WORDS
+            ]
+            for ngram in ngrams:
+                rows = self._in_state(self.index.get(ngram), state)
+                if rows:
+                    return self._result(rows[0], ngram, 'exact')
+            for ngram in ngrams:
+                found = len(ngram) >= 5 and self._fuzzy(ngram, state, full_scan=False)
+                if found:
+                    return self._result(found[0], ngram, 'fuzzy', found[1])
+        return None
+
+
+@lru_cache(maxsize=4)
+def _load_gazetteer(path, version):
+    return Gazetteer(path)
+
+
+def get_gazetteer(path=GAZETTEER_PATH):
+    """The gazetteer at path, indexed once per process and content version"""
+    return _load_gazetteer(str(path), file_hash(path))
+
+
+class GeocodeCache:
+    """
+    Resolved places persisted to a local JSON file, keyed by state and
+    text, so each place is looked up once. Entries are dropped when the
+    gazetteer changes; unresolved places are cached too.
+    """
+
+    def __init__(self, gazetteer_version, path=CACHE_PATH):
+        self.path = Path(path)
+        self.gazetteer_version = gazetteer_version
+        self.entries = {}
+        self.dirty = False
+        if self.path.exists():
+            try:
+                with open(self.path, 'r') as f:
+                    saved = json.load(f)
+            except ValueError:
+                # Unreadable (e.g. left truncated by an older version): start over
+                saved = {}
+            if isinstance(saved, dict) and saved.get('gazetteer') == gazetteer_version:
+                self.entries = saved.get('places', {})
+
+    @staticmethod
+    def key(text, state=None, free_text=False):
+        return '|'.join(['text' if free_text else 'name', _state_key(state), normalize_place(text)])
+
+    def get(self, key):
+        return self.entries.get(key)
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def set(self, key, result):
+        self.entries[key] = result
+        self.dirty = True
+
+    def save(self):
+        if not self.dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Written next to the cache and swapped in, so readers never see a partial file
+        fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, prefix=f".{self.path.name}.", suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump({'gazetteer': self.gazetteer_version, 'places': self.entries}, f, indent=2, sort_keys=True)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        self.dirty = False
+
+
+def geocode(df, name_col, state_col=None, free_text=False, gazetteer=None, cache_path=CACHE_PATH):
+    """
+    Return a copy of df with LATITUDE, LONGITUDE and GEOCODED_AS (the
+    gazetteer entry matched) for the place in name_col. free_text searches
+    descriptions for a place name instead of matching the whole value.
+    Rows that cannot be resolved keep missing coordinates.
+    """
+    gazetteer = gazetteer or get_gazetteer()
+    cache = GeocodeCache(gazetteer.version, cache_path)
+    states = df[state_col] if state_col else pd.Series([None] * len(df), index=df.index)
+
+    # Resolve each distinct (name, state) once, then spread the results over the rows
+    pairs = pd.DataFrame({'name': df[name_col].to_numpy(), 'state': states.to_numpy()})
+    unique_pairs = pairs.drop_duplicates()
+    resolved = {}
+    for text, state in zip(unique_pairs['name'], unique_pairs['state']):
+        key = cache.key(text, state, free_text)
+        if key not in cache:
+            lookup = gazetteer.locate if free_text else gazetteer.match
+            cache.set(key, lookup(text, state))
+        resolved[(text, state)] = cache.get(key) or {}
+    cache.save()
+
+    results = [resolved[pair] for pair in zip(pairs['name'], pairs['state'])]
+    located = df.copy()
+    located['LATITUDE'] = pd.array([result.get('lat') for result in results], dtype='float64')
+    located['LONGITUDE'] = pd.array([result.get('lon') for result in results], dtype='float64')
+    located['GEOCODED_AS'] = [result.get('name') for result in results]
+    return located
@@ -0,0 +1,152 @@
+import os
+import threading
+import weakref
+
+import streamlit as st
+from streamlit.runtime import Runtime
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+from utils.backends import is_snowflake
+
+# Limits for every warehouse query, overridable per deployment
+QUERY_TIMEOUT_SECONDS = int(os.getenv('QUERY_TIMEOUT_SECONDS', '120'))
+MAX_RESULT_ROWS = int(os.getenv('MAX_RESULT_ROWS', '1000000'))
+PREVIEW_ROWS = int(os.getenv('PREVIEW_ROWS', '1000'))
+# Estimated credits a session may spend on queries; unset means no budget
+SESSION_CREDIT_BUDGET = float(os.getenv('SESSION_CREDIT_BUDGET', '0')) or None
+
+# Credits per hour of a running warehouse, by size
+CREDITS_PER_HOUR = {
+    'X-SMALL': 1, 'SMALL': 2, 'MEDIUM': 4, 'LARGE': 8, 'X-LARGE': 16,
+    '2X-LARGE': 32, '3X-LARGE': 64, '4X-LARGE': 128, '5X-LARGE': 256, '6X-LARGE': 512,
+}
+DEFAULT_WAREHOUSE_SIZE = os.getenv('WAREHOUSE_SIZE', 'X-SMALL')
+
+_warehouse_sizes = weakref.WeakKeyDictionary()
+_usage = {}
+_lock = threading.Lock()
+
+
+class QueryBudgetExceeded(Exception):
+    """The session has spent its SESSION_CREDIT_BUDGET"""
+
+
+def session_parameters():
+    """Snowflake session parameters every connection is opened with"""
+    return {'STATEMENT_TIMEOUT_IN_SECONDS': QUERY_TIMEOUT_SECONDS}
+
+
+def warehouse_size(conn):
+    """Size of the connection's warehouse, read once per connection; None locally"""
+    if not is_snowflake(conn):
+        return None
+    if conn not in _warehouse_sizes:
+        size = DEFAULT_WAREHOUSE_SIZE
+        try:
+            cursor = conn.cursor()
+        except Exception:
+            # No session free to ask (e.g. a busy pool): estimate with the
+            # default size this time and ask again on the next query
+            return size.upper()
+        try:
+            cursor.execute("SELECT CURRENT_WAREHOUSE()")
+            name = cursor.fetchone()[0]
+            cursor.execute("SHOW WAREHOUSES LIKE %s", (name,))
+            row = cursor.fetchone()
+            if row:
+                columns = [desc[0].lower() for desc in cursor.description]
+                size = row[columns.index('size')]
+        except Exception:
+            # Not allowed to see the warehouse: estimate with the default size
+            pass
+        finally:
+            cursor.close()
+        _warehouse_sizes[conn] = size.upper().replace('XSMALL', 'X-SMALL').replace('XLARGE', 'X-LARGE')
+    return _warehouse_sizes[conn]
+
+
+def estimate_credits(conn, seconds):
+    """
+    Credits a query running for seconds accounts for on conn's warehouse.
+    An estimate: warehouses bill uptime, shared by concurrent queries.
+    """
+    size = warehouse_size(conn)
+    if size is None:
+        return 0.0
+    return CREDITS_PER_HOUR.get(size, CREDITS_PER_HOUR[DEFAULT_WAREHOUSE_SIZE.upper()]) * seconds / 3600
+
+
+def _session_id():
+    ctx = get_script_run_ctx(suppress_warning=True)
+    return ctx.session_id if ctx else None
+
+
+def session_usage(session_id=None):
+    """Queries, warehouse seconds and estimated credits of a session (default: the current one)"""
+    with _lock:
+        usage = _usage.get(session_id or _session_id(), {})
+        return {'queries': 0, 'seconds': 0.0, 'credits': 0.0, **usage}
+
+
+def check_budget():
+    """
+    Raise QueryBudgetExceeded when the current session has used up its
+    credit budget. Only dashboard sessions have one: queries outside
+    Streamlit (the API, scripts) all share one usage entry, which would
+    otherwise count a whole process's spend against a single budget.
+    """
+    session_id = _session_id()
+    if SESSION_CREDIT_BUDGET is None or session_id is None:
+        return
+    spent = session_usage(session_id)['credits']
+    if spent >= SESSION_CREDIT_BUDGET:
+        raise QueryBudgetExceeded(
+            f"Session used {spent:.4f} of its {SESSION_CREDIT_BUDGET:g} credit budget"
+        )
+
+
+def _prune_ended_sessions():
+    """Forget the usage of sessions that have ended; called with _lock held"""
+    if not Runtime.exists():
+        return
+    runtime = Runtime.instance()
+    for session_id in [session_id for session_id in _usage if session_id is not None]:
+        if not runtime.is_active_session(session_id):
+            del _usage[session_id]
+
+
+def charge(conn, seconds):
+    """Record a finished query against the current session. Never raises."""
+    try:
+        credits = estimate_credits(conn, seconds)
+    except Exception:
+        # Accounting must not fail the query it accounts for
+        credits = 0.0
+    session_id = _session_id()
+    with _lock:
+        if session_id not in _usage:
+            # A new session: a good time to drop the ones that have gone
+            _prune_ended_sessions()
+        usage = _usage.setdefault(session_id, {'queries': 0, 'seconds': 0.0, 'credits': 0.0})
+        usage['queries'] += 1
+        usage['seconds'] += seconds
+        usage['credits'] += credits
+    return credits
+
+
+def show_session_usage():
+    """Sidebar line with this session's warehouse usage"""
+    usage = session_usage()
+    if not usage['queries']:
+        return
+    budget = f" of {SESSION_CREDIT_BUDGET:g}" if SESSION_CREDIT_BUDGET else ""
+    st.sidebar.caption(
+        f"🧾 This session: {usage['queries']} queries, {usage['seconds']:.1f}s, "
+        f"~{usage['credits']:.4f}{budget} credits"
+    )
+
+
+def show_preview(df, limit=PREVIEW_ROWS, **kwargs):
+    """st.dataframe of at most limit rows, noting how many were left out"""
+    st.dataframe(df.head(limit), **kwargs)
+    if len(df) > limit:
+        st.caption(f"Showing the first {limit:,} of {len(df):,} rows")
@@ -0,0 +1,119 @@
+import re
+
+import orjson
+import pandas as pd
+
+ENCODINGS = ['utf-8', 'cp1252', 'latin1']
+
+# Thousands separators, currency prefixes and stray whitespace around numbers
+_NUMBER_NOISE = re.compile(r'[,\s]|^Rs\.?|^₹')
+
+
+class ParseSpec:
+    """
+    How to turn one published file into a typed DataFrame.
+
+    skiprows / header are passed to read_csv for files with banner rows
+    above the real header. record_pattern is for files whose line breaks
+    were lost: every match of the regex becomes one row, with columns
+    named by the first line's header fields. extract maps a new column to
+    (source column, regex); the first group is parsed as a number.
+    units records the unit of numeric columns in df.attrs['units'], and
+    scale multiplies columns into those units. dtypes forces column types.
+    """
+
+    def __init__(self, skiprows=None, header=0, encoding=None, record_pattern=None,
+                 extract=None, units=None, scale=None, dtypes=None, drop_empty=True):
+        self.skiprows = skiprows
+        self.header = header
+        self.encoding = encoding
+        self.record_pattern = record_pattern
+        self.extract = extract or {}
+        self.units = units or {}
+        self.scale = scale or {}
+        self.dtypes = dtypes or {}
+        self.drop_empty = drop_empty
+
+
+def _read_csv(file_path, spec):
+    encodings = [spec.encoding] if spec.encoding else ENCODINGS
+    for encoding in encodings:
+        try:
+            return pd.read_csv(file_path, encoding=encoding, skiprows=spec.skiprows, header=spec.header)
+        except UnicodeDecodeError:
+            continue
+    raise ValueError(f"Could not decode {file_path} as any of: {', '.join(encodings)}")
+
+
+def _read_records(file_path, spec):
+    """Rebuild a table whose rows were run together on a single line"""
+    with open(file_path, 'r', encoding=spec.encoding or 'utf-8') as f:
+        text = f.read()
+    pattern = re.compile(spec.record_pattern)
+    columns = [field.strip() for field in text.split(',')[:pattern.groups]]
+    # The last header field is fused with the first record ("Amount2021-22")
+    columns[-1] = re.sub(r'[\d\-.]+$', '', columns[-1])
+    return pd.DataFrame(pattern.findall(text), columns=columns)
+
+
+def read_json_records(file_path):
+    """Read a JSON array of records (a Spark/Excel export) into a DataFrame"""
+    with open(file_path, 'rb') as f:
+        return pd.DataFrame(orjson.loads(f.read()))
+
+
+def parse_number(series):
+    """Parse numbers written with thousands separators or a currency prefix"""
+    cleaned = series.astype(str).str.strip().str.replace(_NUMBER_NOISE, '', regex=True)
+    return pd.to_numeric(cleaned.replace({'': None, 'nan': None, '-': None}), errors='coerce')
+
+
+def coerce_numeric(df):
+    """
+    Convert every text column whose values are all numbers. Whole numbers
+    get the smallest integer type that holds them; everything else becomes
+    float64, since float32 would garble amounts like 6028.48 on display.
+    """
+    for col in df.columns:
+        if df[col].dtype.kind in 'iu':
+            df[col] = pd.to_numeric(df[col], downcast='integer')
+            continue
+        if df[col].dtype.kind == 'f':
+            # Read as float only because of the empty rows dropped since
+            if df[col].notna().all() and df[col].mod(1).eq(0).all():
+                df[col] = pd.to_numeric(df[col], downcast='integer')
+            continue
+        if df[col].dtype != object:
+            continue
+        values = parse_number(df[col])
+        if values.notna().sum() == df[col].notna().sum() and values.notna().any():
+            if not values.isna().any() and values.mod(1).eq(0).all():
+                df[col] = pd.to_numeric(values, downcast='integer')
+            else:
+                df[col] = values.astype('float64')
+    return df
+
+
+def read_table(file_path, spec=None):
+    """
+    Read a published CSV into a typed DataFrame following spec:
+    banner rows skipped, empty rows and columns dropped, numbers extracted
+    and every numeric column stored as a compact int or float
+    """
+    spec = spec or ParseSpec()
+    df = _read_records(file_path, spec) if spec.record_pattern else _read_csv(file_path, spec)
+
+    if spec.drop_empty:
+        df = df.dropna(how='all').dropna(axis=1, how='all').reset_index(drop=True)
+    df.columns = [str(col).strip() for col in df.columns]
+
+    for column, (source, pattern) in spec.extract.items():
+        df[column] = parse_number(df[source].astype(str).str.extract(pattern, expand=False))
+
+    df = coerce_numeric(df)
+    for column, factor in spec.scale.items():
+        df[column] = df[column] * factor
+    for column, dtype in spec.dtypes.items():
+        df[column] = df[column].astype(dtype)
+    df.attrs['units'] = dict(spec.units)
+    return df
@@ -0,0 +1,290 @@
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+
+import pandas as pd
+import streamlit as st
+from utils.lazy_imports import import_times
+
+# Process-wide record store, shared by every Streamlit session
+MAX_RECORDS = 5000
+_records = deque(maxlen=MAX_RECORDS)
+_lock = threading.Lock()
+_current = ContextVar('current_span', default=None)
+
+
+class Span:
+    """One timed data access, page render or figure, recorded on finish()"""
+
+    def __init__(self, kind, name, query=None, detached=False):
+        parent = _current.get()
+        self.record = {
+            'kind': kind,
+            'name': name,
+            'query': query,
+            'rows': None,
+            'bytes': None,
+            'query_id': None,
+            'cache': None,
+            'parent': parent.record['name'] if parent else None,
+            'error': None,
+            'started_at': time.time(),
+            'wall_ms': None
+        }
+        self._start = time.perf_counter()
+        # Detached spans overlap others (e.g. async queries), so they never become the parent
+        self._token = None if detached else _current.set(self)
+        self._finished = False
+
+    def annotate(self, **fields):
+        self.record.update(fields)
+
+    def finish(self, error=None):
+        if self._finished:
+            return
+        self._finished = True
+        self.record['wall_ms'] = (time.perf_counter() - self._start) * 1000
+        if error is not None:
+            self.record['error'] = f"{type(error).__name__}: {error}"
+        try:
+            if self._token is not None:
+                _current.reset(self._token)
+        except ValueError:
+            # finish() called from a different context than the one that started it
+            _current.set(None)
+        with _lock:
+            _records.append(self.record)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.finish(exc)
+        return False
+
+
+def track(kind, name, query=None, detached=False):
+    """
+    Start timing a data access, page render or figure.
+
+    Use as a context manager, or call finish() explicitly where the
+    measured work outlives the block that starts it (e.g. an AsyncQuery,
+    finished when its result is read):
+
+        with track('query', 'execute_query', query=query) as span:
+            ...
+            span.annotate(rows=len(df))
+
+    detached spans are not the parent of spans started after them.
+    """
+    return Span(kind, name, query, detached)
+
+
+def annotate(**fields):
+    """Attach fields (rows, bytes, query_id, cache...) to the innermost open span"""
+    span = _current.get()
+    if span is not None:
+        span.annotate(**fields)
+
+
+def result_stats(result):
+    """Row and byte counts for a DataFrame or nested dict/list of DataFrames"""
+    if isinstance(result, pd.DataFrame):
+        return {'rows': len(result), 'bytes': int(result.memory_usage(deep=True).sum())}
+    if isinstance(result, dict):
+        result = list(result.values())
+    if isinstance(result, (list, tuple)):
+        rows, nbytes, found = 0, 0, False
+        for item in result:
+            stats = result_stats(item)
+            if stats['rows'] is not None:
+                rows += stats['rows']
+                nbytes += stats['bytes']
+                found = True
+        if found:
+            return {'rows': rows, 'bytes': nbytes}
+    return {'rows': None, 'bytes': None}
+
+
+def instrumented(kind, name=None, cache=None):
+    """
+    Decorator recording every call of a loader.
+
+    Pass the Streamlit cache decorator as cache (instead of stacking it)
+    so hits and misses can be told apart: the span starts as a hit and the
+    wrapped body marks it a miss when it actually runs.
+    """
+    def decorator(func):
+        target = func
+        if cache is not None:
+            @functools.wraps(func)
+            def body(*args, **kwargs):
+                annotate(cache='miss')
+                return func(*args, **kwargs)
+            target = cache(body)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            query = args[0] if args and isinstance(args[0], str) else kwargs.get('query')
+            with track(kind, name or func.__name__, query=query) as span:
+                if cache is not None:
+                    span.annotate(cache='hit')
+                result = target(*args, **kwargs)
+                stats = result_stats(result)
+                span.annotate(**{k: v for k, v in stats.items() if span.record[k] is None})
+            return result
+
+        if cache is not None:
+            wrapper.clear = target.clear
+        return wrapper
+    return decorator
+
+
+def _trace_points(trace):
+    for attr in ['x', 'values', 'locations', 'lat', 'y']:
+        values = getattr(trace, attr, None)
+        if values is not None:
+            return len(values)
+    return 0
+
+
+def plotly_chart(fig, **kwargs):
+    """st.plotly_chart, recording serialization and send time per figure"""
+    title = fig.layout.title.text or 'untitled'
+    with track('figure', title) as span:
+        span.annotate(rows=sum(_trace_points(trace) for trace in fig.data))
+        return st.plotly_chart(fig, **kwargs)
+
+
+def records():
+    """Snapshot of the recorded spans as a DataFrame"""
+    with _lock:
+        data = list(_records)
+    return pd.DataFrame(data, columns=[
+        'kind', 'name', 'query', 'rows', 'bytes', 'query_id', 'cache',
+        'parent', 'error', 'started_at', 'wall_ms'
+    ])
+
+
+def reset():
+    with _lock:
+        _records.clear()
+
+
+def summary():
+    """Per (kind, name, query) call counts, latency percentiles, volumes and cache hits"""
+    df = records()
+    if df.empty:
+        return pd.DataFrame(columns=[
+            'kind', 'name', 'query', 'calls', 'total_ms', 'p50_ms', 'p95_ms', 'max_ms',
+            'rows', 'bytes', 'cache_hits', 'cache_misses', 'errors'
+        ])
+    df['hit'] = df['cache'] == 'hit'
+    df['miss'] = df['cache'] == 'miss'
+    df['failed'] = df['error'].notna()
+    df['query'] = df['query'].fillna('')
+    grouped = df.groupby(['kind', 'name', 'query'])
+    return grouped.agg(
+        calls=('wall_ms', 'size'),
+        total_ms=('wall_ms', 'sum'),
+        p50_ms=('wall_ms', 'median'),
+        p95_ms=('wall_ms', lambda s: s.quantile(0.95)),
+        max_ms=('wall_ms', 'max'),
+        rows=('rows', 'sum'),
+        bytes=('bytes', 'sum'),
+        cache_hits=('hit', 'sum'),
+        cache_misses=('miss', 'sum'),
+        errors=('failed', 'sum')
+    ).reset_index().sort_values('total_ms', ascending=False)
+
+
+def export_json():
+    return json.dumps({
+        'summary': summary().to_dict('records'),
+        'records': records().to_dict('records')
+    }, default=str, indent=2)
+
+
+def _label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', ' ')
+
+
+def export_prometheus():
+    """Summary metrics in the Prometheus text exposition format"""
+    metrics = [
+        ('app_span_calls_total', 'counter', 'Recorded calls', 'calls', 1),
+        ('app_span_duration_seconds_total', 'counter', 'Total wall time', 'total_ms', 1 / 1000),
+        ('app_span_duration_seconds_p95', 'gauge', '95th percentile wall time', 'p95_ms', 1 / 1000),
+        ('app_span_rows_total', 'counter', 'Rows returned or plotted', 'rows', 1),
+        ('app_span_bytes_total', 'counter', 'In-memory bytes returned', 'bytes', 1),
+        ('app_cache_hits_total', 'counter', 'Streamlit cache hits', 'cache_hits', 1),
+        ('app_cache_misses_total', 'counter', 'Streamlit cache misses', 'cache_misses', 1),
+        ('app_span_errors_total', 'counter', 'Calls that raised', 'errors', 1)
+    ]
+    stats = summary()
+    lines = []
+    for metric, metric_type, help_text, column, factor in metrics:
+        lines.append(f"# HELP {metric} {help_text}")
+        lines.append(f"# TYPE {metric} {metric_type}")
+        for _, row in stats.iterrows():
+            value = row[column] * factor
+            labels = f'kind="{_label(row["kind"])}",name="{_label(row["name"])}"'
+            if row['query']:
+                labels += f',query="{_label(row["query"])}"'
+            lines.append(f'{metric}{{{labels}}} {value:g}')
+    return '\n'.join(lines) + '\n'
+
+
+def performance_page_enabled():
+    """The Performance page is hidden unless ?perf=1 or SHOW_PERFORMANCE_PAGE is set"""
+    return st.query_params.get('perf') == '1' or bool(os.getenv('SHOW_PERFORMANCE_PAGE'))
+
+
+def show_performance_page(datasets=None):
+    st.header("⏱️ Performance")
+    st.caption(f"Timings recorded by this server process (last {MAX_RECORDS} spans, all sessions).")
+
+    stats = summary()
+    if stats.empty:
+        st.info("No timings recorded yet.")
+        return
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Recorded Spans", int(stats['calls'].sum()))
+    with col2:
+        lookups = stats['cache_hits'].sum() + stats['cache_misses'].sum()
+        st.metric("Cache Hit Rate", f"{stats['cache_hits'].sum() / lookups * 100:.0f}%" if lookups else "n/a")
+    with col3:
+        slowest = stats.iloc[0]
+        st.metric("Slowest (total)", f"{slowest['name']}", f"{slowest['total_ms']:,.0f} ms", delta_color="off")
+
+    for kind in ['page', 'dataset', 'query', 'figure']:
+        kind_stats = stats[stats['kind'] == kind]
+        if not kind_stats.empty:
+            st.subheader(kind.title() + "s")
+            st.dataframe(kind_stats.drop(columns='kind'), hide_index=True)
+
+    if import_times:
+        st.subheader("Deferred Imports")
+        st.dataframe(pd.DataFrame(
+            [(name, seconds * 1000) for name, seconds in import_times.items()],
+            columns=['module', 'import_ms']
+        ), hide_index=True)
+
+    st.subheader("Recent Spans")
+    st.dataframe(records().sort_values('started_at', ascending=False).head(200), hide_index=True)
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.download_button("Download JSON", export_json(), "performance.json", "application/json")
+    with col2:
+        st.download_button("Download Prometheus", export_prometheus(), "performance.prom", "text/plain")
+    with col3:
+        if st.button("Reset Timings"):
+            reset()
+            st.rerun()
@@ -0,0 +1,63 @@
+import importlib
+import sys
+import threading
+import time
+
+# Import cost (seconds) of each module resolved through lazy_import,
+# for the import-time report and the Performance page
+import_times = {}
+_lock = threading.Lock()
+
+
+class LazyModule:
+    """
+    Stand-in for a heavy optional dependency that is only imported the
+    first time one of its attributes is used.
+    """
+
+    def __init__(self, name):
+        self.__dict__['_name'] = name
+        self.__dict__['_module'] = None
+
+    def _load(self):
+        module = self.__dict__['_module']
+        if module is None:
+            with _lock:
+                module = self.__dict__['_module']
+                if module is None:
+                    name = self.__dict__['_name']
+                    already_loaded = name in sys.modules
+                    start = time.perf_counter()
+                    module = importlib.import_module(name)
+                    if not already_loaded:
+                        import_times[name] = time.perf_counter() - start
+                    self.__dict__['_module'] = module
+        return module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __setattr__(self, attr, value):
+        setattr(self._load(), attr, value)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self):
+        state = 'loaded' if self.__dict__['_module'] is not None else 'not loaded'
+        return f"<lazy module '{self.__dict__['_name']}' ({state})>"
+
+
+def lazy_import(name):
+    """
+    Return a module proxy for name that defers the actual import until first use:
+
+        folium = lazy_import('folium')
+        snowflake_connector = lazy_import('snowflake.connector')
+
+    Modules that are already imported are returned directly.
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    return LazyModule(name)
+
@@ -0,0 +1,91 @@
+import numpy as np
+import pandas as pd
+
+# Periods averaged by ROLLING_MEAN
+ROLLING_WINDOW = 3
+
+
+class GrowthMetrics:
+    """
+    Growth of every metric of a table, per group (e.g. state) and period.
+
+    series holds one row per METRIC, GROUP and TIME with VALUE, PREV_TIME
+    (the previous period with data), YOY_PCT (change since PREV_TIME),
+    ROLLING_MEAN, RANK (by value among the groups that period) and
+    YOY_RANK. summary holds one row per METRIC and GROUP with the first
+    and last period and CAGR_PCT between them. Both are computed once;
+    by_metric and by_period are ready-made slices for pages to read.
+    """
+
+    def __init__(self, series, summary):
+        self.series = series
+        self.summary = summary
+        self.metrics = list(series['METRIC'].unique())
+        self.periods = sorted(series['TIME'].unique())
+        self.by_metric = {metric: frame for metric, frame in series.groupby('METRIC', sort=False)}
+        self.by_period = {
+            key: frame.set_index('GROUP')
+            for key, frame in series.groupby(['METRIC', 'TIME'], sort=False)
+        }
+
+    def period(self, metric, time):
+        """Every group's row for one metric and period, indexed by GROUP"""
+        return self.by_period.get((metric, time), self.series.iloc[:0].set_index('GROUP'))
+
+    def top_growth(self, metric, time, n=5):
+        """The n groups with the highest YOY_PCT in time"""
+        return self.period(metric, time)['YOY_PCT'].dropna().nlargest(n)
+
+    def latest_yoy(self, metric, group='All'):
+        """YOY_PCT of the last period with data for one series"""
+        frame = self.by_metric[metric]
+        values = frame.loc[frame['GROUP'] == group, 'YOY_PCT']
+        return values.iloc[-1] if len(values) else np.nan
+
+
+def _periods_between(first, last, steps):
+    """Years between first and last when the periods are numbers, otherwise the number of steps"""
+    if pd.api.types.is_numeric_dtype(first) and pd.api.types.is_numeric_dtype(last):
+        return (last - first).astype('float64')
+    return steps.astype('float64')
+
+
+def compute_growth(df, time_col, value_cols, group_col=None, window=ROLLING_WINDOW):
+    """
+    Year-over-year change, rolling mean, rankings and CAGR of value_cols
+    over time_col, per group_col (or for the table as a whole), in one
+    grouped pass. Values sharing a group and period are summed first.
+    """
+    ids = [time_col] + ([group_col] if group_col else [])
+    long = df.melt(id_vars=ids, value_vars=value_cols, var_name='METRIC', value_name='VALUE')
+    long = long.rename(columns={time_col: 'TIME', **({group_col: 'GROUP'} if group_col else {})})
+    if not group_col:
+        long['GROUP'] = 'All'
+    long['VALUE'] = pd.to_numeric(long['VALUE'], errors='coerce').astype('float64')
+
+    series = (
+        long.groupby(['METRIC', 'GROUP', 'TIME'], sort=True)['VALUE']
+        .sum(min_count=1)
+        .reset_index()
+    )
+    by_series = series.groupby(['METRIC', 'GROUP'], sort=False)
+    series['PREV_TIME'] = by_series['TIME'].shift()
+    series['YOY_PCT'] = (by_series['VALUE'].pct_change(fill_method=None) * 100).replace([np.inf, -np.inf], np.nan)
+    series['ROLLING_MEAN'] = (
+        by_series['VALUE'].rolling(window, min_periods=1).mean().reset_index(level=[0, 1], drop=True)
+    )
+    by_period = series.groupby(['METRIC', 'TIME'], sort=False)
+    series['RANK'] = by_period['VALUE'].rank(ascending=False, method='min')
+    series['YOY_RANK'] = by_period['YOY_PCT'].rank(ascending=False, method='min')
+
+    observed = series.dropna(subset=['VALUE']).groupby(['METRIC', 'GROUP'], sort=False)
+    summary = observed.agg(
+        FIRST_TIME=('TIME', 'first'), LAST_TIME=('TIME', 'last'),
+        FIRST_VALUE=('VALUE', 'first'), LAST_VALUE=('VALUE', 'last'),
+        STEPS=('TIME', 'size')
+    ).reset_index()
+    periods = _periods_between(summary['FIRST_TIME'], summary['LAST_TIME'], summary['STEPS'] - 1)
+    valid = (periods > 0) & (summary['FIRST_VALUE'] > 0) & (summary['LAST_VALUE'] >= 0)
+    ratio = summary['LAST_VALUE'].where(valid) / summary['FIRST_VALUE'].where(valid)
+    summary['CAGR_PCT'] = (ratio ** (1 / periods.where(valid)) - 1) * 100
+    return GrowthMetrics(series, summary.drop(columns='STEPS'))
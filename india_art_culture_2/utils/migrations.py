@@ -0,0 +1,183 @@
+import hashlib
+import importlib.util
+import re
+import time
+from pathlib import Path
+
+from utils.backends import is_snowflake
+from utils.clustering import apply_physical_design
+
+MIGRATIONS_DIR = Path(__file__).parent.parent / 'migrations'
+HISTORY_TABLE = 'SCHEMA_HISTORY'
+
+# Migrations run in a zero-copy clone of the live schema, which is then
+# swapped in. The schema it replaced is kept under this suffix to roll back to.
+CLONE_SUFFIX = '_MIGRATING'
+PREVIOUS_SUFFIX = '_PREVIOUS'
+
+# V001__dashboard_tables.sql, V002__tourism_stats_table.py
+_FILENAME = re.compile(r'^V(\d+)__(\w+)\.(sql|py)$')
+
+
+class MigrationError(Exception):
+    """The migration history and the files in migrations/ disagree"""
+
+
+class Migration:
+    """
+    One versioned schema change: a .sql file of statements, or a .py file
+    whose migrate(cursor) runs when the change depends on what exists.
+    """
+
+    def __init__(self, path):
+        match = _FILENAME.match(path.name)
+        if not match:
+            raise MigrationError(f"{path.name} is not named V<version>__<description>.sql or .py")
+        self.path = path
+        self.version = int(match.group(1))
+        self.description = match.group(2).replace('_', ' ')
+        self.kind = match.group(3)
+        # Line endings are normalized so a checkout on Windows has the same checksum
+        self.checksum = hashlib.sha256(path.read_bytes().replace(b'\r\n', b'\n')).hexdigest()
+
+    def run(self, cursor):
+        if self.kind == 'sql':
+            for statement in split_statements(self.path.read_text()):
+                cursor.execute(statement)
+            return
+        spec = importlib.util.spec_from_file_location(f"migration_v{self.version}", self.path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        module.migrate(cursor)
+
+
+def split_statements(sql):
+    """Statements of a SQL script, without comments. Migrations keep semicolons out of string literals."""
+    lines = [line.split('--', 1)[0] for line in sql.splitlines()]
+    return [statement.strip() for statement in '\n'.join(lines).split(';') if statement.strip()]
+
+
+def discover(directory=MIGRATIONS_DIR):
+    """Every migration in directory, in version order"""
+    migrations = [Migration(path) for path in sorted(Path(directory).iterdir()) if not path.name.startswith(('.', '_'))]
+    versions = [migration.version for migration in migrations]
+    duplicates = sorted({version for version in versions if versions.count(version) > 1})
+    if duplicates:
+        raise MigrationError(f"Duplicate migration versions: {', '.join(map(str, duplicates))}")
+    return sorted(migrations, key=lambda migration: migration.version)
+
+
+def ensure_history(cursor):
+    cursor.execute(f"""
+    CREATE TABLE IF NOT EXISTS {HISTORY_TABLE} (
+        VERSION INTEGER,
+        DESCRIPTION VARCHAR(200),
+        SCRIPT VARCHAR(200),
+        CHECKSUM VARCHAR(64),
+        EXECUTION_MS INTEGER,
+        APPLIED_AT TIMESTAMP_NTZ DEFAULT CURRENT_TIMESTAMP()
+    )
+    """)
+
+
+def applied_versions(cursor):
+    """{version: checksum} of every migration recorded in the history table"""
+    ensure_history(cursor)
+    cursor.execute(f"SELECT VERSION, CHECKSUM FROM {HISTORY_TABLE} ORDER BY VERSION")
+    return {int(version): checksum for version, checksum in cursor.fetchall()}
+
+
+def pending(migrations, applied):
+    """
+    Migrations not applied yet. Raises MigrationError when an applied file
+    was edited or removed, or a new file sorts before an applied one:
+    released migrations are never changed, a new one is added instead.
+    """
+    by_version = {migration.version: migration for migration in migrations}
+    for version, checksum in applied.items():
+        if version not in by_version:
+            raise MigrationError(f"Applied migration V{version:03d} is missing from {MIGRATIONS_DIR.name}/")
+        if by_version[version].checksum != checksum:
+            raise MigrationError(f"{by_version[version].path.name} was changed after it was applied")
+    todo = [migration for migration in migrations if migration.version not in applied]
+    if todo and applied and todo[0].version < max(applied):
+        raise MigrationError(f"{todo[0].path.name} is older than the latest applied migration")
+    return todo
+
+
+def _apply(cursor, migrations):
+    for migration in migrations:
+        start = time.perf_counter()
+        migration.run(cursor)
+        elapsed_ms = int((time.perf_counter() - start) * 1000)
+        cursor.execute(
+            f"INSERT INTO {HISTORY_TABLE} (VERSION, DESCRIPTION, SCRIPT, CHECKSUM, EXECUTION_MS) "
+            "VALUES (%s, %s, %s, %s, %s)",
+            (migration.version, migration.description, migration.path.name, migration.checksum, elapsed_ms)
+        )
+
+
+def _current_schema(cursor):
+    cursor.execute("SELECT CURRENT_SCHEMA()")
+    return cursor.fetchone()[0]
+
+
+def migrate(conn, directory=MIGRATIONS_DIR):
+    """
+    Apply pending migrations and return them.
+
+    On Snowflake they run in a zero-copy clone of the current schema,
+    which replaces the live schema with one atomic ALTER SCHEMA ... SWAP:
+    no table is reloaded, and the dashboards keep reading the old schema
+    until the swap. Rows written to the live schema while migrating are
+    not carried over, so run this between uploads. The schema it replaced
+    is kept as <schema>_PREVIOUS for rollback(). Locally, pending
+    migrations run in one DuckDB transaction instead.
+    """
+    migrations = discover(directory)
+    cursor = conn.cursor()
+    try:
+        todo = pending(migrations, applied_versions(cursor))
+        if not todo:
+            return []
+        if not is_snowflake(conn):
+            cursor.execute("BEGIN TRANSACTION")
+            try:
+                _apply(cursor, todo)
+                cursor.execute("COMMIT")
+            except Exception:
+                cursor.execute("ROLLBACK")
+                raise
+            return todo
+
+        live = _current_schema(cursor)
+        clone, previous = f"{live}{CLONE_SUFFIX}", f"{live}{PREVIOUS_SUFFIX}"
+        cursor.execute(f"CREATE OR REPLACE SCHEMA {clone} CLONE {live}")
+        try:
+            cursor.execute(f"USE SCHEMA {clone}")
+            _apply(cursor, todo)
+            # Tables a migration recreated lose their clustering keys
+            apply_physical_design(conn)
+            cursor.execute(f"ALTER SCHEMA {live} SWAP WITH {clone}")
+        except Exception:
+            cursor.execute(f"USE SCHEMA {live}")
+            cursor.execute(f"DROP SCHEMA IF EXISTS {clone}")
+            raise
+        cursor.execute(f"USE SCHEMA {live}")
+        cursor.execute(f"DROP SCHEMA IF EXISTS {previous}")
+        cursor.execute(f"ALTER SCHEMA {clone} RENAME TO {previous}")
+        return todo
+    finally:
+        cursor.close()
+
+
+def rollback(conn):
+    """Swap the schema replaced by the last migrate() back in (Snowflake only)"""
+    if not is_snowflake(conn):
+        raise MigrationError("Rollback needs the schema kept by a Snowflake migration")
+    cursor = conn.cursor()
+    try:
+        live = _current_schema(cursor)
+        cursor.execute(f"ALTER SCHEMA {live} SWAP WITH {live}{PREVIOUS_SUFFIX}")
+    finally:
+        cursor.close()
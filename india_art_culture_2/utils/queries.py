@@ -0,0 +1,234 @@
+import json
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+import pandas as pd
+import streamlit as st
+from utils import governor
+from utils.backends import is_snowflake
+from utils.instrumentation import annotate, result_stats, track
+
+# Every session is tagged with the app, and every query names what it reads
+# in a trailing comment, so warehouse time can be attributed in QUERY_HISTORY
+APP_NAME = 'india_art_culture'
+
+# String literals and quoted identifiers, which normalization leaves alone
+_QUOTED = re.compile(r"('(?:[^']|'')*'|\"(?:[^\"]|\"\")*\")")
+_COMMENT = re.compile(r'--[^\n]*')
+_COMMA = re.compile(r'\s*,\s*')
+_INSIDE_PARENS = re.compile(r'(?<=\()\s+|\s+(?=\))')
+
+# The local backend has no async queries; they run on these threads instead
+_local_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='local-query')
+
+# How often unfinished async queries are polled, in seconds
+POLL_INTERVAL = 0.1
+
+
+def normalize_sql(query):
+    """
+    Canonical text of a query, so equivalent queries share cache entries
+    locally and in Snowflake's result cache: comments dropped, whitespace
+    collapsed and everything outside quotes upper-cased (unquoted
+    identifiers are case-insensitive). Bound parameters (%s) are kept.
+    """
+    parts = _QUOTED.split(query)
+    for i in range(0, len(parts), 2):
+        text = re.sub(r'\s+', ' ', _COMMENT.sub(' ', parts[i]))
+        text = _INSIDE_PARENS.sub('', _COMMA.sub(', ', text))
+        parts[i] = text.upper().replace('%S', '%s')
+    return ''.join(parts).strip().rstrip(';').rstrip()
+
+
+def query_tag(source=None):
+    """QUERY_TAG value, or the comment of a query reading source"""
+    return json.dumps({'app': APP_NAME, **({'source': source} if source else {})}, separators=(',', ':'))
+
+
+def session_parameters():
+    """Session parameters for new Snowflake connections: the app's QUERY_TAG and the governor's timeout"""
+    return {'QUERY_TAG': query_tag(), **governor.session_parameters()}
+
+
+def _tagged(conn, query, source):
+    """
+    query as sent to Snowflake: followed by a comment naming its source,
+    which QUERY_HISTORY keeps in QUERY_TEXT. The session's QUERY_TAG stays
+    the app's, so switching sources costs no ALTER SESSION round trip, and
+    the text (and Snowflake's result cache) is still the same on every call.
+    """
+    if not is_snowflake(conn):
+        return query
+    return f"{query} /* {query_tag(source).replace('*/', '* /')} */"
+
+
+def _frame(cursor):
+    return pd.DataFrame(cursor.fetchall(), columns=[desc[0] for desc in cursor.description])
+
+
+def run_query(conn, query, params=None, name=None):
+    """
+    Run query with bound params and return the result as a DataFrame.
+    Table names are bound as IDENTIFIER(%s) rather than formatted into
+    the text, so the text is identical on every call.
+    """
+    query = normalize_sql(query)
+    governor.check_budget()
+    with track('query', name or 'run_query', query=query) as span:
+        cursor = conn.cursor()
+        start = time.perf_counter()
+        try:
+            cursor.execute(_tagged(conn, query, name), tuple(params) if params is not None else None,
+                           timeout=governor.QUERY_TIMEOUT_SECONDS)
+            df = _frame(cursor)
+            span.annotate(query_id=getattr(cursor, 'sfqid', None), **result_stats(df))
+            return df
+        finally:
+            # Closed first: a pooled cursor's connection is back in the pool
+            # before charge() may need one
+            cursor.close()
+            governor.charge(conn, time.perf_counter() - start)
+
+
+@st.cache_data(show_spinner=False, max_entries=256)
+def _cached_query(query, params, version, name, _conn):
+    annotate(cache='miss')
+    return run_query(_conn, query, params, name)
+
+
+def cached_query(conn, query, params=None, name=None, version=None):
+    """
+    run_query, cached by normalized text, parameters and version: a
+    reformatted copy of a query hits the entry of the original. Pass the
+    version of the data read (e.g. a catalog snapshot) to invalidate.
+    """
+    with track('dataset', name or 'cached_query') as span:
+        span.annotate(cache='hit')
+        return _cached_query(normalize_sql(query), tuple(params or ()), version, name, conn)
+
+
+class QueryCancelled(Exception):
+    """An AsyncQuery was cancelled before its result was read"""
+
+
+class AsyncQuery:
+    """
+    A query submitted without waiting for its result. Snowflake runs it
+    with execute_async and reports progress through get_query_status;
+    the local backend runs it on a worker thread. Either way it stops
+    after the governor's timeout, or when cancel() is called.
+    """
+
+    def __init__(self, conn, query, params=None, name=None):
+        self.name = name
+        self.query = normalize_sql(query)
+        self.query_id = None
+        self._conn = conn
+        self._future = None
+        self._result = None
+        self._error = None
+        self._closed = False
+        self._cancelled = False
+        params = tuple(params) if params is not None else None
+        governor.check_budget()
+        self._start = time.perf_counter()
+        # Timed from submission to result; overlaps the page's other work
+        self._span = track('query', name or 'run_query', query=self.query, detached=True)
+        self._cursor = conn.cursor()
+        try:
+            if is_snowflake(conn):
+                # Bounded by the session's STATEMENT_TIMEOUT_IN_SECONDS
+                self._cursor.execute_async(_tagged(conn, self.query, name), params)
+                self.query_id = self._cursor.sfqid
+                # The query runs on without its session: hand a pooled
+                # connection back while it does
+                self._cursor.close()
+                self._cursor = None
+            else:
+                self._future = _local_executor.submit(self._run_local, params)
+        except Exception as e:
+            self._close(e)
+            raise
+
+    def _run_local(self, params):
+        if self._cancelled:
+            raise QueryCancelled(f"{self.name or 'query'} was cancelled")
+        self._cursor.execute(self.query, params, timeout=governor.QUERY_TIMEOUT_SECONDS)
+        return _frame(self._cursor)
+
+    def done(self):
+        if self._closed:
+            return True
+        if self._future is not None:
+            return self._future.done()
+        return not self._conn.is_still_running(self._conn.get_query_status(self.query_id))
+
+    def result(self):
+        """The result as a DataFrame, waiting for it if needed. Raises the query's error."""
+        if self._error is not None:
+            raise self._error
+        if self._result is not None:
+            return self._result
+        try:
+            if self._future is not None:
+                df = self._future.result()
+            else:
+                self._conn.get_query_status_throw_if_error(self.query_id)
+                self._cursor = self._conn.cursor()
+                self._cursor.get_results_from_sfqid(self.query_id)
+                df = _frame(self._cursor)
+        except Exception as e:
+            self._error = e
+            self._close(e)
+            raise
+        self._span.annotate(query_id=self.query_id, **result_stats(df))
+        self._result = df
+        self._close()
+        return df
+
+    def cancel(self):
+        """Stop the query if it is still running, e.g. when the user leaves the page"""
+        if self._closed:
+            return
+        try:
+            if self._future is not None:
+                self._cancelled = True
+                # An interrupt sent just before the query starts is lost, so repeat
+                # it until the worker is done, before its cursor is closed
+                while not self._future.cancel() and not wait([self._future], timeout=0.05).done:
+                    self._cursor.interrupt()
+            else:
+                cursor = self._conn.cursor()
+                try:
+                    cursor.execute("SELECT SYSTEM$CANCEL_QUERY(%s)", (self.query_id,))
+                finally:
+                    cursor.close()
+        finally:
+            self._error = QueryCancelled(f"{self.name or 'query'} was cancelled")
+            self._close(self._error)
+
+    def _close(self, error=None):
+        self._closed = True
+        self._span.finish(error)
+        if self._cursor is not None:
+            self._cursor.close()
+            self._cursor = None
+        governor.charge(self._conn, time.perf_counter() - self._start)
+
+
+def submit_query(conn, query, params=None, name=None):
+    """Start query on conn and return its AsyncQuery without waiting"""
+    return AsyncQuery(conn, query, params, name)
+
+
+def as_completed(queries, poll_interval=POLL_INTERVAL):
+    """Yield each AsyncQuery as soon as it finishes, polling the ones still running"""
+    pending = list(queries)
+    while pending:
+        finished = [query for query in pending if query.done()]
+        for query in finished:
+            pending.remove(query)
+            yield query
+        if pending and not finished:
+            time.sleep(poll_interval)
@@ -0,0 +1,201 @@
+import pandas as pd
+from utils.ingest import parse_number
+from utils.metrics import compute_growth
+
+NUMERIC_KINDS = 'iuf'
+
+
+class TableSchema:
+    """
+    Semantic role and typed column layout of one published table.
+
+    columns maps the canonical column names used by the dashboards to the
+    column names in the source file (and the table uploaded from it);
+    only these columns are kept, in this order. dtypes gives the type of
+    each canonical column (str when omitted). For state-wise visitor
+    tables, years maps each year to its {metric: canonical column}.
+    """
+
+    def __init__(self, role, title, columns, dtypes=None, years=None):
+        self.role = role
+        self.title = title
+        self.columns = columns
+        self.dtypes = dtypes or {}
+        self.years = years
+
+
+def _visitor_years(years, metrics):
+    """{year: {metric: 'Metric year'}} for the canonical visitor columns"""
+    return {year: {metric: f"{metric} {year}" for metric in metrics} for year in years}
+
+
+# Rajya Sabha session answers by catalog dataset name
+SCHEMAS = {
+    'rs_session_246_au_2259': TableSchema(
+        'scholarships', "Scholarships to young artists (RS 246, AU 2259)",
+        {
+            'Batch Year': 'Batch Year',
+            'Persons Selected': 'No. of Persons selected',
+            'Scholarship Amount': 'Amount of Scholarship',
+            'Monthly Scholarship': 'Monthly Scholarship'
+        },
+        {'Persons Selected': 'int32', 'Monthly Scholarship': 'int32'}
+    ),
+    'rs_session_248_au_1232': TableSchema(
+        'artisans', "Artisans identified by State/UT (RS 248, AU 1232)",
+        {'State': 'States/UTs', 'Artisans': 'Total No. of artisans Identified'},
+        {'Artisans': 'int64'}
+    ),
+    'rs_session_255_au_1292': TableSchema(
+        'funding', "Funds allocated and released (RS 255, AU 1292)",
+        {
+            'Year': 'Year',
+            'Funds Allocated': 'Funds Allocated',
+            'Funds Released/Spent': 'Funds Released/Spent'
+        },
+        {'Funds Allocated': 'float64', 'Funds Released/Spent': 'float64'}
+    ),
+    'rs_session_262_au_497': TableSchema(
+        'yearly_amounts', "Amount by year, 2021-22 to 2025-26 (RS 262, AU 497)",
+        {'Year': 'Year', 'Amount': 'Amount'},
+        {'Amount': 'float64'}
+    ),
+    'rs_session_259_au_1898': TableSchema(
+        'state_visitors', "Domestic and foreign visits by State/UT, 2019-2021 (RS 259, AU 1898)",
+        {'State': 'State/ UT', **{
+            f"{metric} {year}": f"{year} - {metric}"
+            for year in [2019, 2020, 2021] for metric in ['Domestic', 'Foreign']
+        }},
+        {f"{metric} {year}": 'int64' for year in [2019, 2020, 2021] for metric in ['Domestic', 'Foreign']},
+        _visitor_years([2019, 2020, 2021], ['Domestic', 'Foreign'])
+    ),
+    'rs_session_251_au308': TableSchema(
+        'state_visitors', "Domestic and foreign visits by State, 2016-2018 (RS 251, AU 308)",
+        {'State': 'States', **{
+            f"{metric} {year}": f"{year}{' (Revised)' if year == 2018 else ''} - {code}"
+            for year in [2016, 2017, 2018] for metric, code in [('Domestic', 'DTV'), ('Foreign', 'FTV')]
+        }},
+        {f"{metric} {year}": 'int64' for year in [2016, 2017, 2018] for metric in ['Domestic', 'Foreign']},
+        _visitor_years([2016, 2017, 2018], ['Domestic', 'Foreign'])
+    ),
+    'rs_session_251_au1434': TableSchema(
+        'state_visitors', "Domestic visits by State/UT, 2014-2018 (RS 251, AU 1434)",
+        {'State': 'States/UTs', **{
+            f"Domestic {year}": f"{year}{' (Revised)' if year == 2018 else ''}"
+            for year in [2014, 2015, 2016, 2017, 2018]
+        }},
+        {f"Domestic {year}": 'int64' for year in [2014, 2015, 2016, 2017, 2018]},
+        _visitor_years([2014, 2015, 2016, 2017, 2018], ['Domestic'])
+    ),
+    'rs_session_238_au1380': TableSchema(
+        'geological_sites', "Geological heritage sites (RS 238, AU 1380)",
+        {'State': 'State', 'Site': 'Geological heritage site /National geological monument'}
+    ),
+    'session_244_au1787': TableSchema(
+        'monuments', "Centrally protected monuments by State/UT (Session 244, AU 1787)",
+        {'State': 'Name of State/UT', 'Monuments': 'Nos. of Monuments'},
+        {'Monuments': 'int32'}
+    ),
+}
+
+
+def _drop_total_rows(df):
+    """Drop the 'Total' summary rows the published tables end with"""
+    text = df.select_dtypes(exclude='number')
+    if text.empty:
+        return df
+    is_total = text.apply(lambda col: col.astype(str).str.strip().str.lower() == 'total').any(axis=1)
+    return df[~is_total]
+
+
+def _typed(series, dtype):
+    if dtype == 'str':
+        return series.astype(str).str.strip()
+    # Already numeric when read through utils.ingest; tables may hold text
+    values = series if series.dtype.kind in NUMERIC_KINDS else parse_number(series)
+    if pd.api.types.is_integer_dtype(dtype) and values.isna().any():
+        # Keep missing values instead of failing the cast
+        return values.astype(dtype.capitalize())
+    return values.astype(dtype)
+
+
+class TypedTable:
+    """One table with its schema applied: canonical, typed columns and its role"""
+
+    def __init__(self, name, schema, frame):
+        self.name = name
+        self.schema = schema
+        self.role = schema.role
+        self.title = schema.title
+        self.frame = frame
+        self.state_column = 'State' if 'State' in frame.columns else None
+        self.measures = [col for col in frame.columns if frame[col].dtype.kind in NUMERIC_KINDS]
+        self.trend = self._year_totals() if schema.years else None
+        self.growth = self._growth()
+        self._derived = {}
+
+    def derive(self, column, func):
+        """
+        A frame with column added as func(frame), computed once per table.
+        The typed frame is shared between sessions, so derived columns are
+        kept in frames of their own instead of being written into it.
+        """
+        if column not in self._derived:
+            self._derived[column] = self.frame.assign(**{column: func(self.frame)})
+        return self._derived[column]
+
+    def _growth(self):
+        """Growth metrics of the yearly series: the national trend, or the table itself when it is by year"""
+        series = self.trend if self.trend is not None else self.frame
+        if 'Year' not in series.columns or len(series) < 2:
+            return None
+        measures = [col for col in series.columns if col != 'Year' and series[col].dtype.kind in NUMERIC_KINDS]
+        return compute_growth(series, 'Year', measures) if measures else None
+
+    def _year_totals(self):
+        """National totals per year and metric, one row per year"""
+        totals = self.frame[self.measures].sum()
+        rows = [
+            {'Year': year, **{metric: totals[column] for metric, column in metrics.items()}}
+            for year, metrics in self.schema.years.items()
+        ]
+        return pd.DataFrame(rows)
+
+
+def apply_schema(name, df):
+    """
+    Return df as a TypedTable using the schema registered for name.
+    Raises KeyError when name has no schema or df lacks one of its columns.
+    """
+    schema = SCHEMAS[name]
+    # Uploaded tables keep the file's headers, but trailing spaces vary
+    source_columns = {str(col).strip(): col for col in df.columns}
+    missing = [source for source in schema.columns.values() if source not in source_columns]
+    if missing:
+        raise KeyError(f"{name} is missing columns: {', '.join(missing)}")
+
+    df = _drop_total_rows(df)
+    frame = pd.DataFrame({
+        canonical: _typed(df[source_columns[source]], schema.dtypes.get(canonical, 'str'))
+        for canonical, source in schema.columns.items()
+    }).reset_index(drop=True)
+    return TypedTable(name, schema, frame)
+
+
+def index_by_role(frames):
+    """
+    Apply the registered schemas to {name: DataFrame} and group the results
+    by role. Returns ({role: [TypedTable, ...]}, {name: error}) so pages can
+    look tables up by role instead of inspecting their columns.
+    """
+    roles, errors = {}, {}
+    for name, df in frames.items():
+        if name not in SCHEMAS:
+            continue
+        try:
+            table = apply_schema(name, df)
+        except (KeyError, ValueError, TypeError) as e:
+            errors[name] = str(e)
+            continue
+        roles.setdefault(table.role, []).append(table)
+    return roles, errors
@@ -0,0 +1,214 @@
+import os
+import queue
+import threading
+from concurrent.futures import Future
+from contextlib import contextmanager
+
+from utils import governor
+from utils.backends import is_snowflake
+
+# Snowflake connections shared by every session of one dashboard process,
+# and how long a query waits for one of them before giving up
+POOL_SIZE = int(os.getenv('POOL_SIZE', '8'))
+POOL_TIMEOUT_SECONDS = float(os.getenv('POOL_TIMEOUT_SECONDS', '30'))
+
+
+class PoolExhausted(Exception):
+    """No pooled connection became free within POOL_TIMEOUT_SECONDS"""
+
+
+class ConnectionPool:
+    """
+    Up to size connections opened with connect, each checked out by one
+    caller at a time. The first one is opened right away, so a bad
+    configuration fails where the pool is created; the rest are opened
+    as concurrent callers need them. Closed connections are replaced.
+    """
+
+    def __init__(self, connect, size=POOL_SIZE, timeout=POOL_TIMEOUT_SECONDS):
+        self._connect = connect
+        self.size = size
+        self.timeout = timeout
+        self._idle = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self.first = connect()
+        self._idle.put(self.first)
+        self.opened = 1
+
+    def _acquire(self):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            grow = self.opened < self.size
+            if grow:
+                self.opened += 1
+        if grow:
+            try:
+                return self._connect()
+            except Exception:
+                with self._lock:
+                    self.opened -= 1
+                raise
+        try:
+            return self._idle.get(timeout=self.timeout)
+        except queue.Empty:
+            raise PoolExhausted(f"All {self.size} connections busy for {self.timeout:g}s") from None
+
+    def _release(self, conn):
+        closed = getattr(conn, 'is_closed', None)
+        if closed is not None and closed():
+            with self._lock:
+                self.opened -= 1
+        else:
+            self._idle.put(conn)
+
+    @contextmanager
+    def connection(self):
+        """Check out a connection for the duration of the block"""
+        conn = self._acquire()
+        try:
+            yield conn
+        finally:
+            self._release(conn)
+
+    def close(self):
+        """Close the idle connections"""
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+class PooledCursor:
+    """A cursor on a checked-out connection, which goes back to the pool when the cursor is closed"""
+
+    def __init__(self, pool):
+        self._checkout = pool.connection()
+        self.connection = self._checkout.__enter__()
+        try:
+            self._cursor = self.connection.cursor()
+        except BaseException:
+            self._checkout.__exit__(None, None, None)
+            raise
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def close(self):
+        if self._checkout is None:
+            return
+        try:
+            self._cursor.close()
+        finally:
+            checkout, self._checkout = self._checkout, None
+            checkout.__exit__(None, None, None)
+
+
+class PooledConnection:
+    """
+    A ConnectionPool behind the connection interface the catalog and
+    queries use, so one can be cached with st.cache_resource and shared
+    by every session: each cursor() runs on a connection of its own.
+    """
+
+    def __init__(self, pool):
+        self.pool = pool
+        self.backend = getattr(pool.first, 'backend', None)
+        # Read while the pool is idle, so charging a query never needs a
+        # second connection while its own is still checked out
+        governor.warehouse_size(self)
+
+    def cursor(self):
+        return PooledCursor(self.pool)
+
+    # Query monitoring is per account, not per session, so any connection will do
+    def get_query_status(self, query_id):
+        with self.pool.connection() as conn:
+            return conn.get_query_status(query_id)
+
+    def get_query_status_throw_if_error(self, query_id):
+        with self.pool.connection() as conn:
+            return conn.get_query_status_throw_if_error(query_id)
+
+    def is_still_running(self, status):
+        return self.pool.first.is_still_running(status)
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        # Shared by every session; the pool outlives any one of them
+        pass
+
+
+def pooled_connection(connect, size=POOL_SIZE):
+    """
+    A connection for a dashboard to cache and share across sessions:
+    a PooledConnection for Snowflake, whose connections must not run
+    concurrent cursors, or the connection itself locally, where every
+    cursor is already an independent DuckDB connection
+    """
+    pool = ConnectionPool(connect, size)
+    if not is_snowflake(pool.first):
+        return pool.first
+    return PooledConnection(pool)
+
+
+@contextmanager
+def dedicated(conn):
+    """
+    A connection for one caller's exclusive use, e.g. for write_pandas
+    during an upload: one checked out of conn's pool, or conn itself
+    """
+    if isinstance(conn, PooledConnection):
+        with conn.pool.connection() as checked_out:
+            yield checked_out
+    else:
+        yield conn
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent work by key: while a call for a key is running,
+    other callers with the same key wait for it and share its result (or
+    its exception) instead of repeating it. Nothing is kept afterwards.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def begin(self, key):
+        """(future, leader): the leader must finish(key, ...); everyone else waits on the future"""
+        with self._lock:
+            if key in self._calls:
+                return self._calls[key], False
+            future = self._calls[key] = Future()
+            return future, True
+
+    def finish(self, key, result=None, error=None):
+        with self._lock:
+            future = self._calls.pop(key)
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def do(self, key, fn, *args):
+        """fn(*args), run once for every concurrent caller with key"""
+        future, leader = self.begin(key)
+        if not leader:
+            return future.result()
+        try:
+            result = fn(*args)
+        except Exception as e:
+            self.finish(key, error=e)
+            raise
+        self.finish(key, result)
+        return result
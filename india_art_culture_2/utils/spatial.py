@@ -0,0 +1,131 @@
+import numpy as np
+import pandas as pd
+
+EARTH_RADIUS_KM = 6371.0088
+
+# Half the Earth's circumference: no two points are further apart
+MAX_DISTANCE_KM = np.pi * EARTH_RADIUS_KM
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """Great-circle distance in km between points given in degrees; broadcasts like numpy"""
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(v, dtype='float64')) for v in (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0, 1)))
+
+
+class SpatialIndex:
+    """
+    Grid index over the latitude/longitude columns of a frame.
+
+    Points are bucketed into cell_degrees cells and stored sorted by cell,
+    so a query only measures the points in the cells its search radius can
+    reach instead of scanning the whole frame. Rows without coordinates are
+    left out. Results are rows of the frame with a DISTANCE_KM column,
+    nearest first.
+    """
+
+    def __init__(self, frame, lat_col, lon_col, cell_degrees=1.0):
+        located = frame.dropna(subset=[lat_col, lon_col])
+        self.frame = located.reset_index(drop=True)
+        self.lat_col = lat_col
+        self.lon_col = lon_col
+        self.cell_degrees = cell_degrees
+        self.n_rows = int(np.ceil(180 / cell_degrees))
+        self.n_cols = int(np.ceil(360 / cell_degrees))
+
+        self.lat = self.frame[lat_col].to_numpy(dtype='float64')
+        self.lon = self.frame[lon_col].to_numpy(dtype='float64')
+        rows, cols = self._cell(self.lat, self.lon)
+        keys = rows * self.n_cols + cols
+
+        # Points sorted by cell; each occupied cell is a contiguous run
+        self.order = np.argsort(keys, kind='stable')
+        cells, self.starts, self.counts = np.unique(keys[self.order], return_index=True, return_counts=True)
+        self.cell_rows, self.cell_cols = np.divmod(cells, self.n_cols)
+
+    def __len__(self):
+        return len(self.frame)
+
+    def _cell(self, lat, lon):
+        rows = np.clip(np.floor((lat + 90) / self.cell_degrees), 0, self.n_rows - 1).astype('int64')
+        cols = np.floor((lon + 180) / self.cell_degrees).astype('int64') % self.n_cols
+        return rows, cols
+
+    def _candidates(self, lat, lon, radius_km):
+        """Positions of the points in every cell a circle of radius_km around lat/lon can touch"""
+        dlat = np.degrees(radius_km / EARTH_RADIUS_KM)
+        row_lo, _ = self._cell(np.float64(lat - dlat), np.float64(lon))
+        row_hi, _ = self._cell(np.float64(lat + dlat), np.float64(lon))
+        in_rows = (self.cell_rows >= row_lo) & (self.cell_rows <= row_hi)
+
+        if abs(lat) + dlat >= 90 or radius_km >= MAX_DISTANCE_KM / 2:
+            # The circle covers a pole or half the globe: every longitude
+            selected = in_rows
+        else:
+            dlon = np.degrees(np.arcsin(min(1.0, np.sin(radius_km / EARTH_RADIUS_KM) / np.cos(np.radians(lat)))))
+            _, col_lo = self._cell(np.float64(lat), np.float64(lon - dlon))
+            width = int(np.floor(2 * dlon / self.cell_degrees)) + 2
+            in_cols = (self.cell_cols - col_lo) % self.n_cols < width
+            selected = in_rows & in_cols
+
+        starts, counts = self.starts[selected], self.counts[selected]
+        if not counts.sum():
+            return np.empty(0, dtype='int64')
+        # Concatenate the selected runs without a Python loop
+        offsets = np.repeat(starts - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
+        return self.order[offsets]
+
+    def _result(self, positions, distances):
+        ranked = np.argsort(distances, kind='stable')
+        result = self.frame.iloc[positions[ranked]].copy()
+        result['DISTANCE_KM'] = distances[ranked]
+        return result
+
+    def within(self, lat, lon, radius_km):
+        """Rows within radius_km of lat/lon, nearest first"""
+        positions = self._candidates(lat, lon, radius_km)
+        distances = haversine_km(lat, lon, self.lat[positions], self.lon[positions])
+        keep = distances <= radius_km
+        return self._result(positions[keep], distances[keep])
+
+    def _nearest(self, lat, lon, n, max_km):
+        """Positions and distances of the n nearest points, nearest first"""
+        limit = MAX_DISTANCE_KM if max_km is None else max_km
+        radius = min(limit, self.cell_degrees * 111.2)
+        while True:
+            # Everything within radius has been seen, so the n nearest of those are exact
+            positions = self._candidates(lat, lon, radius)
+            distances = haversine_km(lat, lon, self.lat[positions], self.lon[positions])
+            keep = distances <= radius
+            if keep.sum() >= n or radius >= limit:
+                positions, distances = positions[keep], distances[keep]
+                ranked = np.argsort(distances, kind='stable')[:n]
+                return positions[ranked], distances[ranked]
+            radius = min(limit, radius * 2)
+
+    def nearest(self, lat, lon, n=5, max_km=None):
+        """
+        The n rows nearest to lat/lon (fewer if the index is smaller or
+        max_km is reached), nearest first
+        """
+        return self._result(*self._nearest(lat, lon, n, max_km))
+
+    def join_nearest(self, points, lat_col, lon_col, max_km=None, suffix='_NEAREST'):
+        """
+        Left-join every row of points to its nearest indexed row. Columns of
+        the indexed frame get suffix; DISTANCE_KM is NaN for points without
+        coordinates or without a match within max_km.
+        """
+        matches = np.full(len(points), -1, dtype='int64')
+        distances = np.full(len(points), np.nan)
+        for i, (lat, lon) in enumerate(zip(points[lat_col], points[lon_col])):
+            if pd.isna(lat) or pd.isna(lon):
+                continue
+            positions, found = self._nearest(lat, lon, 1, max_km)
+            if len(positions):
+                matches[i], distances[i] = positions[0], found[0]
+
+        joined = self.frame.reindex(matches).reset_index(drop=True).add_suffix(suffix)
+        joined['DISTANCE_KM'] = distances
+        return pd.concat([points.reset_index(drop=True), joined], axis=1)
@@ -0,0 +1,204 @@
+import re
+
+import pandas as pd
+from utils.backends import write_pandas
+from utils.queries import cached_query
+from utils.schemas import index_by_role
+
+# Session answers the star schema is built from, in order of precedence:
+# when two answers report the same state, year and visitor type, the
+# first one listed wins
+SOURCES = [
+    'rs_session_259_au_1898',
+    'rs_session_251_au308',
+    'rs_session_251_au1434',
+    'rs_session_248_au_1232',
+    'rs_session_255_au_1292',
+    'session_244_au1787',
+    'rs_session_238_au1380',
+]
+
+DIMENSIONS = ['DIM_STATE', 'DIM_YEAR']
+FACTS = ['FACT_VISITS', 'FACT_ARTISANS', 'FACT_FUNDING', 'FACT_MONUMENTS']
+TABLES = DIMENSIONS + FACTS
+
+# Spellings that normalize differently but name the same state
+STATE_ALIASES = {
+    'aandnisland': 'andamanandnicobarislands',
+    'nctdelhi': 'delhi',
+    'telengana': 'telangana',
+    'chattisgarh': 'chhattisgarh',
+}
+
+# Every cross-dataset state question is one join on STATE_ID
+STATE_PROFILE_QUERY = """
+SELECT s.STATE, v.DOMESTIC_VISITS, v.FOREIGN_VISITS, a.ARTISANS, m.MONUMENTS
+FROM DIM_STATE s
+LEFT JOIN (
+    SELECT STATE_ID,
+           SUM(CASE WHEN VISITOR_TYPE = 'Domestic' THEN VISITS END) AS DOMESTIC_VISITS,
+           SUM(CASE WHEN VISITOR_TYPE = 'Foreign' THEN VISITS END) AS FOREIGN_VISITS
+    FROM FACT_VISITS
+    WHERE YEAR = %s
+    GROUP BY STATE_ID
+) v ON v.STATE_ID = s.STATE_ID
+LEFT JOIN FACT_ARTISANS a ON a.STATE_ID = s.STATE_ID
+LEFT JOIN FACT_MONUMENTS m ON m.STATE_ID = s.STATE_ID
+WHERE COALESCE(v.DOMESTIC_VISITS, v.FOREIGN_VISITS, a.ARTISANS, m.MONUMENTS) IS NOT NULL
+ORDER BY s.STATE
+"""
+
+
+def clean_state(name):
+    """Display spelling of a state: "Daman & Diu (UT)" -> "Daman and Diu", "TAMILNADU" -> "Tamilnadu" """
+    name = re.sub(r'\(.*?\)|\*', '', str(name)).replace('&', ' and ')
+    name = ' '.join(name.split())
+    return name.title() if name.isupper() else name
+
+
+def state_key(name):
+    """Key shared by every spelling of a state: "Jammu & Kashmir" -> "jammuandkashmir" """
+    key = re.sub(r'[^a-z]', '', clean_state(name).lower())
+    return STATE_ALIASES.get(key, key)
+
+
+def fiscal_start_year(year):
+    """Calendar year a period starts in: 2019 -> 2019, "2019-20" -> 2019"""
+    return int(str(year).strip()[:4])
+
+
+def _dim_state(tables):
+    states = [table.frame['State'] for table in tables if table.state_column]
+    spellings = (pd.concat(states, ignore_index=True) if states else pd.Series(dtype=object)).map(clean_state)
+    keyed = pd.DataFrame({'KEY': spellings.map(state_key), 'STATE': spellings})
+    # The most common spelling names the state; ties go to the first seen
+    counts = keyed.groupby(['KEY', 'STATE'], sort=False).size().reset_index(name='N')
+    names = counts.sort_values('N', ascending=False, kind='stable').drop_duplicates('KEY')
+    dim = names.sort_values('STATE')[['KEY', 'STATE']].reset_index(drop=True)
+    dim.insert(0, 'STATE_ID', range(1, len(dim) + 1))
+    return dim
+
+
+def _dim_year(years):
+    years = [int(year) for year in years]
+    dim = pd.DataFrame({'YEAR': range(min(years), max(years) + 1) if years else []}, dtype='int16')
+    dim['FISCAL_YEAR'] = dim['YEAR'].map(lambda year: f"{year}-{(year + 1) % 100:02d}")
+    return dim
+
+
+def _concat(frames, columns):
+    """frames stacked, or an empty table with columns when a role has no tables"""
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=columns)
+
+
+def _with_state_id(frame, dim_state):
+    ids = dict(zip(dim_state['KEY'], dim_state['STATE_ID']))
+    return frame['State'].map(state_key).map(ids).astype('int32')
+
+
+def build_star_schema(frames):
+    """
+    Conformed dimensions and narrow fact tables from the session answers
+    in {name: DataFrame}, as {table name: DataFrame}:
+
+    DIM_STATE      STATE_ID, KEY, STATE
+    DIM_YEAR       YEAR, FISCAL_YEAR (the April-March year starting in YEAR)
+    FACT_VISITS    STATE_ID, YEAR, VISITOR_TYPE, VISITS, SOURCE
+    FACT_ARTISANS  STATE_ID, ARTISANS, SOURCE
+    FACT_FUNDING   YEAR, FUNDS_ALLOCATED, FUNDS_RELEASED (Rs crore), SOURCE
+    FACT_MONUMENTS STATE_ID, MONUMENTS, SOURCE
+
+    SOURCE names the table each fact was taken from.
+    """
+    roles, _ = index_by_role({name: frames[name] for name in SOURCES if name in frames})
+    tables = sorted(
+        (table for group in roles.values() for table in group),
+        key=lambda table: SOURCES.index(table.name)
+    )
+    dim_state = _dim_state(tables)
+
+    visits = []
+    for table in roles.get('state_visitors', []):
+        long = table.frame.melt(id_vars='State', value_vars=table.measures, value_name='VISITS')
+        parts = long['variable'].str.split(' ', n=1, expand=True)
+        visits.append(pd.DataFrame({
+            'STATE_ID': _with_state_id(long, dim_state),
+            'YEAR': parts[1].astype('int16'),
+            'VISITOR_TYPE': parts[0],
+            'VISITS': long['VISITS'].astype('Int64'),
+            'SOURCE': table.name.upper()
+        }))
+    fact_visits = (
+        _concat(visits, ['STATE_ID', 'YEAR', 'VISITOR_TYPE', 'VISITS', 'SOURCE'])
+        .drop_duplicates(['STATE_ID', 'YEAR', 'VISITOR_TYPE'])
+        .sort_values(['YEAR', 'STATE_ID', 'VISITOR_TYPE'], ignore_index=True)
+    )
+
+    def per_state(role, column):
+        return _concat([
+            pd.DataFrame({
+                'STATE_ID': _with_state_id(table.frame, dim_state),
+                column.upper(): table.frame[column],
+                'SOURCE': table.name.upper()
+            })
+            for table in roles.get(role, [])
+        ], ['STATE_ID', column.upper(), 'SOURCE']).drop_duplicates('STATE_ID')
+
+    funding = [
+        pd.DataFrame({
+            'YEAR': table.frame['Year'].map(fiscal_start_year).astype('int16'),
+            'FUNDS_ALLOCATED': table.frame['Funds Allocated'],
+            'FUNDS_RELEASED': table.frame['Funds Released/Spent'],
+            'SOURCE': table.name.upper()
+        })
+        for table in roles.get('funding', [])
+    ]
+    fact_funding = _concat(funding, ['YEAR', 'FUNDS_ALLOCATED', 'FUNDS_RELEASED', 'SOURCE']).drop_duplicates('YEAR')
+
+    return {
+        'DIM_STATE': dim_state,
+        'DIM_YEAR': _dim_year(fact_visits['YEAR'].tolist() + fact_funding['YEAR'].tolist()),
+        'FACT_VISITS': fact_visits,
+        'FACT_ARTISANS': per_state('artisans', 'Artisans'),
+        'FACT_FUNDING': fact_funding,
+        'FACT_MONUMENTS': per_state('monuments', 'Monuments'),
+    }
+
+
+def state_profile(star, year):
+    """STATE_PROFILE_QUERY computed on the star schema's frames, for the local fallback"""
+    visits = star['FACT_VISITS'][star['FACT_VISITS']['YEAR'] == year].pivot_table(
+        index='STATE_ID', columns='VISITOR_TYPE', values='VISITS', aggfunc='sum'
+    ).rename(columns={'Domestic': 'DOMESTIC_VISITS', 'Foreign': 'FOREIGN_VISITS'})
+    profile = (
+        star['DIM_STATE'].set_index('STATE_ID')[['STATE']]
+        .join(visits.reindex(columns=['DOMESTIC_VISITS', 'FOREIGN_VISITS']))
+        .join(star['FACT_ARTISANS'].set_index('STATE_ID')['ARTISANS'])
+        .join(star['FACT_MONUMENTS'].set_index('STATE_ID')['MONUMENTS'])
+    )
+    measures = ['DOMESTIC_VISITS', 'FOREIGN_VISITS', 'ARTISANS', 'MONUMENTS']
+    return profile.dropna(subset=measures, how='all').sort_values('STATE').reset_index(drop=True)
+
+
+def query_state_profile(conn, year, version=None):
+    """
+    Run STATE_PROFILE_QUERY for year on the published star schema, cached
+    per version of its tables (e.g. their catalog snapshot)
+    """
+    return cached_query(conn, STATE_PROFILE_QUERY, (int(year),), name='STATE_PROFILE', version=version)
+
+
+def publish_star_schema(conn, frames):
+    """Rebuild every star schema table from the session answers in {name: DataFrame}"""
+    star = build_star_schema(frames)
+    for table, df in star.items():
+        write_pandas(conn, df, table, overwrite=True, auto_create_table=True)
+    return {table: len(df) for table, df in star.items()}
+
+
+def star_table(table):
+    """Normalizer for a catalog dataset serving one star schema table from the SOURCES frames"""
+    def normalize(*frames):
+        return build_star_schema(dict(zip(SOURCES, frames)))[table]
+    normalize.__name__ = f"star_{table.lower()}"
+    return normalize
@@ -0,0 +1,171 @@
+import re
+
+import pandas as pd
+
+
+def reshape_tourism_stats(df1, df2):
+    """
+    Combine the 2019-2021 and 2016-2018 state visitor tables into one long
+    table with STATE, DOMESTIC_VISITORS, FOREIGN_VISITORS, YEAR and MONTH
+    """
+    df1 = df1[df1['Sl. No.'] != 'Total']  # Remove total row
+
+    # Process first dataset
+    years_1 = ['2019', '2020', '2021']
+    processed_data = []
+
+    for year in years_1:
+        year_data = df1[['State/ UT', f'{year} - Domestic', f'{year} - Foreign']].copy()
+        year_data.columns = ['STATE', 'DOMESTIC_VISITORS', 'FOREIGN_VISITORS']
+        year_data['YEAR'] = int(year)
+        processed_data.append(year_data)
+
+    # Process second dataset
+    years_2 = ['2016', '2017', '2018']
+    for year in years_2:
+        col_suffix = ' (Revised)' if year == '2018' else ''
+        year_data = df2[['States', f'{year}{col_suffix} - DTV', f'{year}{col_suffix} - FTV']].copy()
+        year_data.columns = ['STATE', 'DOMESTIC_VISITORS', 'FOREIGN_VISITORS']
+        year_data['YEAR'] = int(year)
+        processed_data.append(year_data)
+
+    # Combine all data
+    combined_data = pd.concat(processed_data, ignore_index=True)
+    combined_data['STATE'] = combined_data['STATE'].str.strip()
+
+    # Add month column (since we don't have monthly data, we'll set it to 1)
+    combined_data['MONTH'] = 1
+    return combined_data
+
+
+STATE_NAME_MAPPING = {
+    'N.C.T. Delhi': 'Delhi',
+    'Daman & Diu (UT)': 'Daman and Diu',
+    'Puducherry (U.T.)': 'Puducherry',
+    'Jammu & Kashmir': 'Jammu and Kashmir'
+}
+
+
+def normalize_monuments(df):
+    """
+    Turn the protected monuments per state table (session 244, AU 1787)
+    into SL_NO, STATE, MONUMENTS with the state names used elsewhere
+    """
+    monuments = df[df['Sl.No'] != 'Total'].copy()  # Remove total row
+    monuments.columns = ['SL_NO', 'STATE', 'MONUMENTS']
+    monuments['STATE'] = monuments['STATE'].replace(STATE_NAME_MAPPING)
+    return monuments
+
+
+def normalize_gender_tourism(df):
+    """
+    Name the foreign tourist arrivals by gender table (2019 Table 2.6.1)
+    and add head counts computed from the percentages
+    """
+    df = df.copy()
+    df.columns = ['YEAR', 'TOTAL_ARRIVALS', 'MALE_PCT', 'FEMALE_PCT', 'NOT_REPORTED_PCT']
+    for col in ['MALE_PCT', 'FEMALE_PCT', 'NOT_REPORTED_PCT']:
+        df[col.replace('_PCT', '_COUNT')] = (df['TOTAL_ARRIVALS'] * df[col] / 100).round().astype(int)
+    return df
+
+
+FESTIVAL_COLUMNS = {
+    'Sr. no.': 'SR_NO',
+    'Year': 'YEAR',
+    'Period of FoI': 'PERIOD',
+    'Amount Released_Rs._': 'AMOUNT_RELEASED',
+    'latt': 'LAT',
+    'long': 'LON'
+}
+
+# A UTF-8 byte order mark, as is or read back as Latin-1 ("ï»¿")
+_BOM = re.compile('^(\ufeff|\u00ef\u00bb\u00bf)')
+
+
+def normalize_festivals(df):
+    """
+    Turn the Festival of India export into SR_NO, YEAR, PERIOD,
+    AMOUNT_RELEASED (Rs) and float32 LAT/LON. Works on the raw export and
+    on tables already normalized, whose columns are kept as they are.
+    """
+    festivals = df.dropna(axis=1, how='all').copy()  # _c8/_c9 are always empty
+    festivals.columns = [_BOM.sub('', str(col)).strip() for col in festivals.columns]
+    festivals = festivals.rename(columns=FESTIVAL_COLUMNS)
+    festivals = festivals[[col for col in FESTIVAL_COLUMNS.values() if col in festivals.columns]]
+
+    for col in ['SR_NO', 'YEAR']:
+        if col in festivals.columns:
+            festivals[col] = pd.to_numeric(festivals[col], errors='coerce').astype('Int16')
+    if 'AMOUNT_RELEASED' in festivals.columns:
+        festivals['AMOUNT_RELEASED'] = pd.to_numeric(festivals['AMOUNT_RELEASED'], errors='coerce').astype('Int64')
+    for col in ['LAT', 'LON']:
+        if col in festivals.columns:
+            festivals[col] = pd.to_numeric(festivals[col], errors='coerce').astype('float32')
+    return festivals.reset_index(drop=True)
+
+
+def normalize_geological_sites(df):
+    """
+    Name the geological heritage sites table (session 238, AU 1380) and
+    classify each site
+    """
+    df = df.copy()
+    df.columns = ['SL_NO', 'STATE', 'SITE_NAME']
+    df['STATE'] = df['STATE'].str.title()
+    df['SITE_TYPE'] = df['SITE_NAME'].apply(classify_site)
+    return df
+
+
+def classify_site(name):
+    """
+    Classify a geological heritage site by keywords in its name
+    """
+    if 'fossil' in name.lower():
+        return 'Fossil Site'
+    elif any(term in name.lower() for term in ['lava', 'volcanic', 'igneous']):
+        return 'Volcanic/Igneous Formation'
+    elif any(term in name.lower() for term in ['fault', 'unconformity']):
+        return 'Geological Structure'
+    elif any(term in name.lower() for term in ['lake', 'cliff', 'island']):
+        return 'Natural Formation'
+    else:
+        return 'Other Geological Site'
+
+
+def build_state_analysis(cultural_sites, art_forms, tourism_stats):
+    """
+    Build the per-state table of cultural sites, art forms and visitors
+    used by the Conclusions & Insights page
+    """
+    # The uploaded tables use upper-case column names, the local files lower-case
+    cultural_sites = cultural_sites.rename(columns=str.upper)
+    art_forms = art_forms.rename(columns=str.upper)
+    state_analysis = pd.DataFrame()
+    state_analysis['STATE'] = cultural_sites['STATE'].unique()
+
+    # Count cultural sites per state
+    sites_by_state = cultural_sites.groupby('STATE').size()
+    state_analysis = state_analysis.merge(sites_by_state.reset_index(), on='STATE', how='left')
+    state_analysis.columns = ['STATE', 'CULTURAL_SITES']
+
+    # Count art forms per state
+    arts_by_state = art_forms.groupby('STATE').size()
+    state_analysis = state_analysis.merge(arts_by_state.reset_index(), on='STATE', how='left')
+    state_analysis.columns = ['STATE', 'CULTURAL_SITES', 'ART_FORMS']
+
+    # Add tourism data
+    tourism_by_state = tourism_stats.groupby('STATE').agg({
+        'DOMESTIC_VISITORS': 'sum',
+        'FOREIGN_VISITORS': 'sum'
+    }).reset_index()
+    state_analysis = state_analysis.merge(tourism_by_state, on='STATE', how='left')
+
+    # Fill NaN values with 0
+    state_analysis = state_analysis.fillna(0)
+
+    # Calculate total visitors
+    state_analysis['TOTAL_VISITORS'] = state_analysis['DOMESTIC_VISITORS'] + state_analysis['FOREIGN_VISITORS']
+
+    # Ensure minimum size for better visualization
+    state_analysis['DISPLAY_SIZE'] = state_analysis['ART_FORMS'].clip(lower=1) * 5
+    return state_analysis
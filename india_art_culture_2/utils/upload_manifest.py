@@ -0,0 +1,226 @@
+import hashlib
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pandas as pd
+from utils.backends import get_backend, write_pandas
+
+MANIFEST_TABLE = 'UPLOAD_MANIFEST'
+
+
+def file_hash(file_path, chunk_size=1 << 20):
+    """
+    Return the SHA-256 hex digest of a file's contents
+    """
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def row_fingerprints(df):
+    """
+    Return one stable hex fingerprint per row, ignoring the index
+    """
+    hashes = pd.util.hash_pandas_object(df, index=False)
+    return [f"{h:016x}" for h in hashes.to_numpy()]
+
+
+def _occurrence_keys(fingerprints):
+    """
+    Number repeated fingerprints so duplicate rows are tracked as a multiset
+    """
+    fp = pd.Series(fingerprints, dtype=object)
+    return fp + ':' + fp.groupby(fp).cumcount().astype(str)
+
+
+class UploadManifest:
+    """
+    Tracks what was last uploaded to each table so unchanged files can be
+    skipped and grown files can be appended to instead of reloaded.
+    Entries are keyed by table name and persisted to a local JSON file and
+    to the UPLOAD_MANIFEST table. Each backend keeps its own local file.
+    """
+
+    def __init__(self, path=None):
+        self.path = Path(path) if path else get_backend().manifest_path
+        self.entries = {}
+        if self.path.exists():
+            with open(self.path, 'r') as f:
+                self.entries = json.load(f)
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, 'w') as f:
+            json.dump(self.entries, f, indent=2)
+
+    def is_current(self, table_name, file_path, content_hash):
+        """Check whether table_name already holds this exact file"""
+        entry = self.entries.get(table_name)
+        return (
+            entry is not None
+            and entry['source_file'] == Path(file_path).name
+            and entry['content_hash'] == content_hash
+        )
+
+    def table_intact(self, conn, table_name):
+        """
+        Check whether table_name still exists with the row count recorded
+        for it, i.e. nothing dropped or truncated it since the last upload
+        """
+        entry = self.entries.get(table_name)
+        if entry is None:
+            return False
+        cursor = conn.cursor()
+        try:
+            cursor.execute("SELECT COUNT(*) FROM IDENTIFIER(%s)", (table_name,))
+            return cursor.fetchone()[0] == entry['row_count']
+        except Exception:
+            # The table is missing
+            return False
+        finally:
+            cursor.close()
+
+    def plan(self, table_name, file_path, df):
+        """
+        Decide how to bring table_name up to date with df.
+
+        Returns ('append', new_rows) when the previous upload is an exact
+        subset of df, otherwise ('replace', df). Rows cannot be deleted
+        remotely by fingerprint, so any removed or edited row forces a
+        full replace.
+        """
+        entry = self.entries.get(table_name)
+        if (
+            entry is None
+            or entry['source_file'] != Path(file_path).name
+            or entry['columns'] != [str(c) for c in df.columns]
+        ):
+            return 'replace', df
+
+        current = _occurrence_keys(row_fingerprints(df))
+        previous = set(_occurrence_keys(entry['row_fingerprints']))
+        if not previous.issubset(set(current)):
+            return 'replace', df
+        return 'append', df[~current.isin(previous).to_numpy()]
+
+    def record(self, table_name, file_path, content_hash, df):
+        self.entries[table_name] = {
+            'source_file': Path(file_path).name,
+            'content_hash': content_hash,
+            'columns': [str(c) for c in df.columns],
+            'row_count': len(df),
+            'row_fingerprints': row_fingerprints(df),
+            'uploaded_at': datetime.now(timezone.utc).replace(tzinfo=None).isoformat(timespec='seconds')
+        }
+
+    def ensure_table(self, cursor):
+        cursor.execute(f"""
+        CREATE TABLE IF NOT EXISTS {MANIFEST_TABLE} (
+            TABLE_NAME VARCHAR(255),
+            SOURCE_FILE VARCHAR(500),
+            CONTENT_HASH VARCHAR(64),
+            COLUMN_NAMES VARCHAR,
+            ROW_COUNT INTEGER,
+            ROW_FINGERPRINTS VARCHAR,
+            UPLOADED_AT TIMESTAMP_NTZ
+        )
+        """)
+
+    def pull(self, conn):
+        """Merge in remote entries that are newer than the local copy"""
+        cursor = conn.cursor()
+        try:
+            self.ensure_table(cursor)
+            cursor.execute(f"""
+            SELECT TABLE_NAME, SOURCE_FILE, CONTENT_HASH, COLUMN_NAMES,
+                   ROW_COUNT, ROW_FINGERPRINTS, UPLOADED_AT
+            FROM {MANIFEST_TABLE}
+            """)
+            for row in cursor.fetchall():
+                table_name, source_file, content_hash, columns, row_count, fingerprints, uploaded_at = row
+                uploaded_at = pd.Timestamp(uploaded_at).isoformat(timespec='seconds')
+                local = self.entries.get(table_name)
+                if local is None or local['uploaded_at'] < uploaded_at:
+                    self.entries[table_name] = {
+                        'source_file': source_file,
+                        'content_hash': content_hash,
+                        'columns': json.loads(columns),
+                        'row_count': row_count,
+                        'row_fingerprints': json.loads(fingerprints),
+                        'uploaded_at': uploaded_at
+                    }
+        finally:
+            cursor.close()
+
+    def push(self, conn, table_name):
+        """Upsert one entry into the remote manifest table"""
+        entry = self.entries[table_name]
+        cursor = conn.cursor()
+        try:
+            self.ensure_table(cursor)
+            cursor.execute(f"""
+            MERGE INTO {MANIFEST_TABLE} t
+            USING (
+                SELECT %s AS TABLE_NAME, %s AS SOURCE_FILE, %s AS CONTENT_HASH,
+                       %s AS COLUMN_NAMES, %s AS ROW_COUNT, %s AS ROW_FINGERPRINTS,
+                       %s AS UPLOADED_AT
+            ) s
+            ON t.TABLE_NAME = s.TABLE_NAME
+            WHEN MATCHED THEN UPDATE SET
+                SOURCE_FILE = s.SOURCE_FILE,
+                CONTENT_HASH = s.CONTENT_HASH,
+                COLUMN_NAMES = s.COLUMN_NAMES,
+                ROW_COUNT = s.ROW_COUNT,
+                ROW_FINGERPRINTS = s.ROW_FINGERPRINTS,
+                UPLOADED_AT = s.UPLOADED_AT
+            WHEN NOT MATCHED THEN INSERT (
+                TABLE_NAME, SOURCE_FILE, CONTENT_HASH, COLUMN_NAMES,
+                ROW_COUNT, ROW_FINGERPRINTS, UPLOADED_AT
+            ) VALUES (
+                s.TABLE_NAME, s.SOURCE_FILE, s.CONTENT_HASH, s.COLUMN_NAMES,
+                s.ROW_COUNT, s.ROW_FINGERPRINTS, s.UPLOADED_AT
+            )
+            """, (
+                table_name, entry['source_file'], entry['content_hash'],
+                json.dumps(entry['columns']), entry['row_count'],
+                json.dumps(entry['row_fingerprints']), entry['uploaded_at']
+            ))
+        finally:
+            cursor.close()
+
+
+def sync_file(conn, manifest, file_path, table_name, reader, force=False, **write_kwargs):
+    """
+    Upload file_path into table_name only if it changed since the last upload.
+
+    reader turns the file into the DataFrame that should land in the table.
+    The manifest is only trusted while the table still holds the rows it
+    recorded; otherwise, or with force, the table is reloaded in full.
+    Returns a (mode, nrows) tuple where mode is 'skipped', 'append' or 'replace'.
+    """
+    content_hash = file_hash(file_path)
+    intact = not force and manifest.table_intact(conn, table_name)
+    if intact and manifest.is_current(table_name, file_path, content_hash):
+        return 'skipped', 0
+
+    df = reader(file_path)
+    mode, rows = manifest.plan(table_name, file_path, df) if intact else ('replace', df)
+    nrows = 0
+    if len(rows) > 0 or mode == 'replace':
+        success, _, nrows, _ = write_pandas(
+            conn=conn,
+            df=rows,
+            table_name=table_name,
+            overwrite=(mode == 'replace'),
+            **write_kwargs
+        )
+        if not success:
+            raise RuntimeError(f"write_pandas failed for {table_name}")
+
+    manifest.record(table_name, file_path, content_hash, df)
+    manifest.save()
+    manifest.push(conn, table_name)
+    return mode, nrows
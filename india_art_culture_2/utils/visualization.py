@@ -1,7 +1,11 @@
-import folium
 import plotly.express as px
 import plotly.graph_objects as go
+import numpy as np
 import pandas as pd
+from utils.lazy_imports import lazy_import
+
+# Only the map needs folium
+folium = lazy_import('folium')
 
 def create_map(cultural_sites_df):
     """
@@ -86,4 +90,65 @@ def create_monthly_visitors_heatmap(tourism_data):
         yaxis_title='Region'
     )
     
-    return fig 
\ No newline at end of file
+    return fig 
+
+# Grid cell size in degrees for each map zoom level, halving like map tiles
+ZOOM_CELL_DEGREES = {zoom: 360 / 2 ** (zoom + 3) for zoom in range(5)}
+
+def aggregate_points(lat, lon, weights, cell_degrees):
+    """
+    Bin points into a lat/lon grid of cell_degrees cells. Returns one row per
+    non-empty cell with the count, the weight total and the weighted mean
+    position of its points, so markers sit where the events are.
+    """
+    lat = np.asarray(lat, dtype='float64')
+    lon = np.asarray(lon, dtype='float64')
+    weights = np.asarray(weights, dtype='float64')
+
+    rows = np.floor((lat + 90) / cell_degrees).astype('int64')
+    cols = np.floor((lon + 180) / cell_degrees).astype('int64')
+    cells, index = np.unique(rows * int(np.ceil(360 / cell_degrees)) + cols, return_inverse=True)
+
+    count = np.bincount(index, minlength=len(cells))
+    total = np.bincount(index, weights=weights, minlength=len(cells))
+    # Fall back to the plain mean for cells whose weights sum to zero
+    mean_weights = np.where(total[index] > 0, weights, 1.0)
+    weight_sum = np.bincount(index, weights=mean_weights, minlength=len(cells))
+    return pd.DataFrame({
+        'lat': np.bincount(index, weights=lat * mean_weights, minlength=len(cells)) / weight_sum,
+        'lon': np.bincount(index, weights=lon * mean_weights, minlength=len(cells)) / weight_sum,
+        'count': count,
+        'total': total
+    })
+
+def build_festival_tiles(festivals):
+    """
+    Pre-aggregate Festival of India events into one grid per zoom level:
+    {zoom: cells}. The map then draws at most one marker per cell, however
+    many events there are.
+    """
+    located = festivals.dropna(subset=['LAT', 'LON'])
+    amounts = located['AMOUNT_RELEASED'].fillna(0)
+    return {
+        zoom: aggregate_points(located['LAT'], located['LON'], amounts, cell_degrees)
+        for zoom, cell_degrees in ZOOM_CELL_DEGREES.items()
+    }
+
+def create_festival_funding_map(tiles, zoom):
+    """
+    Create a map of Festival of India funding from the cells of one zoom level
+    """
+    cells = tiles[zoom]
+    fig = px.scatter_geo(
+        cells,
+        lat='lat',
+        lon='lon',
+        size='total',
+        color='count',
+        hover_data={'total': ':,.0f', 'count': True, 'lat': False, 'lon': False},
+        labels={'total': 'Amount Released (₹)', 'count': 'Events'},
+        projection='natural earth',
+        title=f'Festival of India Funding ({ZOOM_CELL_DEGREES[zoom]:g}° cells)'
+    )
+    fig.update_geos(showcountries=True)
+    return fig